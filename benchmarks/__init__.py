@@ -0,0 +1,6 @@
+"""Offline benchmarks of footing.
+
+Templates and projects are generated in temporary directories, so benchmarks
+need neither network access nor forge tokens. Run them with ``make benchmark``
+or ``python -m benchmarks.run --help``.
+"""
@@ -0,0 +1,137 @@
+"""Benchmarks forge listings against a local mock of the Github and Gitlab APIs.
+
+`footing.ls.ls` lists the templates and the projects of a template of a
+`benchmarks.mock_forge.MockForge` at every scale of ``--repos``. Each
+benchmark records:
+
+* ``seconds`` - The wall time of the listing
+* ``requests`` - The API requests of the listing, in total and by endpoint,
+  as recorded by `footing.metrics`
+* ``peak_memory`` - The peak bytes allocated by Python during the listing,
+  measured with tracemalloc in a separate, untimed run
+* ``results`` - The number of repositories listed
+
+Github listings with 1,000 or more search results are listed by checking
+every repository, since code search returns at most 1,000 results::
+
+    python -m benchmarks.ls --repos 10 1000 10000 --latency 0.02 -o ls.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import unittest.mock
+
+import footing.constants
+import footing.ls
+import footing.metrics
+from benchmarks import mock_forge, results
+
+#: The names of all benchmarks in the order that they run
+BENCHMARKS = ["github templates", "github projects", "gitlab templates", "gitlab projects"]
+
+
+def _get_ls_args(name, forge):
+    """Returns the forge path and template listed by a benchmark"""
+    host = "github.com" if name.startswith("github") else "gitlab.com"
+    template = forge.template(host) if name.endswith("projects") else None
+    return "{}/{}".format(host, forge.owner), template
+
+
+def _get_expected_results(name, forge):
+    """Returns the number of repositories that a benchmark must list"""
+    is_match = forge.is_project if name.endswith("projects") else forge.is_template
+    return sum(is_match(i) for i in range(forge.repos))
+
+
+def _measure(name, forge, repeat):
+    ls_args = _get_ls_args(name, forge)
+    seconds, requests = [], []
+    for _ in range(repeat):
+        footing.metrics.metrics.reset()
+        start = time.perf_counter()
+        listing = footing.ls.ls(*ls_args)
+        seconds.append(time.perf_counter() - start)
+        requests.append(sum(m.requests for m in footing.metrics.metrics.snapshot().values()))
+
+    # Timings of incomplete listings are meaningless, so they fail the benchmark
+    expected_results = _get_expected_results(name, forge)
+    if len(listing) != expected_results:
+        raise RuntimeError(
+            "{} (repos={}) listed {} of {} repositories".format(
+                name, forge.repos, len(listing), expected_results
+            )
+        )
+
+    endpoints = {
+        endpoint: endpoint_metrics.requests
+        for endpoint, endpoint_metrics in footing.metrics.metrics.snapshot().items()
+    }
+
+    tracemalloc.start()
+    try:
+        footing.ls.ls(*ls_args)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "name": name,
+        "params": {"repos": forge.repos, "latency": forge.latency},
+        "repeat": repeat,
+        "results": len(listing),
+        "seconds": results.summarize_seconds(seconds),
+        "requests": max(requests),
+        "endpoints": endpoints,
+        "peak_memory": peak_memory,
+    }
+
+
+def run_benchmarks(forge: mock_forge.MockForge, repeat: int, names: list[str]) -> list[dict]:
+    """Runs listing benchmarks against a mock server of ``forge``"""
+    forge_results = []
+    with tempfile.TemporaryDirectory() as root:
+        env = {
+            footing.constants.GITHUB_API_TOKEN_ENV_VAR: "benchmark",
+            footing.constants.GITLAB_API_TOKEN_ENV_VAR: "benchmark",
+            footing.constants.FOOTING_CACHE_DIR_ENV_VAR: root,
+        }
+        with unittest.mock.patch.dict(os.environ, env):
+            with mock_forge.Server(forge) as server, mock_forge.redirect(server):
+                for name in names:
+                    print("{} (repos={})".format(name, forge.repos), file=sys.stderr)
+                    forge_results.append(_measure(name, forge, repeat))
+
+    return forge_results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmarks footing ls against a local mock of the Github and Gitlab APIs."
+    )
+    parser.add_argument("--repos", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to every API response"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--benchmark", choices=BENCHMARKS, nargs="+", default=BENCHMARKS, dest="benchmarks"
+    )
+    results.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    bench_results = results.new_results()
+    for repos in args.repos:
+        forge = mock_forge.MockForge(repos=repos, latency=args.latency)
+        bench_results["benchmarks"] += run_benchmarks(forge, args.repeat, args.benchmarks)
+
+    results.finish(args, bench_results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""A local mock of the Github and Gitlab APIs for benchmarking forge listings.
+
+The server simulates a Github organization and a Gitlab group of ``repos``
+repositories. Every 100th repository is a template with a cookiecutter.json.
+Every other repository is a project of the first template. The server
+implements the endpoints used by `footing.forge.Github` and
+`footing.forge.Gitlab`, along with:
+
+* Pagination with ``link`` headers, and the ``X-Page`` headers of Gitlab
+* ``ETag`` headers. Requests with a matching ``If-None-Match`` header get an
+  empty 304 response that does not count against the rate limit.
+* The rate limit headers of each forge, refusing tokens that are exhausted
+* A fixed latency added to every response
+* Github's limit of 1,000 code search results
+
+`redirect` sends the requests that footing makes to api.github.com and
+gitlab.com to the server, so benchmarks run the real code paths of footing::
+
+    with mock_forge.Server(mock_forge.MockForge(repos=1000)) as server:
+        with mock_forge.redirect(server):
+            footing.ls.ls("github.com/org")
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import hashlib
+import json
+import math
+import multiprocessing
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlencode, urlsplit
+
+import requests.adapters
+
+import footing.constants
+import footing.forge
+
+#: The public URLs of the mocked APIs
+GITHUB_URL = footing.constants.GITHUB_API_URL
+GITLAB_URL = "https://gitlab.com"
+
+#: The maximum number of code search results of Github
+_GITHUB_SEARCH_MAX_RESULTS = 1000
+
+
+@dataclasses.dataclass
+class MockForge:
+    """The repositories and behavior of a mock forge
+
+    Attributes:
+        repos: The number of repositories of the organization or group
+        owner: The name of the Github organization and Gitlab group
+        latency: Seconds added to every response
+        rate_limit: The number of requests of each token per hour
+    """
+
+    repos: int = 100
+    owner: str = "org"
+    latency: float = 0.0
+    rate_limit: int = 1_000_000
+
+    def name(self, i: int) -> str:
+        """The name of the i-th repository"""
+        return "repo{:05d}".format(i)
+
+    def is_template(self, i: int) -> bool:
+        """True when the i-th repository has a cookiecutter.json"""
+        return i % 100 == 0
+
+    def is_project(self, i: int) -> bool:
+        """True when the i-th repository was created from the first template"""
+        return i % 2 == 1
+
+    def template(self, host: str) -> str:
+        """The git SSH path of the template of every project"""
+        return "git@{}:{}/{}.git".format(host, self.owner, self.name(0))
+
+    def files(self, i: int, host: str) -> dict[str, str]:
+        """The files at the root of the i-th repository"""
+        files = {"README.md": "# {}\n".format(self.name(i))}
+        if self.is_template(i):
+            files["cookiecutter.json"] = '{"repo_name": "project"}\n'
+        if self.is_project(i):
+            files[footing.constants.FOOTING_CONFIG_FILE] = (
+                "_template: {}\n_version: {}\nrepo_name: {}\n".format(
+                    self.template(host), "0" * 40, self.name(i)
+                )
+            )
+        return files
+
+
+def _parse_search(search):
+    """Returns the filename and the other terms of a code search, ignoring qualifiers"""
+    terms = search.split()
+    filename = next((term[9:] for term in terms if term.startswith("filename:")), "")
+    return filename, tuple(term for term in terms if not re.match(r"[a-z_]+:", term))
+
+
+def _page(items, query, default_per_page, max_per_page=100):
+    """Returns the items of the requested page and the number of pages"""
+    per_page = min(int(query.get("per_page", default_per_page)), max_per_page)
+    page = int(query.get("page", 1))
+    num_pages = max(math.ceil(len(items) / per_page), 1)
+    return items[(page - 1) * per_page : page * per_page], page, num_pages, per_page
+
+
+def _link_header(url, query, page, num_pages):
+    """Returns a link header with the pagination links of a page"""
+    pages = {"first": 1, "last": num_pages}
+    if page > 1:
+        pages["prev"] = page - 1
+    if page < num_pages:
+        pages["next"] = page + 1
+
+    return ", ".join(
+        '<{}?{}>; rel="{}"'.format(url, urlencode({**query, "page": number}), rel)
+        for rel, number in pages.items()
+    )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep connections alive like the real APIs, so connection pooling is measured
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: _HTTPServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.server.forge.latency)
+        url_parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url_parts.query).items()}
+        if url_parts.path.startswith("/api/v4/"):
+            status, headers, body = self.server.gitlab(unquote(url_parts.path[7:]), query)
+            token = self.headers.get("PRIVATE-TOKEN", "")
+            limit_headers, limited_status = ("RateLimit-Limit", "RateLimit-Remaining"), 429
+        else:
+            status, headers, body = self.server.github(url_parts.path, query, self.headers)
+            token = self.headers.get("Authorization", "")
+            limit_headers, limited_status = ("X-RateLimit-Limit", "X-RateLimit-Remaining"), 403
+
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        etag = '"{}"'.format(hashlib.sha1(data).hexdigest())
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            status, data = 304, b""
+        elif not self.server.consume(token):
+            status, data = limited_status, b'{"message": "API rate limit exceeded"}'
+            headers = {"Retry-After": "1"}
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        limit, remaining = self.server.get_limit(token)
+        self.send_header(limit_headers[0], str(limit))
+        self.send_header(limit_headers[1], str(remaining))
+        self.send_header(limit_headers[1].replace("Remaining", "Reset"), str(self.server.reset_at))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, forge: MockForge):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.forge = forge
+        self.reset_at = int(time.time()) + 3600
+        self._used: dict[str, int] = {}
+        self._searches: dict[tuple, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def consume(self, token: str) -> bool:
+        """Uses a request of a token's rate limit. Returns False when it is exhausted"""
+        with self._lock:
+            if self._used.get(token, 0) >= self.forge.rate_limit:
+                return False
+            self._used[token] = self._used.get(token, 0) + 1
+            return True
+
+    def get_limit(self, token: str) -> tuple[int, int]:
+        """Returns the rate limit and remaining requests of a token"""
+        with self._lock:
+            return self.forge.rate_limit, self.forge.rate_limit - self._used.get(token, 0)
+
+    def search(self, host: str, filename: str, terms: tuple[str, ...]) -> list[int]:
+        """Returns the repositories with a file that contains every term"""
+        key = (host, filename, terms)
+        if key not in self._searches:
+            self._searches[key] = [
+                i
+                for i in range(self.forge.repos)
+                if filename in self.forge.files(i, host)
+                and all(term in self.forge.files(i, host)[filename] for term in terms)
+            ]
+        return self._searches[key]
+
+    def _github_repo(self, i):
+        name = "{}/{}".format(self.forge.owner, self.forge.name(i))
+        return {
+            "id": i + 1,
+            "name": self.forge.name(i),
+            "full_name": name,
+            "ssh_url": "git@github.com:{}.git".format(name),
+            "description": "Repository {}".format(i),
+            "fork": False,
+            "pushed_at": "2024-01-01T00:00:00Z",
+        }
+
+    def _github_page(self, path, query, items):
+        items, page, num_pages, _ = _page(items, query, default_per_page=30)
+        return items, {"link": _link_header(GITHUB_URL + path, query, page, num_pages)}
+
+    def github(self, path, query, headers):
+        """Returns the status, headers, and body of a Github API request"""
+        forge = self.forge
+        if match := re.fullmatch(r"/users/([^/]+)", path):
+            if match.group(1) != forge.owner:
+                return 404, {}, {"message": "Not Found"}
+            owner = {"login": forge.owner, "type": "Organization", "public_repos": forge.repos}
+            return 200, {}, owner
+        elif match := re.fullmatch(r"/(?:orgs|users)/([^/]+)/repos", path):
+            repos = [self._github_repo(i) for i in range(forge.repos)]
+            body, page_headers = self._github_page(path, query, repos)
+            return 200, page_headers, body
+        elif path == "/search/code":
+            filename, terms = _parse_search(query.get("q", ""))
+            items = [
+                {"name": filename, "path": filename, "repository": self._github_repo(i)}
+                for i in self.search("github.com", filename, terms)
+            ]
+            # Like Github, the total counts every match but only the first results are served
+            body, page_headers = self._github_page(path, query, items[:_GITHUB_SEARCH_MAX_RESULTS])
+            return 200, page_headers, {"total_count": len(items), "items": body}
+        elif match := re.fullmatch(r"/repos/([^/]+)/repo(\d+)/contents/(.+)", path):
+            i = int(match.group(2))
+            contents = forge.files(i, "github.com").get(match.group(3))
+            if match.group(1) != forge.owner or i >= forge.repos or contents is None:
+                return 404, {}, {"message": "Not Found"}
+            elif "raw" in headers.get("Accept", ""):
+                return 200, {}, contents.encode()
+            return 200, {}, {"name": match.group(3), "size": len(contents)}
+
+        return 404, {}, {"message": "Not Found"}
+
+    def _gitlab_project(self, i):
+        path = "{}/{}".format(self.forge.owner, self.forge.name(i))
+        return {
+            "id": i + 1,
+            "name": self.forge.name(i),
+            "path_with_namespace": path,
+            "ssh_url_to_repo": "git@gitlab.com:{}.git".format(path),
+            "description": "Project {}".format(i),
+            "default_branch": "main",
+            "last_activity_at": "2024-01-01T00:00:00Z",
+        }
+
+    def gitlab(self, path, query):
+        """Returns the status, headers, and body of a Gitlab API request"""
+        forge = self.forge
+        if match := re.fullmatch(r"/groups/([^/]+|\d+)/search", path):
+            filename, terms = _parse_search(query.get("search", ""))
+            blobs = [
+                {"project_id": i + 1, "filename": filename, "path": filename, "ref": "main"}
+                for i in self.search("gitlab.com", filename, terms)
+            ]
+            items, page, num_pages, per_page = _page(blobs, query, default_per_page=20)
+            url = "{}/api/v4/groups/{}/search".format(GITLAB_URL, quote(match.group(1), safe=""))
+            headers = {
+                "link": _link_header(url, query, page, num_pages),
+                "X-Page": str(page),
+                "X-Per-Page": str(per_page),
+                "X-Total": str(len(blobs)),
+                "X-Total-Pages": str(num_pages),
+            }
+            if page < num_pages:
+                headers["X-Next-Page"] = str(page + 1)
+            return 200, headers, items
+        elif match := re.fullmatch(r"/groups/([^/]+)", path):
+            if match.group(1) not in (forge.owner, "1"):
+                return 404, {}, {"message": "404 Group Not Found"}
+            return 200, {}, {"id": 1, "name": forge.owner, "full_path": forge.owner}
+        elif match := re.fullmatch(r"/projects/(\d+)", path):
+            i = int(match.group(1)) - 1
+            if i >= forge.repos:
+                return 404, {}, {"message": "404 Project Not Found"}
+            return 200, {}, self._gitlab_project(i)
+
+        return 404, {}, {"message": "404 Not Found"}
+
+
+def _serve(forge, conn):
+    server = _HTTPServer(forge)
+    conn.send("http://127.0.0.1:{}".format(server.server_address[1]))
+    server.serve_forever()
+
+
+class Server:
+    """Serves a `MockForge` from a child process. Used as a context manager
+
+    The server runs in its own process, so it does not compete with the
+    benchmarked listing for the GIL or count toward its memory.
+
+    Attributes:
+        url: The local URL of the server, available inside of the context
+    """
+
+    def __init__(self, forge: MockForge):
+        self.forge = forge
+        self.url = ""
+        self._process = None
+
+    def __enter__(self):
+        context = multiprocessing.get_context("spawn")
+        conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_serve, args=(self.forge, child_conn), daemon=True)
+        self._process.start()
+        while not conn.poll(0.1):
+            if not self._process.is_alive():
+                raise RuntimeError("The mock forge server exited before it started")
+
+        self.url = conn.recv()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._process.terminate()
+        self._process.join()
+
+
+class _RedirectAdapter(requests.adapters.HTTPAdapter):
+    """Sends requests to another base URL, keeping their original URL in responses"""
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+
+    def send(self, request, **kwargs):
+        original_url = request.url
+        url_parts = urlsplit(original_url)
+        request.url = "{}{}{}".format(
+            self.url, url_parts.path, "?" + url_parts.query if url_parts.query else ""
+        )
+        try:
+            resp = super().send(request, **kwargs)
+        finally:
+            request.url = original_url
+
+        resp.url = original_url
+        return resp
+
+
+@contextlib.contextmanager
+def redirect(server: Server):
+    """Sends the Github and Gitlab API requests of footing to a mock server"""
+    session = footing.forge.get_session()
+    adapter = _RedirectAdapter(server.url)
+    prefixes = [GITHUB_URL + "/", GITLAB_URL + "/"]
+    for prefix in prefixes:
+        session.mount(prefix, adapter)
+    try:
+        yield
+    finally:
+        for prefix in prefixes:
+            session.adapters.pop(prefix)
+        adapter.close()
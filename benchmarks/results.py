@@ -0,0 +1,90 @@
+"""Records, writes, and compares the JSON results of benchmarks."""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+import platform
+import statistics
+import sys
+
+import footing
+import footing.git
+
+
+def _get_commit():
+    """Returns the git SHA of the benchmarked footing checkout, if any"""
+    try:
+        return footing.git.runner.output(
+            "rev-parse", "HEAD", cwd=os.path.dirname(os.path.abspath(footing.__file__))
+        )
+    except Exception:
+        return None
+
+
+def new_results() -> dict:
+    """Returns empty results that record the benchmarked version of footing and Python"""
+    return {
+        "footing_version": footing.__version__,
+        "commit": _get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "benchmarks": [],
+    }
+
+
+def summarize_seconds(seconds: list[float]) -> dict:
+    """Returns the min, median, and max of the timings of repeated runs"""
+    return {
+        "min": round(min(seconds), 6),
+        "median": round(statistics.median(seconds), 6),
+        "max": round(max(seconds), 6),
+    }
+
+
+def _get_key(result):
+    params = ",".join(
+        "{}={}".format(name, value) for name, value in result["params"].items() if name != "seed"
+    )
+    return result["name"], params
+
+
+def compare(baseline: dict, results: dict) -> str:
+    """Returns a table of the median seconds of the benchmarks of two results"""
+    before = {_get_key(result): result for result in baseline["benchmarks"]}
+    row = "{:<22} {:<60} {:>10} {:>10} {:>8}"
+    lines = [row.format("benchmark", "params", "before", "after", "ratio")]
+    for result in results["benchmarks"]:
+        after = result["seconds"]["median"]
+        previous = ratio = "-"
+        if _get_key(result) in before:
+            previous_seconds = before[_get_key(result)]["seconds"]["median"]
+            previous = "{:.3f}".format(previous_seconds)
+            if previous_seconds:
+                ratio = "{:.2f}x".format(after / previous_seconds)
+
+        lines.append(row.format(*_get_key(result), previous, "{:.3f}".format(after), ratio))
+
+    return "\n".join(lines)
+
+
+def add_arguments(parser) -> None:
+    """Adds the output options of benchmark results to an argument parser"""
+    parser.add_argument("-o", "--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Compare the results with this JSON file")
+
+
+def finish(args, results: dict) -> None:
+    """Writes the results and compares them, as configured by `add_arguments`"""
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            print(compare(json.load(f), results), file=sys.stderr)
@@ -0,0 +1,190 @@
+"""Runs the offline benchmarks of footing and writes their results as JSON.
+
+For every template shape, a synthetic template is generated with
+`benchmarks.templates.create_template` and the following are timed:
+
+* ``setup`` - `footing.setup.setup` of the oldest version of the template
+* ``update (cold cache)`` - `footing.update.update` of a project from the
+  oldest to the newest version with an empty template cache
+* ``update (warm cache)`` - The same update after the renders are cached
+* ``up_to_date`` - `footing.update.up_to_date` of a project against the newest version
+
+Runs are traced with `footing.trace`, so results include the median time of
+every phase of the commands along with the time of whole runs. Results of
+two commits are compared with ``--compare``::
+
+    python -m benchmarks.run -o before.json
+    git checkout my-branch
+    python -m benchmarks.run -o after.json --compare before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import dataclasses
+import itertools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import unittest.mock
+
+import footing.constants
+import footing.setup
+import footing.trace
+import footing.update
+import footing.utils
+from benchmarks import results, templates
+
+#: The names of all benchmarks in the order that they run
+BENCHMARKS = ["setup", "update (cold cache)", "update (warm cache)", "up_to_date"]
+
+
+@contextlib.contextmanager
+def _environment(root):
+    """Keeps the caches of footing and cookiecutter under ``root``"""
+    cc_config = os.path.join(root, "cookiecutter.yaml")
+    with open(cc_config, "w") as f:
+        f.write(
+            "cookiecutters_dir: {}\nreplay_dir: {}\n".format(
+                json.dumps(os.path.join(root, "cookiecutters")),
+                json.dumps(os.path.join(root, "replay")),
+            )
+        )
+
+    env = {
+        **templates.GIT_ENV,
+        "COOKIECUTTER_CONFIG": cc_config,
+        footing.constants.FOOTING_CACHE_DIR_ENV_VAR: os.path.join(root, "cache"),
+    }
+    with unittest.mock.patch.dict(os.environ, env):
+        yield
+
+
+def _summarize_phases(runs):
+    """Returns the median seconds and calls of every traced phase across runs"""
+    names = sorted({span.name for spans in runs for span in spans})
+    phases = {}
+    for name in names:
+        seconds = [sum(span.duration for span in spans if span.name == name) for spans in runs]
+        calls = [sum(span.name == name for span in spans) for spans in runs]
+        phases[name] = {
+            "seconds": round(statistics.median(seconds), 6),
+            "calls": statistics.median(calls),
+        }
+
+    return phases
+
+
+def _measure(run, prepare, repeat):
+    """Times ``run(*prepare())`` ``repeat`` times. Only ``run`` is timed"""
+    seconds, runs = [], []
+    for i in range(repeat):
+        args = prepare(i)
+        with tempfile.TemporaryDirectory() as trace_dir:
+            with footing.trace.tracing(os.path.join(trace_dir, "trace.json")) as tracer:
+                start = time.perf_counter()
+                run(*args)
+                seconds.append(time.perf_counter() - start)
+        runs.append(tracer.spans)
+
+    return {
+        "repeat": repeat,
+        "seconds": results.summarize_seconds(seconds),
+        "phases": _summarize_phases(runs),
+    }
+
+
+def _setup(root, template):
+    with footing.utils.cd(root), templates.answer_defaults():
+        footing.setup.setup(template.path, version=template.versions[0])
+
+
+def _update(project_dir, template, cache_dir):
+    env = {footing.constants.FOOTING_CACHE_DIR_ENV_VAR: cache_dir}
+    with footing.utils.cd(project_dir), unittest.mock.patch.dict(os.environ, env):
+        with templates.quiet():
+            footing.update.update(new_version=template.versions[-1])
+
+
+def _up_to_date(project_dir, template):
+    footing.update.up_to_date(version=template.versions[-1], path=project_dir)
+
+
+def run_benchmarks(spec: templates.TemplateSpec, repeat: int, names: list[str]) -> list[dict]:
+    """Runs benchmarks against a synthetic template with the shape of ``spec``"""
+    spec_results = []
+    with tempfile.TemporaryDirectory() as root, _environment(root):
+        template = templates.create_template(root, spec)
+        project_dir = templates.create_project(
+            os.path.join(root, "projects"), template, template.versions[0]
+        )
+
+        def new_dir(name):
+            return tempfile.mkdtemp(dir=root, prefix=name + "-")
+
+        def prepare_update(cache_dir):
+            def prepare(i):
+                dest = os.path.join(new_dir("update"), "project")
+                templates.copy_project(project_dir, dest)
+                return dest, template, cache_dir or new_dir("cache")
+
+            return prepare
+
+        warm_cache_dir = new_dir("cache")
+        benchmarks = {
+            "setup": (_setup, lambda i: (new_dir("setup"), template)),
+            "update (cold cache)": (_update, prepare_update(None)),
+            "update (warm cache)": (_update, prepare_update(warm_cache_dir)),
+            "up_to_date": (_up_to_date, lambda i: (project_dir, template)),
+        }
+
+        if "update (warm cache)" in names:
+            # Fill the warm cache with an untimed update
+            _update(*prepare_update(warm_cache_dir)(0))
+
+        for name in names:
+            run, prepare = benchmarks[name]
+            print("{} ({})".format(name, spec.name), file=sys.stderr)
+            spec_results.append(
+                {
+                    "name": name,
+                    "params": dataclasses.asdict(spec),
+                    **_measure(run, prepare, repeat),
+                }
+            )
+
+    return spec_results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Runs the offline benchmarks of footing against synthetic templates."
+        " Options that take several values run every combination of them."
+    )
+    parser.add_argument("--files", type=int, nargs="+", default=[100])
+    parser.add_argument("--file-size", type=int, nargs="+", default=[2048])
+    parser.add_argument("--binary-ratio", type=float, nargs="+", default=[0.1])
+    parser.add_argument("--history", type=int, nargs="+", default=[10])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--benchmark", choices=BENCHMARKS, nargs="+", default=BENCHMARKS, dest="benchmarks"
+    )
+    results.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    bench_results = results.new_results()
+    for files, file_size, binary_ratio, history in itertools.product(
+        args.files, args.file_size, args.binary_ratio, args.history
+    ):
+        spec = templates.TemplateSpec(files, file_size, binary_ratio, history)
+        bench_results["benchmarks"] += run_benchmarks(spec, args.repeat, args.benchmarks)
+
+    results.finish(args, bench_results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Generates synthetic templates and projects for benchmarks."""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import io
+import json
+import os
+import random
+import shutil
+import sys
+
+import footing.git
+import footing.setup
+import footing.utils
+
+#: Environment of the git commits of generated templates and projects
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "footing",
+    "GIT_AUTHOR_EMAIL": "footing@example.com",
+    "GIT_COMMITTER_NAME": "footing",
+    "GIT_COMMITTER_EMAIL": "footing@example.com",
+}
+
+#: The number of files of each directory of a generated template
+_FILES_PER_DIR = 20
+
+
+@dataclasses.dataclass(frozen=True)
+class TemplateSpec:
+    """The shape of a synthetic template
+
+    Attributes:
+        files: The number of files rendered by the template
+        file_size: The size of each file in bytes
+        binary_ratio: The fraction of files with binary contents. Binary files
+            are copied by cookiecutter without rendering.
+        history: The number of commits of the template. Every commit after the
+            first changes one text file.
+        seed: The seed of the generated contents
+    """
+
+    files: int = 100
+    file_size: int = 2048
+    binary_ratio: float = 0.1
+    history: int = 10
+    seed: int = 0
+
+    @property
+    def name(self) -> str:
+        """A short name of the spec, such as ``files=100,file_size=2048,...``"""
+        return ",".join(
+            "{}={}".format(field.name, getattr(self, field.name))
+            for field in dataclasses.fields(self)
+            if field.name != "seed"
+        )
+
+
+@dataclasses.dataclass
+class Template:
+    """A synthetic template in a local bare repository
+
+    Attributes:
+        path: The ``file://`` URL of the bare repository
+        versions: The git SHAs of the commits of the template, oldest first
+    """
+
+    path: str
+    versions: list[str]
+
+
+def _git(*args, cwd):
+    return footing.git.runner.output(*args, cwd=cwd)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silences the output of footing and of the processes that it spawns"""
+    sys.stdout.flush()
+    stdout_fd = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        os.dup2(stdout_fd, 1)
+        os.close(stdout_fd)
+        os.close(devnull)
+
+
+@contextlib.contextmanager
+def answer_defaults():
+    """Answers every cookiecutter prompt with its default and silences output"""
+    stdin, sys.stdin = sys.stdin, io.StringIO("\n" * 1000)
+    try:
+        with quiet():
+            yield
+    finally:
+        sys.stdin = stdin
+
+
+def _text(rng, size, version):
+    words = ["{{ cookiecutter.repo_name }} ", "version {} ".format(version)]
+    while sum(len(word) for word in words) < size:
+        words.append("".join(rng.choice("abcdefghij \n") for _ in range(60)))
+    return "".join(words)[:size]
+
+
+def _binary(rng, size):
+    # A NUL byte makes cookiecutter detect the file as binary
+    return b"\0" + bytes(rng.getrandbits(8) for _ in range(size - 1))
+
+
+def create_template(root: str, spec: TemplateSpec) -> Template:
+    """Creates a template with the shape of ``spec`` as a bare repository under ``root``"""
+    rng = random.Random(spec.seed)
+    work_dir = os.path.join(root, "template")
+    project_dir = os.path.join(work_dir, "{{cookiecutter.repo_name}}")
+    os.makedirs(project_dir)
+    with open(os.path.join(work_dir, "cookiecutter.json"), "w") as f:
+        json.dump({"repo_name": "project"}, f)
+
+    text_files = []
+    num_binary = round(spec.files * spec.binary_ratio)
+    for i in range(spec.files):
+        path = os.path.join(project_dir, "dir{}".format(i // _FILES_PER_DIR), "file{}".format(i))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if i < num_binary:
+            with open(path + ".bin", "wb") as f:
+                f.write(_binary(rng, spec.file_size))
+        else:
+            with open(path + ".txt", "w") as f:
+                f.write(_text(rng, spec.file_size, 0))
+            text_files.append(path + ".txt")
+
+    _git("init", "-q", cwd=work_dir)
+    _git("add", ".", cwd=work_dir)
+    _git("commit", "-q", "-m", "Version 0", cwd=work_dir)
+    for version in range(1, spec.history):
+        if text_files:
+            with open(rng.choice(text_files), "w") as f:
+                f.write(_text(rng, spec.file_size, version))
+        _git(
+            "commit", "-q", "--allow-empty", "-a", "-m", "Version {}".format(version), cwd=work_dir
+        )
+
+    versions = _git("rev-list", "--reverse", "HEAD", cwd=work_dir).split()
+    bare_dir = os.path.join(root, "template.git")
+    _git("clone", "-q", "--bare", work_dir, bare_dir, cwd=root)
+    shutil.rmtree(work_dir)
+    return Template("file://" + bare_dir, versions)
+
+
+def create_project(root: str, template: Template, version: str) -> str:
+    """Creates a committed project of a template version with ``footing.setup.setup``
+
+    Returns:
+        The directory of the project
+    """
+    os.makedirs(root, exist_ok=True)
+    with footing.utils.cd(root), answer_defaults():
+        footing.setup.setup(template.path, version=version)
+
+    project_dir = os.path.join(root, "project")
+    _git("init", "-q", cwd=project_dir)
+    _git("add", ".", cwd=project_dir)
+    _git("commit", "-q", "-m", "Initial commit", cwd=project_dir)
+    return project_dir
+
+
+def copy_project(project_dir: str, dest: str) -> str:
+    """Clones a project, so that it can be updated again"""
+    _git("clone", "-q", project_dir, dest, cwd=os.path.dirname(dest))
+    return dest
@@ -0,0 +1,166 @@
+"""Profiles the render cost of every file and hook of a template.
+
+A template is rendered at a version with a sample context, either the
+context of the footing project in the current directory or the defaults
+of the template's cookiecutter.json. Cookiecutter's ``generate_file`` and
+``run_hook`` are wrapped so that the render time and output size of every
+templated file and the runtime of every hook are recorded. Files that the
+template copies without rendering are not profiled.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import tempfile
+import time
+import unittest.mock
+
+import cookiecutter.generate as cc_generate
+import cookiecutter.hooks as cc_hooks
+import cookiecutter.main as cc_main
+
+import footing.check
+import footing.constants
+import footing.render
+import footing.utils
+
+
+@dataclasses.dataclass(frozen=True)
+class FileTiming:
+    """The render cost of a single file or hook of a template
+
+    Attributes:
+        path: The path of the file or hook script, relative to the template
+        kind: "file" for templated files or "hook" for hook scripts
+        seconds: The time spent rendering the file or running the hook
+        bytes: The size of the rendered file. None for hooks
+    """
+
+    path: str
+    kind: str
+    seconds: float
+    bytes: int | None = None
+
+
+@dataclasses.dataclass
+class TemplateBenchmark:
+    """The render cost of a template at a version
+
+    Attributes:
+        template: The git path of the template
+        version: The git SHA of the template
+        context: The cookiecutter context that rendered the template
+        seconds: The time spent rendering the whole template
+        files: The cost of every templated file and hook, slowest first
+    """
+
+    template: str
+    version: str
+    context: dict
+    seconds: float
+    files: list[FileTiming]
+
+    def to_json(self) -> str:
+        """Returns the benchmark as JSON"""
+        return json.dumps(dataclasses.asdict(self), indent=2)
+
+    def write(self, path: str) -> None:
+        """Writes the benchmark as JSON to a file"""
+        with open(path, "w") as f:
+            f.write(self.to_json())
+
+
+def _get_template_and_context(template, path):
+    """Returns the template and the sample context of a benchmark
+
+    The context of the footing project in ``path`` is used when it was created
+    from the template. Otherwise the context is None so that the defaults of
+    cookiecutter.json are used.
+    """
+    footing_config = None
+    if os.path.exists(os.path.join(path, footing.constants.FOOTING_CONFIG_FILE)):
+        footing_config = footing.utils.read_footing_config(path)
+
+    if not template:
+        footing.check.is_footing_project(path)
+        template = footing_config["_template"]
+
+    if footing_config and footing_config["_template"] == template:
+        return template, footing.render.get_context(footing_config)
+    else:
+        return template, None
+
+
+def _render(checkout_dir, context, output_dir):
+    """Renders a checkout of a template and returns the cost of its files and hooks"""
+    timings = []
+    checkout_dir = os.path.realpath(checkout_dir)
+    generate_file = cc_generate.generate_file
+    run_hook = cc_hooks.run_hook
+
+    def _timed_generate_file(project_dir, infile, context, env, *args, **kwargs):
+        # Cookiecutter renders files from the directory of the template
+        rel_path = os.path.relpath(os.path.abspath(infile), checkout_dir)
+        start = time.perf_counter()
+        generate_file(project_dir, infile, context, env, *args, **kwargs)
+        seconds = time.perf_counter() - start
+
+        outfile = os.path.join(project_dir, env.from_string(infile).render(**context))
+        timings.append(FileTiming(rel_path, "file", seconds, os.path.getsize(outfile)))
+
+    def _timed_run_hook(hook_name, project_dir, context):
+        # Cookiecutter runs hooks from the root of the template
+        script = cc_hooks.find_hook(hook_name)
+        start = time.perf_counter()
+        run_hook(hook_name, project_dir, context)
+        if script:
+            rel_path = os.path.relpath(script, checkout_dir)
+            timings.append(FileTiming(rel_path, "hook", time.perf_counter() - start))
+
+    patch_generate_file = unittest.mock.patch(
+        "cookiecutter.generate.generate_file", side_effect=_timed_generate_file
+    )
+    patch_run_hook = unittest.mock.patch(
+        "cookiecutter.generate.run_hook", side_effect=_timed_run_hook
+    )
+    with patch_generate_file, patch_run_hook:
+        cc_main.cookiecutter(
+            checkout_dir, no_input=True, output_dir=output_dir, extra_context=context
+        )
+
+    return sorted(timings, key=lambda timing: (-timing.seconds, timing.path))
+
+
+def bench_template(
+    template: str | None = None, version: str | None = None, path: str = "."
+) -> TemplateBenchmark:
+    """Renders a template and profiles the cost of every file and hook
+
+    Args:
+        template: The git path of the template. Defaults to the template of
+            the footing project in ``path``
+        version: The git SHA or branch of the template. Defaults to the latest version
+        path: The directory of a footing project whose context renders the
+            template. The defaults of cookiecutter.json are used when ``path``
+            is not a project of the template
+
+    Returns:
+        The render time of the template and the cost of its files, slowest first
+    """
+    template, context = _get_template_and_context(template, path)
+
+    cache = footing.render.TemplateCache()
+    sha = cache.resolve(template, version)
+    checkout_dir = cache.checkout(template, sha)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        files = _render(checkout_dir, context, output_dir)
+        seconds = time.perf_counter() - start
+
+    if context is None:
+        context = cache.config(template, sha)
+
+    return TemplateBenchmark(template, sha, context, seconds, files)
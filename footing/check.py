@@ -5,7 +5,7 @@ import subprocess
 
 import footing.constants
 import footing.exceptions
-import footing.utils
+import footing.git
 
 
 def is_git_ssh_path(template_path):
@@ -20,15 +20,17 @@ def is_git_ssh_path(template_path):
         )
 
 
-def _in_git_repo():
+def _in_git_repo(path=None):
     """Returns True if inside a git repo, False otherwise"""
-    ret = footing.utils.shell("git rev-parse", stderr=subprocess.DEVNULL, check=False)
+    ret = footing.git.runner.run("rev-parse", stderr=subprocess.DEVNULL, check=False, cwd=path)
     return ret.returncode == 0
 
 
-def in_git_repo():
-    """Raises `NotInGitRepoError` if not inside a git repository"""
-    if not _in_git_repo():
+def in_git_repo(path=None):
+    """Raises `NotInGitRepoError` if ``path`` (or the current directory) is not
+    inside a git repository
+    """
+    if not _in_git_repo(path):
         msg = "Must be inside git repository of project to run this command."
         raise footing.exceptions.NotInGitRepoError(msg)
 
@@ -42,7 +44,7 @@ def not_in_git_repo():
 
 def _in_clean_repo():
     """Returns True if the git repo is not dirty, False otherwise"""
-    ret = footing.utils.shell("git diff-index --quiet HEAD --", check=False)
+    ret = footing.git.runner.run("diff-index", "--quiet", "HEAD", "--", check=False)
     return ret.returncode == 0
 
 
@@ -55,8 +57,10 @@ def in_clean_repo():
 
 def _has_branch(branch):
     """Return True if the target branch exists."""
-    ret = footing.utils.shell(
-        "git rev-parse --verify {}".format(branch),
+    ret = footing.git.runner.run(
+        "rev-parse",
+        "--verify",
+        branch,
         stderr=subprocess.DEVNULL,
         stdout=subprocess.DEVNULL,
         check=False,
@@ -64,11 +68,21 @@ def _has_branch(branch):
     return ret.returncode == 0
 
 
-def not_has_branch(branch):
-    """Raises `ExistingBranchError` if the specified branch exists."""
-    if _has_branch(branch):
-        msg = "Cannot proceed while {} branch exists; remove and try again.".format(branch)
-        raise footing.exceptions.ExistingBranchError(msg)
+def not_has_branch(*branches):
+    """Raises `ExistingBranchError` if any of the specified branches exist.
+
+    The branches are verified concurrently.
+    """
+    rets = footing.git.runner.run_many(
+        [("rev-parse", "--verify", branch) for branch in branches],
+        stderr=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        check=False,
+    )
+    for branch, ret in zip(branches, rets):
+        if ret.returncode == 0:
+            msg = "Cannot proceed while {} branch exists; remove and try again.".format(branch)
+            raise footing.exceptions.ExistingBranchError(msg)
 
 
 def has_env_vars(*env_vars):
@@ -81,8 +95,10 @@ def has_env_vars(*env_vars):
             raise footing.exceptions.InvalidEnvironmentError(msg)
 
 
-def is_footing_project():
-    """Raises `InvalidFootingProjectError` if repository is not a footing project"""
-    if not os.path.exists(footing.constants.FOOTING_CONFIG_FILE):
+def is_footing_project(path="."):
+    """Raises `InvalidFootingProjectError` if the repository in ``path`` is not a
+    footing project
+    """
+    if not os.path.exists(os.path.join(path, footing.constants.FOOTING_CONFIG_FILE)):
         msg = "No {} file found in repository.".format(footing.constants.FOOTING_CONFIG_FILE)
         raise footing.exceptions.InvalidFootingProjectError(msg)
@@ -1,17 +1,14 @@
 """Functions for cleaning up temporary resources used by footing."""
 
-import subprocess
-
 import footing.check
 import footing.constants
 import footing.exceptions
-import footing.utils
+import footing.git
 
 
 def _get_current_branch():
     """Determine the current git branch"""
-    result = footing.utils.shell("git rev-parse --abbrev-ref HEAD", stdout=subprocess.PIPE)
-    return result.stdout.decode("utf8").strip()
+    return footing.git.runner.output("rev-parse", "--abbrev-ref", "HEAD")
 
 
 def clean() -> None:
@@ -35,6 +32,6 @@ def clean() -> None:
         raise footing.exceptions.InvalidCurrentBranchError(err_msg)
 
     if footing.check._has_branch(update_branch):
-        footing.utils.shell("git branch -D {}".format(update_branch))
+        footing.git.runner.run("branch", "-D", update_branch)
     if footing.check._has_branch(temp_update_branch):
-        footing.utils.shell("git branch -D {}".format(temp_update_branch))
+        footing.git.runner.run("branch", "-D", temp_update_branch)
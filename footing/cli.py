@@ -8,27 +8,68 @@ Commands:
 * `footing update` - Updates the project to the latest template version
 * `footing clean` - Cleans up any temporary resources used by footing
 * `footing switch` - Switch a project to a different template
+* `footing fleet update` - Updates many local projects concurrently
+* `footing check-all` - Checks if every project under a directory is up to date
+* `footing serve` - Runs a daemon that keeps caches and clients warm for other commands
+* `footing webhook` - Precomputes the updates of projects from a template push webhook
+
+Commands import the modules they use when they run, so that commands such as
+`footing --version` and `footing clean` do not pay for importing cookiecutter,
+requests, and the forge clients. Commands that talk to remotes share SSH
+connections between their git calls.
+
+When `footing serve` is running, ``footing update -c`` and ``footing ls``
+are forwarded to it.
 """
 
+import contextlib
+import json
+import os
+import sys
+
 import click
-import pkg_resources
 
 import footing
-import footing.clean
+import footing.constants
 import footing.exceptions
-import footing.ls
-import footing.setup
-import footing.update
+import footing.git
+import footing.trace
 
 
 @click.group(invoke_without_command=True)
 @click.pass_context
 @click.option("--version", is_flag=True, help="Show version")
-def main(ctx, version):
+@click.option(
+    "--trace",
+    default=None,
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the timings of the command's phases to this file in Chrome trace-event format",
+)
+@click.option(
+    "--metrics",
+    default=None,
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the forge API requests of the command to this file."
+    ' Files ending in ".prom" are written in the Prometheus text format, others as JSON',
+)
+def main(ctx, version, trace, metrics):
     if version:
-        print("footing {}".format(pkg_resources.get_distribution("footing").version))
+        print("footing {}".format(footing.__version__))
     elif not ctx.invoked_subcommand:
         print(ctx.get_help())
+    else:
+        resources = contextlib.ExitStack()
+        if trace:
+            resources.enter_context(footing.trace.tracing(trace))
+            resources.enter_context(footing.trace.span(ctx.invoked_subcommand, "command"))
+        if metrics:
+            resources.callback(_write_metrics, metrics)
+        ctx.call_on_close(resources.close)
+
+
+def _share_ssh_connections():
+    """Shares SSH connections between the git calls of the running command"""
+    click.get_current_context().with_resource(footing.git.ssh_multiplexing())
 
 
 @main.command()
@@ -45,11 +86,20 @@ def setup(template, version):
     by "footing ls". In order to start a project from a
     particular version (instead of the latest), use the "-v" option.
     """
+    import footing.setup
+
+    _share_ssh_connections()
     footing.setup.setup(template, version=version)
 
 
 @main.command()
 @click.option("-c", "--check", is_flag=True, help="Check to see if up to date")
+@click.option(
+    "-r",
+    "--rendered",
+    is_flag=True,
+    help="When checking, compare the rendered template against the recorded tree",
+)
 @click.option(
     "-e",
     "--enter-parameters",
@@ -62,7 +112,14 @@ def setup(template, version):
     default=None,
     help="Git SHA or branch of template to use for update",
 )
-def update(check, enter_parameters, version):
+@click.option(
+    "-a",
+    "--all",
+    "all_projects",
+    is_flag=True,
+    help="Update every footing project in the repository",
+)
+def update(check, rendered, enter_parameters, version, all_projects):
     """
     Update package with latest template. Must be inside of the project
     folder to run.
@@ -75,17 +132,31 @@ def update(check, enter_parameters, version):
     Using "-c" will perform a check that the project is up to date
     with the latest version of the template (or the version specified by "-v").
     No updating will happen when using this option.
+
+    Using "-r" with "-c" will also render the new template version when the
+    versions differ. The package is reported as effectively up to date when
+    the rendered template is unchanged.
+
+    Using "-a" will update every footing project found in the repository,
+    such as the projects of a monorepo, on a single update branch. Projects
+    are not prompted for new template parameters when using this option.
+
+    Checks are run by "footing serve" when it is running.
     """
-    if check:
-        if footing.update.up_to_date(version=version):
-            print("Footing package is up to date")
-        else:
-            msg = (
-                "This footing package is out of date with the latest template."
-                ' Update your package by running "footing update" and commiting changes.'
-            )
-            raise footing.exceptions.NotUpToDateWithTemplateError(msg)
+    if all_projects:
+        if check or enter_parameters or version:
+            raise click.UsageError('"-a" cannot be used with "-c", "-e", or "-v"')
+
+        import footing.update
+
+        _share_ssh_connections()
+        footing.update.update_all()
+    elif check:
+        _check(version, rendered)
     else:
+        import footing.update
+
+        _share_ssh_connections()
         footing.update.update(new_version=version, enter_parameters=enter_parameters)
 
 
@@ -98,17 +169,87 @@ def update(check, enter_parameters, version):
     is_flag=True,
     help="Print extended information about results",
 )
-def ls(forge, template, long_format):
+@click.option(
+    "-s",
+    "--status",
+    is_flag=True,
+    help="Print the template versions of projects",
+)
+@click.option(
+    "-o",
+    "--older-than",
+    default=None,
+    help="Only print projects on template versions older than this git SHA or branch",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Print results from the local index without querying the forge",
+)
+def ls(forge, template, long_format, status, older_than, offline):
     """
     List packages created with footing. Enter a git forge path, such as a Github
     user or Gitlab group URL, to list all templates under the forge.
     Provide the template path as the second argument to list all projects
     that have been started with that template.
 
+    Separate several forge paths with commas to list them concurrently.
+    Results are merged, and the time taken by each forge is printed to stderr.
+
     Use "-l" to print the repository descriptions of templates
     or projects.
+
+    Use "-s" with a template to print how many projects are on each
+    template version and which projects are out of date. Projects are
+    not cloned.
+
+    Use "-o" with a template to print the projects on template versions
+    older than a version.
+
+    Results are recorded in a local index. Use "--offline" to print
+    results from the index without querying the forge.
+
+    Listings of a single forge are run by "footing serve" when it is running.
     """
-    results = footing.ls.ls(forge, template=template)
+    forges = [path.strip() for path in forge.split(",") if path.strip()]
+    if (status or older_than) and not template:
+        raise click.UsageError('"-s" and "-o" require a template')
+    elif (status or older_than) and len(forges) > 1:
+        raise click.UsageError('"-s" and "-o" require a single forge')
+    elif status or older_than or len(forges) > 1:
+        import footing.ls
+
+    if not offline:
+        _share_ssh_connections()
+
+    if older_than:
+        older_projects = footing.ls.older_than(forge, template, older_than, offline=offline)
+        for project, version in older_projects.items():
+            print("{} ({})".format(project, version))
+        return
+    elif status:
+        _print_template_status(footing.ls.status(forge, template, offline=offline))
+        return
+
+    if len(forges) > 1:
+        listings = footing.ls.ls_many(forges, template=template, offline=offline)
+        results = footing.ls.merge(listings)
+        for listing in listings:
+            print(
+                "{}: {} results in {:.2f}s".format(
+                    listing.forge, len(listing.results), listing.seconds
+                ),
+                file=sys.stderr,
+            )
+    else:
+        client = _get_daemon_client()
+        if client:
+            results = client.run("ls", forge=forge, template=template, offline=offline)
+        else:
+            import footing.ls
+
+            results = footing.ls.ls(forge, template=template, offline=offline)
+
     for ssh_path, description in results.items():
         if long_format:
             print(ssh_path, "-", description)
@@ -116,11 +257,167 @@ def ls(forge, template, long_format):
             print(ssh_path)
 
 
+def _get_status(version, rendered):
+    client = _get_daemon_client()
+    if client:
+        return client.run("check", path=os.getcwd(), version=version, rendered=rendered)
+
+    import footing.update
+
+    _share_ssh_connections()
+    return footing.update.status(version=version, rendered=rendered)
+
+
+def _check(version, rendered):
+    status = _get_status(version, rendered)
+    if status == footing.constants.OUT_OF_DATE:
+        msg = (
+            "This footing package is out of date with the latest template."
+            ' Update your package by running "footing update" and commiting changes.'
+        )
+        raise footing.exceptions.NotUpToDateWithTemplateError(msg)
+    elif status == footing.constants.EFFECTIVELY_UP_TO_DATE:
+        print("Footing package is effectively up to date (the rendered template is unchanged)")
+    else:
+        print("Footing package is up to date")
+
+
+def _write_metrics(path):
+    import footing.metrics
+
+    footing.metrics.metrics.write(path)
+
+
+def _get_daemon_client():
+    """Returns a client of the running footing daemon, or None"""
+    import footing.serve
+
+    return footing.serve.get_client()
+
+
+def _print_template_status(template_status):
+    latest_version = template_status.latest_version
+    print("Latest version of {}: {}".format(template_status.template, latest_version))
+    print()
+    print("Versions:")
+    for version, count in template_status.histogram.most_common():
+        if version and version == latest_version:
+            version = "{} (latest)".format(version)
+        print("  {}: {}".format(version or "unknown", count))
+
+    if template_status.out_of_date:
+        print()
+        print("Out of date:")
+        for project in template_status.out_of_date:
+            print("  {} ({})".format(project, template_status.versions[project]))
+
+
+@main.command("check-all")
+@click.argument("directory", nargs=1, required=False, default=".")
+def check_all(directory):
+    """
+    Check if every footing project under a directory is up to date with
+    the latest version of its template. The directory defaults to the
+    current directory.
+
+    Results are printed as JSON. The command fails if any project is out
+    of date or could not be checked.
+    """
+    import footing.update
+
+    _share_ssh_connections()
+    results = footing.update.check_all(directory)
+    print(json.dumps(results, indent=2))
+
+    num_out_of_date = sum(1 for result in results if result["up_to_date"] is False)
+    num_errors = sum(1 for result in results if result["error"])
+    if num_out_of_date:
+        raise footing.exceptions.NotUpToDateWithTemplateError(
+            "{} of {} footing projects are out of date".format(num_out_of_date, len(results))
+        )
+    elif num_errors:
+        raise footing.exceptions.CheckRunError(
+            "{} of {} footing projects could not be checked".format(num_errors, len(results))
+        )
+
+
+@main.command()
+@click.option(
+    "-p",
+    "--port",
+    default=0,
+    type=click.IntRange(min=0),
+    help="Localhost port of the daemon. A free port is chosen by default",
+)
+def serve(port):
+    """
+    Run a daemon that keeps caches and clients warm for other footing commands.
+
+    While the daemon runs, "footing update -c" and "footing ls" are forwarded to
+    it by every user of the host with the same footing cache directory. The
+    latest versions of templates are cached, and forge sessions, SSH connections,
+    and imported modules stay open between commands. Jobs use the environment
+    of the daemon, such as its forge tokens.
+
+    Stop the daemon with Ctrl-C.
+    """
+    import footing.serve
+
+    _share_ssh_connections()
+    footing.serve.serve(port=port)
+
+
+@main.command()
+@click.argument("payload", type=click.File("r"))
+@click.option(
+    "-f",
+    "--forge",
+    default=None,
+    help="Forge path of the template's projects. Defaults to the template's owner or group",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="List the template's projects from the local index without querying the forge",
+)
+def webhook(payload, forge, offline):
+    """
+    Precompute the updates of projects from the payload of a template push
+    webhook. Use "-" to read the payload from stdin. Github and Gitlab push
+    payloads are supported.
+
+    The pushed version of the template is fetched, and the current and new
+    versions are rendered once for every distinct context of the template's
+    projects. Later "footing update" runs with the same cache directory reuse
+    the renders. Pushes to branches other than the default branch are ignored.
+
+    Forges can also post webhooks to a running "footing serve". Set
+    FOOTING_WEBHOOK_SECRET to the secret of the webhook.
+    """
+    import footing.webhook
+
+    _share_ssh_connections()
+    result = footing.webhook.handle_push(json.load(payload), forge=forge, offline=offline)
+    if not result:
+        print("Ignored push that is not to the default branch")
+        return
+
+    print(
+        "Precomputed {} renders of {} at {} for {} projects".format(
+            result.renders, result.template, result.sha, len(result.projects)
+        )
+    )
+    for error in result.errors:
+        print("Failed to render {}".format(error), file=sys.stderr)
+
+
 @main.command()
 def clean():
     """
     Cleans temporary resources created by footing, such as the footing update branch
     """
+    import footing.clean
+
     footing.clean.clean()
 
 
@@ -136,4 +433,131 @@ def switch(template, version):
     """
     Switch a project's template to a different template.
     """
+    import footing.update
+
+    _share_ssh_connections()
     footing.update.update(new_template=template, new_version=version)
+
+
+@main.command("bench-template")
+@click.argument("template", nargs=1, required=False)
+@click.option(
+    "-v",
+    "--version",
+    default=None,
+    help="Git SHA or branch of template to render. Defaults to the latest version",
+)
+@click.option(
+    "-n",
+    "--top",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Only print the slowest N files and hooks",
+)
+@click.option(
+    "-o",
+    "--output",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Write the results as JSON to this file",
+)
+def bench_template(template, version, top, output):
+    """
+    Profile the render time of every file and hook of a template. Defaults to
+    the template of the footing project in the current directory.
+
+    The template is rendered with the parameters of footing.yaml when the
+    current directory is a project of the template. Otherwise the defaults of
+    cookiecutter.json are used. Files and hooks are printed slowest first
+    with their render time and output size.
+    """
+    import footing.bench
+
+    _share_ssh_connections()
+    result = footing.bench.bench_template(template=template, version=version)
+    for timing in result.files[:top]:
+        size = "-" if timing.bytes is None else "{:,} B".format(timing.bytes)
+        print(
+            "{:>10.1f} ms {:>12}  {:<4}  {}".format(
+                timing.seconds * 1000, size, timing.kind, timing.path
+            )
+        )
+
+    print(
+        "Rendered {} files and hooks of {} at {} in {:.2f}s".format(
+            len(result.files), result.template, result.version, result.seconds
+        ),
+        file=sys.stderr,
+    )
+    if output:
+        result.write(output)
+
+
+@main.group()
+def fleet():
+    """
+    Manage a fleet of local footing projects.
+    """
+
+
+@fleet.command("update")
+@click.argument("directories", nargs=-1)
+@click.option(
+    "-m",
+    "--manifest",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False),
+    help="File listing the paths of projects to update, one per line",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Number of projects to update at once",
+)
+@click.option(
+    "-A",
+    "--answer",
+    "answers",
+    multiple=True,
+    help="Value of a template parameter as KEY=VALUE, used instead of prompting",
+)
+def fleet_update(directories, manifest, jobs, answers):
+    """
+    Update many local footing projects to their latest templates. Projects
+    are the directories of a manifest and the subdirectories of each
+    directory argument that contain footing.yaml. The current directory is
+    used when no directories or manifest are provided.
+
+    Projects are never prompted for template parameters. Use "-A" to
+    provide the values of parameters that are new to a project.
+
+    A summary of updated, up to date, conflicted, and failed projects
+    is printed at the end.
+    """
+    import footing.fleet
+
+    for answer in answers:
+        if "=" not in answer:
+            raise click.BadParameter(
+                'Answers must be formatted as "KEY=VALUE"', param_hint='"-A" / "--answer"'
+            )
+
+    paths = footing.fleet.read_manifest(manifest) if manifest else []
+    for directory in directories or ([] if manifest else ["."]):
+        paths.extend(footing.fleet.find_projects(directory))
+
+    _share_ssh_connections()
+    results = footing.fleet.update(
+        paths,
+        max_workers=jobs,
+        answers=dict(answer.split("=", 1) for answer in answers),
+    )
+    print(footing.fleet.summarize(results))
+
+    num_failed = sum(1 for result in results if result.status == footing.constants.FAILED)
+    if num_failed:
+        raise footing.exceptions.FleetUpdateError(
+            "{} of {} projects failed to update".format(num_failed, len(results))
+        )
@@ -7,15 +7,91 @@ FOOTING_ENV_VAR = "_FOOTING"
 #: The footing config file in each repo
 FOOTING_CONFIG_FILE = "footing.yaml"
 
+#: Directories that are never searched for footing projects. Hidden directories
+#: and virtualenvs are not searched either
+FIND_SKIPPED_DIRS = ("node_modules", "__pycache__", "site-packages")
+
+#: The environment variable for overriding the directory of footing's caches
+FOOTING_CACHE_DIR_ENV_VAR = "FOOTING_CACHE_DIR"
+
 #: The Github API token environment variable
 GITHUB_API_TOKEN_ENV_VAR = "GITHUB_API_TOKEN"
 
+#: The environment variable with a comma-separated pool of Github API tokens
+GITHUB_API_TOKENS_ENV_VAR = "GITHUB_API_TOKENS"
+
+#: The environment variables of a Github App whose installation tokens are
+#: added to the pool of Github API tokens. The private key variable is the path
+#: of the App's private key file, and installation IDs are comma-separated
+GITHUB_APP_ID_ENV_VAR = "GITHUB_APP_ID"
+GITHUB_APP_PRIVATE_KEY_ENV_VAR = "GITHUB_APP_PRIVATE_KEY_PATH"
+GITHUB_APP_INSTALLATION_IDS_ENV_VAR = "GITHUB_APP_INSTALLATION_IDS"
+
+#: The hourly number of Github API requests of a token, assumed until Github reports it
+GITHUB_RATE_LIMIT = 5000
+
+#: The root URL of the Github API
+GITHUB_API_URL = "https://api.github.com"
+
 #: The Gitlab API token environment variable
 GITLAB_API_TOKEN_ENV_VAR = "GITLAB_API_TOKEN"
 
+#: The maximum number of forge API requests made at once
+FORGE_API_MAX_WORKERS = 16
+
+#: Seconds to wait for the preferred method of looking up the latest version of a
+#: template before also trying the other one. Git SSH is preferred unless the forge
+#: API answered first for the template's host last time
+LATEST_VERSION_HEDGE_DELAY = 1.0
+
+#: Seconds before a git SSH lookup of the latest version of a template is abandoned
+LATEST_VERSION_SSH_TIMEOUT = 30
+
+#: Seconds before a forge API lookup of the latest version of a template is abandoned
+LATEST_VERSION_API_TIMEOUT = 30
+
+#: Seconds that a shared SSH connection of `footing.git.ssh_multiplexing` stays
+#: open after its last use
+SSH_CONTROL_PERSIST = 60
+
+#: The number of jobs of each kind that `footing serve` runs at once. Updates
+#: change the working directory, so they run one at a time
+SERVE_MAX_JOBS = {"check": 8, "ls": 4, "update": 1, "webhook": 1}
+
+#: Seconds that `footing serve` caches the latest version of a template
+SERVE_LATEST_VERSION_TTL = 60
+
+#: The environment variable with the secret of template push webhooks sent to `footing serve`
+WEBHOOK_SECRET_ENV_VAR = "FOOTING_WEBHOOK_SECRET"
+
+#: The file in the cache directory with the address and token of `footing serve`
+SERVE_ADDRESS_FILE = "serve.json"
+
+#: Seconds that the CLI waits for `footing serve` to answer before running commands itself
+SERVE_CONNECT_TIMEOUT = 1
+
+#: The upper bounds in seconds of the latency histogram buckets of forge API requests
+FORGE_METRICS_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+#: The maximum number of results returned by Github's code search API
+GITHUB_CODE_SEARCH_MAX_RESULTS = 1000
+
+#: The maximum number of files listed by Github's compare API
+GITHUB_COMPARE_MAX_FILES = 300
+
 #: Footing docs URL
 FOOTING_DOCS_URL = "https://github.com/Opus10/footing"
 
 #: The temporary branches used for updates
 UPDATE_BRANCH_NAME = "_footing_update"
 TEMP_UPDATE_BRANCH_NAME = UPDATE_BRANCH_NAME + "_temp"
+
+#: The statuses of a project reported by `footing.update.status`
+UP_TO_DATE = "up to date"
+EFFECTIVELY_UP_TO_DATE = "effectively up to date"
+OUT_OF_DATE = "out of date"
+
+#: The statuses of a project reported by `footing.fleet.update`
+UPDATED = "updated"
+CONFLICTED = "conflicted"
+FAILED = "failed"
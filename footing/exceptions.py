@@ -25,6 +25,18 @@ class NotUpToDateWithTemplateError(Error):
     """Thrown when a footing project is not up to date with the template"""
 
 
+class FleetUpdateError(Error):
+    """Thrown when updating one or more projects of a fleet fails"""
+
+
+class DaemonJobError(Error):
+    """Thrown when a job sent to the footing daemon fails unexpectedly"""
+
+
+class InvalidWebhookError(Error):
+    """Thrown when a webhook payload is not a push to a template"""
+
+
 class CheckRunError(Error):
     """When running ``footing update --check`` errors"""
 
@@ -37,6 +49,10 @@ class InvalidForgeError(Error):
     """An invalid forge was passed to ls."""
 
 
+class NotIndexedError(Error):
+    """Thrown when offline results are requested for a forge listing that was never indexed"""
+
+
 class InvalidTemplatePathError(Error):
     """Thrown when a template path is not a Github SSH path"""
 
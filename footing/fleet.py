@@ -0,0 +1,202 @@
+"""Updates a fleet of local footing projects concurrently.
+
+A fleet is a collection of local clones of footing projects, such as every
+repository created from a set of templates. Projects are updated in a pool
+of processes. The latest version of each template is obtained once and each
+template is fetched once before any project is updated. Projects share the
+on-disk `footing.render.TemplateCache`, so a context that is shared by several
+projects is only rendered once.
+"""
+
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import contextlib
+import dataclasses
+import io
+import os
+
+import footing.constants
+import footing.exceptions
+import footing.forge
+import footing.git
+import footing.render
+import footing.update
+import footing.utils
+
+
+@dataclasses.dataclass(frozen=True)
+class FleetResult:
+    """The result of updating a single project of a fleet
+
+    Attributes:
+        path: The path of the project
+        status: One of `footing.constants.UPDATED`, `footing.constants.UP_TO_DATE`,
+            `footing.constants.CONFLICTED`, or `footing.constants.FAILED`
+        message: The conflicting files or the error of the update
+    """
+
+    path: str
+    status: str
+    message: str = ""
+
+
+def find_projects(directory: str) -> list[str]:
+    """Finds the footing projects that are direct subdirectories of a directory
+
+    Returns:
+        Sorted paths of the projects
+    """
+    return sorted(
+        entry.path
+        for entry in os.scandir(directory)
+        if entry.is_dir()
+        and os.path.exists(os.path.join(entry.path, footing.constants.FOOTING_CONFIG_FILE))
+    )
+
+
+def read_manifest(manifest: str) -> list[str]:
+    """Reads the project paths of a manifest file
+
+    A manifest lists one project path per line. Blank lines and lines starting
+    with "#" are ignored. Relative paths are relative to the directory of the manifest.
+    """
+    manifest_dir = os.path.dirname(os.path.abspath(manifest))
+    with open(manifest) as f:
+        return [
+            os.path.join(manifest_dir, line.strip())
+            for line in f
+            if line.strip() and not line.strip().startswith("#")
+        ]
+
+
+def _prepare_template(template, versions, cache):
+    """Obtains the latest version of a template and fetches it with ``versions``
+
+    Every version is fetched before updating so that worker processes never fetch.
+    """
+    client = footing.forge.from_path(template)
+    latest_version = client.get_latest_template_version(template)
+    for version in sorted({*versions, latest_version}):
+        cache.resolve(template, version)
+
+    return latest_version
+
+
+def _update_project(path, new_version, answers):
+    """Updates a single project. Runs inside of a worker process"""
+    output = io.StringIO()
+    try:
+        with footing.utils.cd(path), contextlib.redirect_stdout(output):
+            if not footing.update.update(new_version=new_version, answers=answers):
+                return FleetResult(path, footing.constants.UP_TO_DATE)
+
+            unmerged = footing.git.runner.output("diff", "--name-only", "--diff-filter=U")
+    except Exception as exc:
+        # One broken project should never stop the rest of the fleet
+        return FleetResult(path, footing.constants.FAILED, str(exc) or type(exc).__name__)
+
+    # footing.yaml is always unmerged, but the update already resolved it to the new template
+    conflicts = [
+        unmerged_path
+        for unmerged_path in unmerged.split()
+        if os.path.basename(unmerged_path) != footing.constants.FOOTING_CONFIG_FILE
+    ]
+    if conflicts:
+        return FleetResult(path, footing.constants.CONFLICTED, ", ".join(conflicts))
+
+    return FleetResult(path, footing.constants.UPDATED)
+
+
+def update(
+    paths: list[str], max_workers: int | None = None, answers: dict | None = None
+) -> list[FleetResult]:
+    """Updates footing projects to the latest versions of their templates
+
+    Projects are updated with `footing.update.update` in a pool of processes.
+    The user is never prompted. Template parameters that are not configured in
+    a project are taken from ``answers`` or use their default values.
+
+    Updated projects are left on the ``_footing_update`` branch for review.
+    Errors in a project are reported in its result and do not stop other updates.
+
+    Args:
+        paths: The paths of the projects to update
+        max_workers: The maximum number of projects updated at once.
+            Defaults to the number of CPUs
+        answers: Values for template parameters that are not configured in a project
+
+    Returns:
+        The result of every project in the same order as ``paths``
+    """
+    answers = answers or {}
+    results = {}
+    configs = {}
+    for path in paths:
+        try:
+            configs[path] = footing.utils.read_valid_footing_config(path)
+        except (OSError, footing.exceptions.Error) as exc:
+            results[path] = FleetResult(path, footing.constants.FAILED, str(exc))
+
+    versions = collections.defaultdict(set)
+    for config in configs.values():
+        versions[config["_template"]].add(config["_version"])
+
+    cache = footing.render.TemplateCache()
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        futures = {
+            template: executor.submit(_prepare_template, template, template_versions, cache)
+            for template, template_versions in versions.items()
+        }
+
+    latest_versions = {}
+    for template, future in futures.items():
+        try:
+            latest_versions[template] = future.result()
+        except Exception as exc:
+            for path, config in list(configs.items()):
+                if config["_template"] == template:
+                    results[path] = FleetResult(path, footing.constants.FAILED, str(exc))
+                    del configs[path]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _update_project, path, latest_versions[config["_template"]], answers
+            ): path
+            for path, config in configs.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as exc:
+                # Such as a worker process that died, which fails the projects left in the pool
+                result = FleetResult(
+                    futures[future], footing.constants.FAILED, str(exc) or type(exc).__name__
+                )
+            print("{}: {}".format(result.path, result.status))
+            results[result.path] = result
+
+    return [results[path] for path in paths]
+
+
+def summarize(results: list[FleetResult]) -> str:
+    """Summarizes the results of a fleet update
+
+    The number of projects with each status is listed, followed by
+    the conflicted and failed projects.
+    """
+    counts = collections.Counter(result.status for result in results)
+    statuses = (
+        footing.constants.UPDATED,
+        footing.constants.UP_TO_DATE,
+        footing.constants.CONFLICTED,
+        footing.constants.FAILED,
+    )
+    lines = ["{}: {}".format(status.capitalize(), counts[status]) for status in statuses]
+    for result in results:
+        if result.status in (footing.constants.CONFLICTED, footing.constants.FAILED):
+            lines.append("{} ({}) - {}".format(result.path, result.status, result.message))
+
+    return "\n".join(lines)
@@ -3,25 +3,44 @@ Utilities for accessing and traversing different git forges, along with pulling
 remote templates.
 
 Currently Github and Gitlab are supported.
+
+Forges have an asyncio interface for fanning out many forge calls on one event
+loop. Blocking HTTP and git calls run in a thread pool that is shared by every
+forge of the process, and HTTP calls share one connection pool. The synchronous
+methods are thin wrappers that run the asynchronous methods in a new event loop.
 """
 
 from __future__ import annotations
 
 import abc
+import asyncio
 import collections
+import concurrent.futures
+import contextlib
+import functools
+import json
 import os
 import re
 import subprocess
-from urllib.parse import urlparse
+import threading
+import time
+import weakref
+from urllib.parse import parse_qs, urlparse
 
 import gitlab
 import gitlab.const
+import gitlab.exceptions
 import requests
-import tldextract
+import requests.adapters
+import yaml
 
 import footing.check
 import footing.constants
 import footing.exceptions
+import footing.git
+import footing.metrics
+import footing.tokens
+import footing.trace
 import footing.utils
 
 
@@ -47,37 +66,308 @@ def from_path(path):
         )
 
 
+_shared_lock = threading.Lock()
+_shared: dict = {}
+
+
+def _reset_shared():
+    """Drops the pools inherited from a parent process. Their threads and sockets are not"""
+    global _shared_lock
+    _shared_lock = threading.Lock()
+    _shared.clear()
+
+
+getattr(os, "register_at_fork", lambda **kwargs: None)(after_in_child=_reset_shared)
+
+
+def _get_shared(name, create):
+    with _shared_lock:
+        if name not in _shared:
+            _shared[name] = create()
+        return _shared[name]
+
+
+def _record_response(resp, *args, **kwargs):
+    footing.metrics.metrics.record(resp)
+
+
+def get_session() -> requests.Session:
+    """Returns the HTTP session whose connection pool is shared by all forge API calls
+
+    Every response of the session is recorded in `footing.metrics.metrics`.
+    """
+
+    def create():
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=footing.constants.FORGE_API_MAX_WORKERS
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.hooks["response"].append(_record_response)
+        return session
+
+    return _get_shared("session", create)
+
+
+def get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Returns the thread pool that runs the blocking calls of all forges"""
+    return _get_shared(
+        "executor",
+        lambda: concurrent.futures.ThreadPoolExecutor(
+            max_workers=footing.constants.FORGE_API_MAX_WORKERS,
+            thread_name_prefix="footing-forge",
+        ),
+    )
+
+
+def _call_w_span(name, func, *args, **kwargs):
+    """Calls a blocking forge method inside of a `footing.trace` span"""
+    with footing.trace.span(name, "forge"):
+        return func(*args, **kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_tld_extractor():
+    """Returns a domain extractor that only uses the public suffix list bundled with tldextract
+
+    The suffix list is never downloaded or cached on disk, so the network is never used.
+    """
+    import tldextract
+
+    return tldextract.TLDExtract(cache_dir=None, suffix_list_urls=())
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_domain(host):
+    """Returns the registered domain of a host. For example, "gitlab" for gitlab.com"""
+    return _get_tld_extractor()(host).domain
+
+
 def get_name_from_ssh_path(template_path):
     matches = re.search(r"\/([^/]+)\.git$", template_path)
     return matches.group(1) if matches else ""
 
 
-def _get_latest_template_version_w_ssh(template):
+async def _get_latest_template_version_w_ssh(template, timeout=None):
     """
     Tries to obtain the latest template version using an SSH key
+
+    ``git ls-remote`` is killed when the lookup is cancelled.
     """
-    cmd = "git ls-remote {} | grep HEAD | cut -f1".format(template)
-    ret = footing.utils.shell(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    ret = await footing.git.runner.run_async(
+        "ls-remote",
+        template,
+        "HEAD",
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        timeout=timeout,
+    )
     stderr = ret.stderr.decode("utf-8").strip()
     stdout = ret.stdout.decode("utf-8").strip()
     if stderr and not stdout:
         raise RuntimeError(
-            ('An unexpected error happened when running "{}". (stderr="{}"').format(cmd, stderr)
+            (
+                'An unexpected error happened when running "git ls-remote {} HEAD". (stderr="{}"'
+            ).format(template, stderr)
+        )
+    return stdout.split("\t")[0]
+
+
+#: The latest versions of templates keyed on the template, along with when they
+#: expire. Only used inside of `cache_latest_versions`
+_latest_versions: dict[str, tuple[float, str]] = {}
+_latest_versions_ttl = 0.0
+
+
+@contextlib.contextmanager
+def cache_latest_versions(ttl: float):
+    """Caches the latest versions of templates for ``ttl`` seconds inside the context
+
+    Used by long-running processes, such as `footing serve`, where many checks
+    of the same templates happen close together.
+    """
+    global _latest_versions_ttl
+
+    _latest_versions_ttl = ttl
+    try:
+        yield
+    finally:
+        _latest_versions_ttl = 0.0
+        _latest_versions.clear()
+
+
+def set_latest_version(template: str, version: str) -> None:
+    """Records the latest version of a template when latest versions are cached"""
+    if _latest_versions_ttl:
+        _latest_versions[template] = (time.monotonic() + _latest_versions_ttl, version)
+
+
+def get_latest_versions() -> dict[str, str]:
+    """Returns the latest versions of templates that are cached and not expired"""
+    now = time.monotonic()
+    return {
+        template: version
+        for template, (expires_at, version) in _latest_versions.items()
+        if expires_at > now
+    }
+
+
+#: The methods of looking up the latest version of a template
+_SSH = "ssh"
+_API = "api"
+
+
+def _get_host(template):
+    """Returns the host of a git SSH url or URL, or an empty string for local paths"""
+    match = re.match(r"^[^@/]+@([^:/]+):", template)
+    return match.group(1) if match else urlparse(template).netloc
+
+
+def _get_lookups_path():
+    return os.path.join(footing.utils.get_cache_dir(), "latest_version_lookups.json")
+
+
+def _read_lookup_winners():
+    """Reads the method that last won the latest version lookup of each host"""
+    try:
+        with open(_get_lookups_path()) as f:
+            winners = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    return winners if isinstance(winners, dict) else {}
+
+
+def _record_lookup_winner(host, method):
+    """Remembers the method that won the latest version lookup of a host"""
+    winners = _read_lookup_winners()
+    if not host or winners.get(host) == method:
+        return
+
+    winners[host] = method
+    os.makedirs(os.path.dirname(_get_lookups_path()), exist_ok=True)
+    tmp_path = "{}.{}".format(_get_lookups_path(), os.getpid())
+    with open(tmp_path, "w") as f:
+        json.dump(winners, f)
+    os.replace(tmp_path, _get_lookups_path())
+
+
+class RepoRecord:
+    """A compact record of a repository found on a forge
+
+    Only the git SSH url, the description, and the fields requested by the
+    caller are kept from the forge's repository data.
+
+    Attributes:
+        url: The git SSH url of the repository
+        description: The repository description
+        fields: The requested fields of the repository data, if any were requested
+    """
+
+    __slots__ = ("url", "description", "fields")
+
+    def __init__(self, url: str, description: str | None = None, fields: dict | None = None):
+        self.url = url
+        self.description = description
+        self.fields = fields
+
+    @classmethod
+    def from_github(cls, repo: dict, fields: tuple[str, ...] = ()) -> RepoRecord:
+        """Creates a record from Github repository data"""
+        return cls(
+            "git@github.com:{}.git".format(repo["full_name"]),
+            repo.get("description"),
+            {field: repo.get(field) for field in fields} if fields else None,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, RepoRecord):
+            return NotImplemented
+        return (self.url, self.description, self.fields) == (
+            other.url,
+            other.description,
+            other.fields,
+        )
+
+    def __repr__(self):
+        return "RepoRecord(url={!r}, description={!r}, fields={!r})".format(
+            self.url, self.description, self.fields
         )
-    return stdout
 
 
 class Forge(metaclass=abc.ABCMeta):
     """The base class for all git forges.
 
-    Forges must implement both ``ls`` for listing templates/projects
+    Forges must implement both ``ls_async`` for listing templates/projects
     and ``_get_latest_template_version`` for finding the latest version
     of a template. The ``api_token_env_var_name`` property must also
     be configured.
+
+    The ``*_async`` methods can be awaited by many tasks of one event loop. The
+    synchronous methods wrap them with `asyncio.run` and cannot be called from
+    a running event loop.
+
+    Args:
+        max_concurrency: The maximum number of blocking calls of the forge in flight
+            on an event loop. Defaults to `footing.constants.FORGE_API_MAX_WORKERS`.
+        hedge_delay: Seconds to wait for the first latest version lookup before also
+            starting the second one. None only starts the second lookup when the first fails.
     """
 
-    @abc.abstractmethod
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        hedge_delay: float | None = footing.constants.LATEST_VERSION_HEDGE_DELAY,
+    ):
+        self.max_concurrency = max_concurrency or footing.constants.FORGE_API_MAX_WORKERS
+        self.hedge_delay = hedge_delay
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+
+        return self._semaphores[loop]
+
+    async def _run(self, func, *args, span_name=None, **kwargs):
+        """Runs a blocking call in the shared thread pool, bounded by ``max_concurrency``
+
+        The call is traced in a span named ``span_name``, which defaults to the name
+        of ``func``.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore():
+            return await loop.run_in_executor(
+                get_executor(),
+                functools.partial(_call_w_span, span_name or func.__name__, func, *args, **kwargs),
+            )
+
+    async def _run_async(self, func, *args, span_name=None, **kwargs):
+        """Awaits a coroutine function on the event loop, bounded by ``max_concurrency``
+
+        Used for calls that can be cancelled, such as subprocesses. The call is traced
+        in a span named ``span_name``, which defaults to the name of ``func``.
+        """
+        async with self._get_semaphore():
+            with footing.trace.span(span_name or func.__name__, "forge"):
+                return await func(*args, **kwargs)
+
+    @property
+    def metrics(self) -> footing.metrics.ForgeMetrics:
+        """The request metrics of every forge client of the process"""
+        return footing.metrics.metrics
+
     def ls(self, path, template=None) -> dict[str, str]:
+        """Lists templates, or the projects of a template, under a forge path
+
+        A synchronous wrapper of `Forge.ls_async`
+        """
+        return asyncio.run(self.ls_async(path, template))
+
+    @abc.abstractmethod
+    async def ls_async(self, path, template=None) -> dict[str, str]:
         """Implements ls for the forge"""
         pass
 
@@ -90,36 +380,114 @@ class Forge(metaclass=abc.ABCMeta):
     def get_latest_template_version(self, template):
         """Retrieves the latest template SHA
 
+        A synchronous wrapper of `Forge.get_latest_template_version_async`
+
         Returns:
             str: The latest template version
         """
-        try:
-            latest_version = _get_latest_template_version_w_ssh(template)
-        except (subprocess.CalledProcessError, RuntimeError):
-            try:
-                latest_version = self._get_latest_template_version(template)
-            except (
-                requests.exceptions.RequestException,
-                footing.exceptions.InvalidEnvironmentError,
-            ) as exc:
-                raise footing.exceptions.CheckRunError(
-                    (
-                        'Could not obtain the latest template version of "{}"'
-                        " using git SSH key or the configured {} API token."
-                        ' Set either a "{}" environment variable'
-                        " with access to the template or obtain permission so that"
-                        " the git SSH key can access it."
-                    ).format(
-                        template,
-                        self.__class__.__name__,
-                        self.api_token_env_var_name,
-                    )
-                ) from exc
+        return asyncio.run(self.get_latest_template_version_async(template))
+
+    async def get_latest_template_version_async(self, template):
+        """Retrieves the latest template SHA with git SSH and the forge API
 
-        return latest_version
+        The lookups are hedged. The method that won last time for the template's
+        host, or git SSH, is started first. The other method is started when the
+        first one fails or takes longer than ``hedge_delay``. The first successful
+        lookup wins. Lookups are abandoned after
+        `footing.constants.LATEST_VERSION_SSH_TIMEOUT` and
+        `footing.constants.LATEST_VERSION_API_TIMEOUT` seconds.
+
+        Versions are cached inside of `cache_latest_versions`.
+
+        Returns:
+            str: The latest template version
+        """
+        expires_at, cached_version = _latest_versions.get(template, (0.0, None))
+        if cached_version and expires_at > time.monotonic():
+            return cached_version
+
+        # The SSH lookup runs on the event loop, so its process is killed when the
+        # API wins. Blocking calls can't be stopped and would delay interpreter exit
+        lookups = {
+            _SSH: functools.partial(
+                self._run_async,
+                _get_latest_template_version_w_ssh,
+                template,
+                timeout=footing.constants.LATEST_VERSION_SSH_TIMEOUT,
+                span_name="latest_version.ssh",
+            ),
+            _API: functools.partial(
+                self._run,
+                self._get_latest_template_version,
+                template,
+                timeout=footing.constants.LATEST_VERSION_API_TIMEOUT,
+                span_name="latest_version.api",
+            ),
+        }
+        host = _get_host(template)
+        methods = [_SSH, _API]
+        if _read_lookup_winners().get(host) == _API:
+            methods.reverse()
+
+        pending = {}
+        errors = {}
+        while methods or pending:
+            if methods:
+                method = methods.pop(0)
+                pending[asyncio.ensure_future(lookups[method]())] = method
+
+            done, _ = await asyncio.wait(
+                pending,
+                timeout=self.hedge_delay if methods else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                try:
+                    latest_version = task.result()
+                except (
+                    subprocess.SubprocessError,
+                    RuntimeError,
+                    requests.exceptions.RequestException,
+                    footing.exceptions.InvalidEnvironmentError,
+                ) as exc:
+                    errors[pending.pop(task)] = exc
+                else:
+                    others = [other_task for other_task in pending if other_task is not task]
+                    for other_task in others:
+                        other_task.cancel()
+                    # Wait for the processes of cancelled lookups to be killed
+                    await asyncio.gather(*others, return_exceptions=True)
+                    _record_lookup_winner(host, pending[task])
+                    set_latest_version(template, latest_version)
+                    return latest_version
+
+        raise footing.exceptions.CheckRunError(
+            (
+                'Could not obtain the latest template version of "{}"'
+                " using git SSH key or the configured {} API token."
+                ' Set either a "{}" environment variable'
+                " with access to the template or obtain permission so that"
+                " the git SSH key can access it."
+            ).format(
+                template,
+                self.__class__.__name__,
+                self.api_token_env_var_name,
+            )
+        ) from errors[_API]
+
+    async def get_latest_template_versions_async(self, templates: list[str]) -> dict[str, str]:
+        """Retrieves the latest SHAs of many templates concurrently
+
+        Returns:
+            The latest version keyed on the template
+        """
+        versions = await asyncio.gather(
+            *(self.get_latest_template_version_async(template) for template in templates)
+        )
+        return dict(zip(templates, versions))
 
     @abc.abstractmethod
-    def _get_latest_template_version(self, template):
+    def _get_latest_template_version(self, template, timeout=None):
         """Finds the latest version of a template using an API
 
         By default, the latest version of a template is used with standard
@@ -128,6 +496,84 @@ class Forge(metaclass=abc.ABCMeta):
         """
         pass
 
+    def get_changed_files(self, template, old_version, new_version) -> list[str] | None:
+        """Lists the files changed between two versions of a template with the forge API
+
+        Returns:
+            The paths of the changed files or None if they could not be determined,
+            for example when no API token is configured.
+        """
+        try:
+            return self._get_changed_files(template, old_version, new_version)
+        except (
+            requests.exceptions.RequestException,
+            footing.exceptions.InvalidEnvironmentError,
+        ):
+            return None
+
+    def get_footing_config(self, project) -> dict | None:
+        """Reads the footing.yaml file of a project with the forge API
+
+        Returns:
+            The parsed footing.yaml or None if the project has no readable footing.yaml
+        """
+        try:
+            contents = self._get_footing_config(project)
+            footing_config = yaml.safe_load(contents) if contents else None
+        except (
+            requests.exceptions.RequestException,
+            gitlab.exceptions.GitlabError,
+            yaml.YAMLError,
+        ):
+            return None
+
+        return footing_config if isinstance(footing_config, dict) else None
+
+    async def get_footing_config_async(self, project) -> dict | None:
+        """Reads the footing.yaml file of a project with the forge API
+
+        See `Forge.get_footing_config`
+        """
+        return await self._run(self.get_footing_config, project)
+
+    async def get_footing_configs_async(self, projects: list[str]) -> dict[str, dict | None]:
+        """Reads the footing.yaml files of many projects concurrently
+
+        Returns:
+            The parsed footing.yaml, or None, keyed on the project
+        """
+        configs = await asyncio.gather(
+            *(self.get_footing_config_async(project) for project in projects)
+        )
+        return dict(zip(projects, configs))
+
+    @abc.abstractmethod
+    def _get_footing_config(self, project) -> str | None:
+        """Returns the raw contents of the footing.yaml file of a project using the API"""
+        pass
+
+    @abc.abstractmethod
+    def get_pushed_since(self, path, since=None) -> dict[str, str]:
+        """Lists the repositories under the forge path pushed since a time
+
+        Args:
+            path: A root git storage path, as passed to ``ls``
+            since: An ISO 8601 UTC time, such as "2024-01-01T00:00:00Z". All
+                repositories are listed when not provided.
+
+        Returns:
+            The time of the last push keyed on the git SSH url of each repository
+        """
+        pass
+
+    @abc.abstractmethod
+    def _get_changed_files(self, template, old_version, new_version) -> list[str] | None:
+        """Lists the files changed between two versions of a template using the API
+
+        Implementations return None when the forge truncates the list of files.
+        """
+        pass
+
 
 class Github(Forge):
     """A Github forge"""
@@ -139,17 +585,35 @@ class Github(Forge):
     def _call_api(self, verb, url, **request_kwargs):
         """Perform a github API call
 
+        Requests are authenticated with a token of the `footing.tokens.TokenPool`.
+        Requests refused because a token is exhausted are retried with another
+        token of the pool.
+
         Args:
             verb (str): Can be "post", "put", or "get"
-            url (str): The base URL with a leading slash for Github API (v3)
-            auth (str or HTTPBasicAuth): A Github API token or a HTTPBasicAuth object
+            url (str): The base URL with a leading slash for Github API (v3),
+                or a full URL such as a pagination link
         """
-        footing.check.has_env_vars(footing.constants.GITHUB_API_TOKEN_ENV_VAR)
-        api_token = os.environ[footing.constants.GITHUB_API_TOKEN_ENV_VAR]
-        api = "https://api.github.com{}".format(url)
-        auth_headers = {"Authorization": "token {}".format(api_token)}
-        headers = {**auth_headers, **request_kwargs.pop("headers", {})}
-        return getattr(requests, verb)(api, headers=headers, **request_kwargs)
+        pool = footing.tokens.get_pool()
+        api = url if "://" in url else "{}{}".format(footing.constants.GITHUB_API_URL, url)
+        headers = request_kwargs.pop("headers", {})
+        name = "{} {}".format(verb.upper(), urlparse(api).path)
+        with footing.trace.span(name, "github", retries=0) as span_args:
+            for _ in range(len(pool)):
+                token, api_token = pool.acquire()
+                auth_headers = {"Authorization": "token {}".format(api_token)}
+                resp = getattr(get_session(), verb)(
+                    api, headers={**auth_headers, **headers}, **request_kwargs
+                )
+                pool.update(token, resp)
+                if not footing.tokens.is_rate_limited(resp):
+                    break
+                span_args["retries"] += 1
+                footing.metrics.metrics.record_retry(resp)
+
+            span_args.update(status=resp.status_code, bytes=len(resp.content))
+
+        return resp
 
     def _get(self, url, **request_kwargs):
         """Github API get"""
@@ -167,15 +631,27 @@ class Github(Forge):
                 links[rel] = url
         return links
 
-    def _code_search(self, query: str, forge: str | None = None) -> dict[str, dict[str, str]]:
+    def _code_search(
+        self,
+        query: str,
+        forge: str | None = None,
+        fields: tuple[str, ...] = (),
+        max_results: int | None = None,
+    ) -> dict[str, RepoRecord] | None:
         """Performs a Github API code search
 
+        Each page is reduced to `RepoRecord` objects as soon as it arrives.
+
         Args:
             query: The query sent to Github's code search
             forge: The root being searched in Github
+            fields: The fields of the repository data to keep in each record
+            max_results: Stop after the first page when the search has at least
+                this many results
 
         Returns:
-            A dictionary of repository information keyed on the git SSH url
+            A dictionary of repository records keyed on the git SSH url, or None
+            when the search has at least ``max_results`` results
 
         Raises:
             `InvalidForgeError`: When ``forge`` is invalid
@@ -190,70 +666,215 @@ class Github(Forge):
 
         if resp.status_code == requests.codes.unprocessable_entity and forge:
             raise footing.exceptions.InvalidForgeError('Invalid Github forge - "{}"'.format(forge))
-        resp.raise_for_status()
 
-        resp_data = resp.json()
+        resp.raise_for_status()
+        if max_results and resp.json().get("total_count", 0) >= max_results:
+            return None
 
-        repositories: dict[str, dict[str, str]] = collections.defaultdict(dict)
+        repositories: dict[str, RepoRecord] = {}
         while True:
-            repositories.update(
-                {
-                    "git@github.com:{}.git".format(repo["repository"]["full_name"]): repo[
-                        "repository"
-                    ]
-                    for repo in resp_data["items"]
-                }
-            )
+            resp.raise_for_status()
+            for item in resp.json()["items"]:
+                record = RepoRecord.from_github(item["repository"], fields)
+                repositories[record.url] = record
 
             next_url = self._parse_link_header(resp.headers).get("next")
-            if next_url:
-                resp = requests.get(next_url, headers=headers)
-                resp.raise_for_status()
-                resp_data = resp.json()
-            else:
+            if not next_url:
                 break
+            resp = self._get(next_url, headers=headers)
 
         return repositories
 
-    def _get_latest_template_version(self, template):
+    def _get_latest_template_version(self, template, timeout=None):
         """Tries to obtain the latest template version with the Github API"""
         repo_path = footing.utils.get_repo_path(template)
         api = "/repos/{}/commits".format(repo_path)
 
-        last_commit_resp = self._get(api, params={"per_page": 1})
+        last_commit_resp = self._get(api, params={"per_page": 1}, timeout=timeout)
         last_commit_resp.raise_for_status()
 
         content = last_commit_resp.json()
         assert len(content) == 1, "Unexpected Github API response"
         return content[0]["sha"]
 
-    def ls(self, path, template=None):
-        """Return a list of repositories under the forge path or the template (if provided)."""
+    def _get_changed_files(self, template, old_version, new_version):
+        """Lists the changed files between two template versions with the compare API"""
+        repo_path = footing.utils.get_repo_path(template)
+        api = "/repos/{}/compare/{}...{}".format(repo_path, old_version, new_version)
+
+        compare_resp = self._get(api, params={"per_page": 1})
+        compare_resp.raise_for_status()
+
+        files = compare_resp.json().get("files", [])
+        if len(files) >= footing.constants.GITHUB_COMPARE_MAX_FILES:
+            return None
+
+        return [
+            path
+            for file in files
+            for path in (file["filename"], file.get("previous_filename"))
+            if path
+        ]
+
+    def _get_footing_config(self, project):
+        """Reads the raw footing.yaml of a project with the contents API"""
+        repo_path = footing.utils.get_repo_path(project)
+        api = "/repos/{}/contents/{}".format(repo_path, footing.constants.FOOTING_CONFIG_FILE)
+
+        resp = self._get(api, headers={"Accept": "application/vnd.github.v3.raw"})
+        if resp.status_code == requests.codes.not_found:
+            return None
+        resp.raise_for_status()
+
+        return resp.text
 
+    def _get_owner(self, user_or_org, forge=None):
+        """Returns the Github user or organization that owns repositories
+
+        Raises:
+            `InvalidForgeError`: When the user or organization does not exist
+        """
+        resp = self._get("/users/{}".format(user_or_org))
+        if resp.status_code == requests.codes.not_found:
+            raise footing.exceptions.InvalidForgeError('Invalid Github forge - "{}"'.format(forge))
+        resp.raise_for_status()
+
+        return resp.json()
+
+    def _get_user_or_org(self, path):
+        """Returns the Github user or organization of a forge path"""
         path_parts = path.strip().split("/")
-        if path_parts[-1] == "":
-            user_or_org = path_parts[-2]
+        return path_parts[-2] if path_parts[-1] == "" else path_parts[-1]
+
+    def _get_repos_api(self, owner):
+        """Returns the API and parameters for listing the repositories of an owner"""
+        if owner["type"] == "Organization":
+            return "/orgs/{}/repos".format(owner["login"]), {"type": "all", "per_page": 100}
         else:
-            user_or_org = path_parts[-1]
+            return "/users/{}/repos".format(owner["login"]), {"type": "owner", "per_page": 100}
+
+    async def _list_repos(self, owner, fields: tuple[str, ...] = ()) -> list[RepoRecord]:
+        """Lists all repositories of a user or organization as `RepoRecord` objects
 
+        The first page is used to find the number of pages. Remaining pages are
+        fetched concurrently. Each page is reduced to records as soon as it arrives.
+        """
+        api, params = self._get_repos_api(owner)
+
+        def get_page(page):
+            resp = self._get(api, params={**params, "page": page})
+            resp.raise_for_status()
+            return resp.headers, [RepoRecord.from_github(repo, fields) for repo in resp.json()]
+
+        headers, first_page = await self._run(get_page, 1)
+        last_url = self._parse_link_header(headers).get("last")
+        num_pages = int(parse_qs(urlparse(last_url).query)["page"][0]) if last_url else 1
+
+        pages = await asyncio.gather(
+            *(self._run(get_page, page) for page in range(2, num_pages + 1))
+        )
+
+        return [record for page in [first_page, *(page for _, page in pages)] for record in page]
+
+    def get_pushed_since(self, path, since=None):
+        """Lists the repositories of the forge user or organization pushed since a time
+
+        Repositories are listed from the most recently pushed, so only the pages
+        with repositories pushed after ``since`` are fetched.
+        """
+        owner = self._get_owner(self._get_user_or_org(path), forge=path)
+        api, params = self._get_repos_api(owner)
+
+        pushed = {}
+        page = 1
+        while True:
+            resp = self._get(
+                api, params={**params, "sort": "pushed", "direction": "desc", "page": page}
+            )
+            resp.raise_for_status()
+            for repo in resp.json():
+                if since and (repo["pushed_at"] or "") < since:
+                    return pushed
+                pushed["git@github.com:{}.git".format(repo["full_name"])] = repo["pushed_at"]
+
+            if "next" not in self._parse_link_header(resp.headers):
+                return pushed
+            page += 1
+
+    def _has_file(self, repo_path, file_path):
+        """Returns True if a file exists at the root of a repository"""
+        resp = self._get("/repos/{}/contents/{}".format(repo_path, file_path))
+        if resp.status_code == requests.codes.not_found:
+            return False
+        resp.raise_for_status()
+
+        return True
+
+    async def _ls_repos(self, owner, template=None) -> dict[str, RepoRecord]:
+        """Lists templates or projects by checking every repository of a user or organization
+
+        Templates are repositories with a cookiecutter.json file. Projects are repositories
+        with a footing.yaml file that references the template. Repositories are checked
+        concurrently. Like code search, forks are not included.
+
+        Returns:
+            A dictionary of repository records keyed on the git SSH url
+        """
+        repos = {
+            record.url: record
+            for record in await self._list_repos(owner, fields=("full_name", "fork"))
+            if not record.fields["fork"]
+        }
+
+        async def matches(ssh_path):
+            if template:
+                footing_config = await self.get_footing_config_async(ssh_path)
+                return bool(footing_config) and footing_config.get("_template") == template
+            else:
+                return await self._run(
+                    self._has_file, repos[ssh_path].fields["full_name"], "cookiecutter.json"
+                )
+
+        is_matches = await asyncio.gather(*(matches(ssh_path) for ssh_path in repos))
+        return {
+            ssh_path: repos[ssh_path] for ssh_path, is_match in zip(repos, is_matches) if is_match
+        }
+
+    async def ls_async(self, path, template=None):
+        """Return a list of repositories under the forge path or the template (if provided).
+
+        Github code search returns at most `footing.constants.GITHUB_CODE_SEARCH_MAX_RESULTS`
+        results. When a search has that many results, such as for organizations with many
+        private repositories, the repositories of the user or organization are checked
+        one by one instead.
+        """
+
+        user_or_org = self._get_user_or_org(path)
         if template:
             footing.check.is_git_ssh_path(template)
-            template_repo_name = get_name_from_ssh_path(template)
-
             search_q = "user:{} filename:{} {}".format(
                 user_or_org,
                 footing.constants.FOOTING_CONFIG_FILE,
-                template_repo_name,
+                get_name_from_ssh_path(template),
             )
         else:
             search_q = "user:{} filename:cookiecutter.json".format(user_or_org)
 
-        results = self._code_search(search_q, forge=path)
+        results = await self._run(
+            self._code_search,
+            search_q,
+            forge=path,
+            max_results=footing.constants.GITHUB_CODE_SEARCH_MAX_RESULTS,
+        )
+        if results is None:
+            owner = await self._run(self._get_owner, user_or_org, forge=path)
+            results = await self._ls_repos(owner, template)
+
         return collections.OrderedDict(
             sorted(
                 [
-                    (key, value["description"] or "(no description found)")
-                    for key, value in results.items()
+                    (url, record.description or "(no description found)")
+                    for url, record in results.items()
                 ]
             )
         )
@@ -266,10 +887,12 @@ class Gitlab(Forge):
     def api_token_env_var_name(self):
         return footing.constants.GITLAB_API_TOKEN_ENV_VAR
 
-    def get_client(self, gitlab_url):
+    def get_client(self, gitlab_url, timeout=None):
         footing.check.has_env_vars(self.api_token_env_var_name)
         api_token = os.environ[self.api_token_env_var_name]
-        return gitlab.Gitlab(url=gitlab_url, private_token=api_token)
+        return gitlab.Gitlab(
+            url=gitlab_url, private_token=api_token, timeout=timeout, session=get_session()
+        )
 
     def _get_gitlab_url_and_repo_path(self, template):
         """Given a template, return a gitlab url and a repo path"""
@@ -282,16 +905,50 @@ class Gitlab(Forge):
 
         return gitlab_url, repo_path
 
-    def _get_latest_template_version(self, template):  # pragma: no cover
+    def _get_latest_template_version(self, template, timeout=None):  # pragma: no cover
         """Tries to obtain the latest template version with the Gitlab API"""
         gitlab_url, repo_path = self._get_gitlab_url_and_repo_path(template)
 
-        gl = self.get_client(gitlab_url)
+        gl = self.get_client(gitlab_url, timeout=timeout)
         project = gl.projects.get(repo_path)
         sha = project.commits.list()[0].id  # type: ignore
 
         return sha
 
+    def _get_changed_files(self, template, old_version, new_version):  # pragma: no cover
+        """Lists the changed files between two template versions with the Gitlab API"""
+        gitlab_url, repo_path = self._get_gitlab_url_and_repo_path(template)
+
+        gl = self.get_client(gitlab_url)
+        try:
+            project = gl.projects.get(repo_path)
+            comparison = project.repository_compare(old_version, new_version)
+        except gitlab.exceptions.GitlabError:
+            return None
+
+        if comparison.get("overflow"):  # type: ignore
+            return None
+
+        return sorted(
+            {
+                path
+                for diff in comparison["diffs"]  # type: ignore
+                for path in (diff["old_path"], diff["new_path"])
+            }
+        )
+
+    def _get_footing_config(self, project):  # pragma: no cover
+        """Reads the raw footing.yaml of a project with the Gitlab API"""
+        gitlab_url, repo_path = self._get_gitlab_url_and_repo_path(project)
+
+        gl = self.get_client(gitlab_url)
+        gl_project = gl.projects.get(repo_path)
+        contents = gl_project.files.raw(
+            file_path=footing.constants.FOOTING_CONFIG_FILE, ref=gl_project.default_branch
+        )
+
+        return contents.decode("utf-8")  # type: ignore
+
     def _get_gitlab_url_and_group(self, forge):
         """Given a forge, return a gitlab url and group"""
         if not forge.startswith("http"):
@@ -303,7 +960,7 @@ class Gitlab(Forge):
 
         # If users are listing templates on gitlab.com and not a self-hosted gitlab,
         # do not allow them to query the root gitlab.com
-        is_self_hosted = tldextract.extract(forge).domain != "gitlab"
+        is_self_hosted = _get_domain(url_parts.hostname or "") != "gitlab"
 
         if not group and not is_self_hosted:
             raise footing.exceptions.InvalidGitlabGroupError(
@@ -312,8 +969,30 @@ class Gitlab(Forge):
 
         return gitlab_url, group
 
-    def ls(self, path, template=None):  # pragma: no cover
-        """Return a list of repositories under the forge path or the template (if provided)."""
+    def get_pushed_since(self, path, since=None):  # pragma: no cover
+        """Lists the projects of the forge group with activity since a time"""
+        gitlab_url, group = self._get_gitlab_url_and_group(path)
+
+        gl = self.get_client(gitlab_url)
+        kwargs = {"order_by": "last_activity_at", "sort": "desc", "iterator": True}
+        if since:
+            kwargs["last_activity_after"] = since
+        if group:
+            projects = gl.groups.get(group).projects.list(include_subgroups=True, **kwargs)
+        else:
+            projects = gl.projects.list(**kwargs)
+
+        return {p.ssh_url_to_repo: p.last_activity_at for p in projects}
+
+    async def ls_async(self, path, template=None):
+        """Return a list of repositories under the forge path or the template (if provided).
+
+        The Gitlab client is blocking, so the listing runs in the shared thread pool.
+        """
+        return await self._run(self._ls, path, template)
+
+    def _ls(self, path, template=None):  # pragma: no cover
+        """Lists repositories with the Gitlab search API"""
         gitlab_url, group = self._get_gitlab_url_and_group(path)
 
         gl = self.get_client(gitlab_url)
@@ -324,17 +1003,19 @@ class Gitlab(Forge):
         # Search for either templates (with cookiecutter.json) or projects that have been made
         # from the template. Note - advanced search must be turned on for the Gitlab instance
         if not template:
-            results = gl.search(  # type: ignore
-                gitlab.const.SEARCH_SCOPE_BLOBS, search="filename:cookiecutter.json"
-            )
+            search = "filename:cookiecutter.json"
         else:
-            results = gl.search(  # type: ignore
-                gitlab.const.SEARCH_SCOPE_BLOBS, search="{} filename:footing.yaml".format(template)
-            )
+            search = "{} filename:footing.yaml".format(template)
+
+        # Every page of results is read, since one page only has 20 results by default
+        results = gl.search(  # type: ignore
+            gitlab.const.SEARCH_SCOPE_BLOBS, search=search, get_all=True
+        )
 
-        # Fetch projects associated with search results
+        # Fetch projects associated with search results. A project can have several results
         gl = self.get_client(gitlab_url)
-        projects = [gl.projects.get(r["project_id"]) for r in results]  # type: ignore
+        project_ids = dict.fromkeys(r["project_id"] for r in results)  # type: ignore
+        projects = [gl.projects.get(project_id) for project_id in project_ids]
 
         results: dict[str, str] = collections.OrderedDict(
             sorted(
@@ -0,0 +1,238 @@
+"""Runs git commands without a shell and accounts for every spawned process.
+
+All git calls made by footing go through a `GitRunner`. Commands are passed
+as argument lists and executed directly, so no ``/bin/sh`` is spawned and
+no quoting is needed. Every spawned process is recorded as a `Spawn` so
+that the number, duration, and exit codes of git calls can be inspected.
+
+`ssh_multiplexing` shares one SSH connection per host between the git
+processes of a command, so bulk ``git ls-remote`` and ``git fetch`` calls
+only pay for the SSH handshake once. The SSH command configured with
+``core.sshCommand`` is kept.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import dataclasses
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+import footing.constants
+import footing.utils
+
+
+@dataclasses.dataclass(frozen=True)
+class Spawn:
+    """A record of a single spawned process"""
+
+    argv: tuple[str, ...]
+    returncode: int
+    duration: float
+
+
+class GitRunner:
+    """Executes git commands as argument lists and records each spawned process
+
+    Args:
+        cwd: The default working directory of commands. Defaults to the
+            current working directory at the time of the call.
+    """
+
+    def __init__(self, cwd: str | None = None):
+        self.cwd = cwd
+        self.spawns: list[Spawn] = []
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        *args: str,
+        check: bool = True,
+        stdin=None,
+        stdout=None,
+        stderr=None,
+        cwd: str | None = None,
+        timeout: float | None = None,
+    ) -> subprocess.CompletedProcess:
+        """Runs ``git *args`` and records the spawned process
+
+        Raises:
+            `subprocess.CalledProcessError`: When ``check`` is True and the command fails
+            `subprocess.TimeoutExpired`: When the command runs longer than ``timeout`` seconds
+        """
+        argv = ["git", *args]
+        start = time.perf_counter()
+        returncode = -1
+        try:
+            ret = footing.utils.shell(
+                argv,
+                check=check,
+                stdin=stdin,
+                stdout=stdout,
+                stderr=stderr,
+                cwd=cwd or self.cwd,
+                timeout=timeout,
+            )
+            returncode = ret.returncode
+            return ret
+        except subprocess.CalledProcessError as exc:
+            returncode = exc.returncode
+            raise
+        finally:
+            self._record(Spawn(tuple(argv), returncode, time.perf_counter() - start))
+
+    async def run_async(
+        self,
+        *args: str,
+        check: bool = True,
+        stdout=None,
+        stderr=None,
+        cwd: str | None = None,
+        timeout: float | None = None,
+    ) -> subprocess.CompletedProcess:
+        """Runs ``git *args`` on the event loop and records the spawned process
+
+        The process is killed when the call is cancelled. See `footing.utils.shell_async`.
+
+        Raises:
+            `subprocess.CalledProcessError`: When ``check`` is True and the command fails
+            `subprocess.TimeoutExpired`: When the command runs longer than ``timeout`` seconds
+        """
+        argv = ["git", *args]
+        start = time.perf_counter()
+        returncode = -1
+        try:
+            ret = await footing.utils.shell_async(
+                argv,
+                check=check,
+                stdout=stdout,
+                stderr=stderr,
+                cwd=cwd or self.cwd,
+                timeout=timeout,
+            )
+            returncode = ret.returncode
+            return ret
+        except subprocess.CalledProcessError as exc:
+            returncode = exc.returncode
+            raise
+        finally:
+            self._record(Spawn(tuple(argv), returncode, time.perf_counter() - start))
+
+    def output(self, *args: str, cwd: str | None = None) -> str:
+        """Runs ``git *args`` and returns the stripped stdout"""
+        ret = self.run(*args, stdout=subprocess.PIPE, cwd=cwd)
+        return ret.stdout.decode("utf-8").strip()
+
+    def run_many(
+        self, commands: list[tuple[str, ...]], max_workers: int | None = None, **kwargs
+    ) -> list[subprocess.CompletedProcess]:
+        """Runs a group of independent git commands concurrently
+
+        Args:
+            commands: A list of git argument tuples (without the leading "git")
+            max_workers: The maximum number of processes running at once
+            **kwargs: Keyword arguments passed to `GitRunner.run` for every command
+
+        Returns:
+            The completed processes in the same order as ``commands``
+        """
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or len(commands) or 1
+        ) as executor:
+            return list(executor.map(lambda args: self.run(*args, **kwargs), commands))
+
+    def _record(self, spawn: Spawn) -> None:
+        with self._lock:
+            self.spawns.append(spawn)
+
+    def stats(self) -> dict:
+        """Summarizes the processes spawned by the runner
+
+        Returns:
+            A dictionary with the number of spawns, failed spawns, and total duration
+        """
+        with self._lock:
+            spawns = list(self.spawns)
+
+        return {
+            "count": len(spawns),
+            "failed": sum(1 for spawn in spawns if spawn.returncode != 0),
+            "duration": sum(spawn.duration for spawn in spawns),
+        }
+
+    def reset(self) -> None:
+        """Clears all recorded spawns"""
+        with self._lock:
+            self.spawns.clear()
+
+
+#: The runner used for all git commands issued by footing
+runner = GitRunner()
+
+
+def _get_ssh_command() -> str:
+    """Returns the SSH command of git, which is configured with ``core.sshCommand``"""
+    ret = runner.run(
+        "config",
+        "--get",
+        "core.sshCommand",
+        check=False,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    return ret.stdout.decode("utf-8").strip() or "ssh"
+
+
+@contextlib.contextmanager
+def ssh_multiplexing():
+    """Routes the git SSH traffic of footing through shared ssh ControlMaster connections
+
+    ``GIT_SSH_COMMAND`` is set for the duration of the context, so every git process,
+    including the clones made by cookiecutter and the processes of fleet workers,
+    reuses one SSH connection per host. The options are added to the command of
+    ``core.sshCommand``, so configured keys and proxies are kept. Master connections
+    are closed with
+    ``ssh -O exit`` when the context exits. They also stop by themselves
+    `footing.constants.SSH_CONTROL_PERSIST` seconds after their last use.
+
+    Nothing is changed when ``GIT_SSH_COMMAND`` or ``GIT_SSH`` is already
+    configured, such as by an outer context, or on Windows.
+    """
+    if os.name == "nt" or "GIT_SSH_COMMAND" in os.environ or "GIT_SSH" in os.environ:
+        yield
+        return
+
+    # Unix socket paths are limited to about 100 characters, so sockets are kept
+    # in a short temporary directory instead of the cache directory
+    control_dir = tempfile.mkdtemp(
+        prefix="footing-ssh-", dir="/tmp" if os.path.isdir("/tmp") else None
+    )
+    os.environ["GIT_SSH_COMMAND"] = (
+        "{} -o ControlMaster=auto -o ControlPath={}/%C -o ControlPersist={}".format(
+            _get_ssh_command(), control_dir, footing.constants.SSH_CONTROL_PERSIST
+        )
+    )
+    try:
+        yield
+    finally:
+        del os.environ["GIT_SSH_COMMAND"]
+        for control_path in sorted(os.listdir(control_dir)):
+            footing.utils.shell(
+                [
+                    "ssh",
+                    "-o",
+                    "ControlPath={}".format(os.path.join(control_dir, control_path)),
+                    "-O",
+                    "exit",
+                    "footing",
+                ],
+                check=False,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        shutil.rmtree(control_dir, ignore_errors=True)
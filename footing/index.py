@@ -0,0 +1,252 @@
+"""A local SQLite index of the templates and projects of git forges.
+
+The index is stored in footing's cache directory and is filled in from the
+results of `footing.ls`. It records templates, projects, their descriptions,
+the ``_template`` and ``_version`` values of each project's footing.yaml, and
+the time each repository was last pushed. Repositories only need to be read
+from the forge again when they were pushed after the previous sync, and
+queries can be answered without the forge at all.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import datetime
+import os
+import sqlite3
+
+import footing.exceptions
+import footing.utils
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    url TEXT PRIMARY KEY,
+    description TEXT,
+    template TEXT,
+    version TEXT,
+    pushed_at TEXT,
+    config_read_at TEXT
+);
+CREATE TABLE IF NOT EXISTS listings (
+    forge TEXT NOT NULL,
+    template TEXT NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (forge, template, url)
+);
+CREATE TABLE IF NOT EXISTS syncs (
+    forge TEXT NOT NULL,
+    template TEXT NOT NULL,
+    synced_at TEXT NOT NULL,
+    PRIMARY KEY (forge, template)
+);
+CREATE TABLE IF NOT EXISTS pushed_syncs (
+    forge TEXT PRIMARY KEY,
+    synced_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS templates (
+    template TEXT PRIMARY KEY,
+    latest_version TEXT
+);
+"""
+
+
+def now():
+    """Returns the current UTC time in the ISO 8601 format used by forges"""
+    return datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _normalize_forge(forge):
+    return forge.strip().rstrip("/")
+
+
+class Index:
+    """A local index of forge templates and projects
+
+    Templates are stored as listings of a forge with an empty template.
+
+    Args:
+        path: The SQLite database file. Defaults to ``index.sqlite3`` in
+            `footing.utils.get_cache_dir`.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(footing.utils.get_cache_dir(), "index.sqlite3")
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Opens a connection and commits the transaction when no errors happen"""
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_synced_at(self, forge: str, template: str | None = None) -> str | None:
+        """Returns the time of the last sync of a forge listing or None if it was never synced"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT synced_at FROM syncs WHERE forge = ? AND template = ?",
+                (_normalize_forge(forge), template or ""),
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def record_ls(
+        self,
+        forge: str,
+        template: str | None,
+        results: dict[str, str],
+        synced_at: str | None = None,
+    ) -> None:
+        """Records the results of `footing.ls.ls`, replacing the previous listing
+
+        Args:
+            forge: The forge path that was listed
+            template: The template of the listing, or None for a listing of templates
+            results: Repository descriptions keyed on the git SSH url
+            synced_at: The time the listing started. Defaults to now.
+        """
+        forge = _normalize_forge(forge)
+        template = template or ""
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO repos (url, description) VALUES (?, ?)"
+                " ON CONFLICT (url) DO UPDATE SET description = excluded.description",
+                results.items(),
+            )
+            conn.execute(
+                "DELETE FROM listings WHERE forge = ? AND template = ?", (forge, template)
+            )
+            conn.executemany(
+                "INSERT INTO listings (forge, template, url) VALUES (?, ?, ?)",
+                [(forge, template, url) for url in results],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO syncs (forge, template, synced_at) VALUES (?, ?, ?)",
+                (forge, template, synced_at or now()),
+            )
+
+    def ls(self, forge: str, template: str | None = None) -> dict[str, str]:
+        """Returns the recorded results of `footing.ls.ls`
+
+        Raises:
+            `NotIndexedError`: When the listing has never been recorded
+        """
+        if not self.get_synced_at(forge, template):
+            raise footing.exceptions.NotIndexedError(
+                'No index of "{}" found. Run the command without "--offline" first.'.format(
+                    " ".join(filter(None, [forge, template]))
+                )
+            )
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT repos.url, repos.description FROM listings"
+                " JOIN repos ON repos.url = listings.url"
+                " WHERE listings.forge = ? AND listings.template = ?"
+                " ORDER BY repos.url",
+                (_normalize_forge(forge), template or ""),
+            ).fetchall()
+
+        return collections.OrderedDict(rows)
+
+    def get_pushed_synced_at(self, forge: str) -> str | None:
+        """Returns when the push times of a forge were last recorded or None if never recorded"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT synced_at FROM pushed_syncs WHERE forge = ?", (_normalize_forge(forge),)
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def record_pushed_at(
+        self, forge: str, pushed_at: dict[str, str], synced_at: str | None = None
+    ) -> None:
+        """Records the time of the last push of repositories of a forge
+
+        Args:
+            forge: The forge path of the repositories
+            pushed_at: The time of the last push keyed on the git SSH url
+            synced_at: The time the push times were requested. Defaults to now.
+        """
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO repos (url, pushed_at) VALUES (?, ?)"
+                " ON CONFLICT (url) DO UPDATE SET pushed_at = excluded.pushed_at",
+                pushed_at.items(),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO pushed_syncs (forge, synced_at) VALUES (?, ?)",
+                (_normalize_forge(forge), synced_at or now()),
+            )
+
+    def get_stale_configs(self, urls: list[str]) -> list[str]:
+        """Returns the repositories whose footing.yaml must be read again
+
+        A footing.yaml is stale when it was never read, or when the repository was
+        pushed after it was read.
+        """
+        with self._connect() as conn:
+            fresh = {
+                url
+                for url, pushed_at, config_read_at in conn.execute(
+                    "SELECT url, pushed_at, config_read_at FROM repos"
+                    " WHERE config_read_at IS NOT NULL"
+                )
+                if not pushed_at or pushed_at < config_read_at
+            }
+
+        return [url for url in urls if url not in fresh]
+
+    def record_configs(self, configs: dict[str, dict | None], read_at: str | None = None) -> None:
+        """Records the ``_template`` and ``_version`` of footing.yaml files keyed on the
+        git SSH url. Repositories without a footing.yaml have a None config.
+        """
+        read_at = read_at or now()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO repos (url, template, version, config_read_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (url) DO UPDATE SET template = excluded.template,"
+                " version = excluded.version, config_read_at = excluded.config_read_at",
+                [
+                    (url, (config or {}).get("_template"), (config or {}).get("_version"), read_at)
+                    for url, config in configs.items()
+                ],
+            )
+
+    def get_versions(self, forge: str, template: str) -> dict[str, str | None]:
+        """Returns the recorded template versions of the projects of a template
+
+        The version is None when the project uses another template or has no footing.yaml.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT repos.url, CASE WHEN repos.template = ? THEN repos.version END"
+                " FROM listings JOIN repos ON repos.url = listings.url"
+                " WHERE listings.forge = ? AND listings.template = ?"
+                " ORDER BY repos.url",
+                (template, _normalize_forge(forge), template),
+            ).fetchall()
+
+        return dict(rows)
+
+    def record_latest_version(self, template: str, latest_version: str) -> None:
+        """Records the latest version of a template"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO templates (template, latest_version) VALUES (?, ?)",
+                (template, latest_version),
+            )
+
+    def get_latest_version(self, template: str) -> str | None:
+        """Returns the recorded latest version of a template"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT latest_version FROM templates WHERE template = ?", (template,)
+            ).fetchone()
+
+        return row[0] if row else None
@@ -2,12 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import collections
+import dataclasses
+import time
+
+import footing.constants
+import footing.exceptions
 import footing.forge
+import footing.git
+import footing.index
+import footing.render
 import footing.utils
 
 
 @footing.utils.set_cmd_env_var("ls")
-def ls(forge: str, template: str | None = None) -> dict[str, str]:
+def ls(forge: str, template: str | None = None, offline: bool = False) -> dict[str, str]:
     """Lists all templates under a root path or list all projects spun up under
     a root path and a template path.
 
@@ -22,12 +32,254 @@ def ls(forge: str, template: str | None = None) -> dict[str, str]:
             (github.com/Organization) or a gitlab group (gitlab.com/my/group).
         template: An optional template path. If provided, the
             returned values are projects under ``root`` created using the template.
+        offline: Return the results recorded in the local `footing.index.Index`
+            instead of querying the forge.
 
     Returns:
         xA dictionary of repository information keyed on the url.
 
     Raises:
         `InvalidForgeError`: When ``forge`` is invalid
+        `NotIndexedError`: When ``offline`` is True and the results were never recorded
+    """
+    index = footing.index.Index()
+    if offline:
+        return index.ls(forge, template)
+
+    synced_at = footing.index.now()
+    client = footing.forge.from_path(forge)
+    results = client.ls(forge, template)
+    index.record_ls(forge, template, results, synced_at=synced_at)
+    return results
+
+
+@dataclasses.dataclass
+class ForgeListing:
+    """The results of listing a single forge of `ls_many`
+
+    Attributes:
+        forge: The forge path
+        results: The results of the forge, as returned by `ls`
+        seconds: How long the forge took to list
+    """
+
+    forge: str
+    results: dict[str, str]
+    seconds: float
+
+
+@footing.utils.set_cmd_env_var("ls")
+def ls_many(
+    forges: list[str], template: str | None = None, offline: bool = False
+) -> list[ForgeListing]:
+    """Lists templates, or the projects of a template, under several forges at once
+
+    Forges are listed concurrently on one event loop, even when they are served
+    by different clients, such as Github organizations and Gitlab groups. The
+    results of every forge are recorded in the local `footing.index.Index` like `ls`.
+    Use `merge` to combine the listings.
+
+    Args:
+        forges: Root git storage paths, such as Github organizations or Gitlab groups.
+            Repeated paths are listed once.
+        template: An optional template path. If provided, projects created using
+            the template are listed.
+        offline: Return the results recorded in the local index instead of querying the forges.
+
+    Returns:
+        The listing of every forge, in the order of ``forges``
+
+    Raises:
+        `InvalidForgeError`: When a forge is invalid
+        `NotIndexedError`: When ``offline`` is True and a forge was never recorded
+    """
+    index = footing.index.Index()
+
+    async def ls_forge(forge):
+        start = time.perf_counter()
+        if offline:
+            results = index.ls(forge, template)
+        else:
+            synced_at = footing.index.now()
+            results = await footing.forge.from_path(forge).ls_async(forge, template)
+            index.record_ls(forge, template, results, synced_at=synced_at)
+
+        return ForgeListing(forge, results, time.perf_counter() - start)
+
+    async def ls_forges():
+        return await asyncio.gather(*(ls_forge(forge) for forge in dict.fromkeys(forges)))
+
+    return asyncio.run(ls_forges())
+
+
+def merge(listings: list[ForgeListing]) -> dict[str, str]:
+    """Merges forge listings into one listing sorted by url
+
+    Repositories found under several forges are listed once.
+    """
+    merged: dict[str, str] = {}
+    for listing in listings:
+        for url, description in listing.results.items():
+            merged.setdefault(url, description)
+
+    return collections.OrderedDict(sorted(merged.items()))
+
+
+@dataclasses.dataclass
+class TemplateStatus:
+    """The template versions of the projects spun up with a template
+
+    Attributes:
+        template: The template path
+        latest_version: The latest version of the template
+        versions: The template version of each project keyed on the project url.
+            The version is None when the footing.yaml of the project could not be
+            read or when the project uses another template.
+    """
+
+    template: str
+    latest_version: str | None
+    versions: dict[str, str | None]
+
+    @property
+    def histogram(self) -> collections.Counter:
+        """The number of projects on each template version"""
+        return collections.Counter(self.versions.values())
+
+    @property
+    def out_of_date(self) -> list[str]:
+        """The projects that are not on the latest template version"""
+        return [
+            project
+            for project, version in self.versions.items()
+            if version and version != self.latest_version
+        ]
+
+
+@footing.utils.set_cmd_env_var("ls")
+def status(forge: str, template: str, offline: bool = False) -> TemplateStatus:
+    """Lists the template versions of all projects spun up under a root path
+    with a template.
+
+    Projects are not cloned. Template versions are kept in the local
+    `footing.index.Index`. The projects of the template are listed with `ls`
+    once. Later calls only ask the forge for the repositories pushed since the
+    previous sync, and add those that became projects of the template to the
+    indexed listing. Only the footing.yaml files of repositories that are new or
+    were pushed since they were last read are fetched with the forge API,
+    concurrently. The latest version of the template is obtained once.
+    Repositories that are deleted or stop using the template remain listed
+    until the next `ls`.
+
+    Note that the `footing.constants.FOOTING_ENV_VAR` is set to 'ls' for the duration of this
+    function.
+
+    Args:
+        forge: A root git storage path.  For example, a Github organization
+            (github.com/Organization) or a gitlab group (gitlab.com/my/group).
+        template: The template path
+        offline: Return the versions recorded in the index instead of querying the forge.
+
+    Raises:
+        `InvalidForgeError`: When ``forge`` is invalid
+        `CheckRunError`: When the latest version of the template cannot be obtained
+        `NotIndexedError`: When ``offline`` is True and the projects were never indexed
     """
+    index = footing.index.Index()
+    if offline:
+        index.ls(forge, template)
+        return TemplateStatus(
+            template=template,
+            latest_version=index.get_latest_version(template),
+            versions=index.get_versions(forge, template),
+        )
+
+    synced_at = footing.index.now()
     client = footing.forge.from_path(forge)
-    return client.ls(forge, template)
+    listing_synced_at = index.get_synced_at(forge, template)
+    pushed_since = index.get_pushed_synced_at(forge)
+    if pushed_since and listing_synced_at:
+        # Pushes after the listing was synced can add projects to it
+        pushed_since = min(pushed_since, listing_synced_at)
+
+    pushed = client.get_pushed_since(forge, pushed_since)
+    index.record_pushed_at(forge, pushed, synced_at=synced_at)
+
+    if listing_synced_at:
+        projects = index.ls(forge, template)
+        # Repositories that were not pushed since the listing cannot have become projects
+        candidates = [
+            url
+            for url, pushed_at in pushed.items()
+            if url not in projects and (pushed_at or "") >= listing_synced_at
+        ]
+    else:
+        projects = ls(forge, template)
+        candidates = []
+
+    stale_projects = [*index.get_stale_configs(list(projects)), *candidates]
+
+    async def read_forge():
+        return await asyncio.gather(
+            client.get_latest_template_version_async(template),
+            client.get_footing_configs_async(stale_projects),
+        )
+
+    latest_version, configs = asyncio.run(read_forge())
+    index.record_configs(configs, read_at=synced_at)
+    index.record_latest_version(template, latest_version)
+    if listing_synced_at:
+        new_projects = {
+            url: "(no description found)"
+            for url in candidates
+            if configs[url] and configs[url].get("_template") == template
+        }
+        index.record_ls(forge, template, {**projects, **new_projects}, synced_at=synced_at)
+
+    return TemplateStatus(
+        template=template,
+        latest_version=index.get_latest_version(template),
+        versions=index.get_versions(forge, template),
+    )
+
+
+def older_than(forge: str, template: str, version: str, offline: bool = False) -> dict[str, str]:
+    """Lists the projects of a template that are on versions older than ``version``
+
+    A project is older when its template version is an ancestor of ``version``.
+    Ancestors are found in the template mirror of the `footing.render.TemplateCache`.
+
+    Args:
+        forge: A root git storage path
+        template: The template path
+        version: A git SHA or branch of the template
+        offline: Use the versions recorded in the index and the existing template
+            mirror instead of querying the forge. The mirror is never cloned or fetched.
+
+    Returns:
+        The template versions of the older projects keyed on the project url
+
+    Raises:
+        `NotIndexedError`: When ``offline`` is True and the projects were never indexed
+            or ``version`` is not in the template mirror
+    """
+    template_status = status(forge, template, offline=offline)
+
+    cache = footing.render.TemplateCache()
+    if offline:
+        sha = cache.lookup(template, version)
+        if not sha:
+            raise footing.exceptions.NotIndexedError(
+                'Version "{}" of "{}" is not in the template cache.'
+                ' Run the command without "--offline" first.'.format(version, template)
+            )
+    else:
+        sha = cache.resolve(template, version)
+
+    ancestors = set(footing.git.runner.output("rev-list", sha, cwd=cache.mirror(template)).split())
+
+    return {
+        project: project_version
+        for project, project_version in template_status.versions.items()
+        if project_version and project_version != sha and project_version in ancestors
+    }
@@ -0,0 +1,200 @@
+"""Counts the API requests of forges for planning API quotas.
+
+Every response of the shared HTTP session of `footing.forge` is recorded in
+`metrics`, so the requests of Github and Gitlab clients are counted without
+wrapping ``requests``. Requests are grouped by endpoint, such as
+``GET api.github.com/repos/{owner}/{repo}/contents``. Each endpoint has:
+
+* ``requests`` - Responses received
+* ``pages`` - Responses that are a page of a paginated listing
+* ``retries`` - Requests retried after a rate limit refused them
+* ``rate_limited`` - Responses refused because of a rate limit
+* ``errors`` - Responses with an error status
+* ``bytes`` - Bytes of response bodies
+* A histogram of the latencies of the endpoint, with the buckets of
+  `footing.constants.FORGE_METRICS_LATENCY_BUCKETS`
+
+Metrics are read with `ForgeMetrics.snapshot` and written at the end of a run
+with `ForgeMetrics.write`, or with ``footing --metrics <path>``.
+"""
+
+from __future__ import annotations
+
+import bisect
+import dataclasses
+import json
+import re
+import threading
+from urllib.parse import urlparse
+
+import footing.constants
+
+#: Patterns replacing the owners, repositories, and ids of API paths, so that
+#: requests are grouped by endpoint
+_ENDPOINT_PATTERNS = [
+    (re.compile(r"^/repos/[^/]+/[^/]+/([^/]+).*$"), r"/repos/{owner}/{repo}/\1"),
+    (re.compile(r"^/(users|orgs)/[^/]+"), r"/\1/{name}"),
+    (re.compile(r"^/app/installations/[^/]+"), r"/app/installations/{id}"),
+    (re.compile(r"^(/api/v4/(?:projects|groups))/[^/]+"), r"\1/{id}"),
+    (re.compile(r"(/repository/files)/.*$"), r"\1/{path}"),
+]
+
+
+def get_endpoint(method: str, url: str) -> str:
+    """Returns the endpoint of a request, such as ``GET api.github.com/users/{name}``"""
+    url_parts = urlparse(url)
+    path = url_parts.path
+    for pattern, replacement in _ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+
+    return "{} {}{}".format(method.upper(), url_parts.hostname, path)
+
+
+def _is_rate_limited(resp) -> bool:
+    return resp.status_code == 429 or (
+        resp.status_code == 403 and resp.headers.get("X-RateLimit-Remaining") == "0"
+    )
+
+
+@dataclasses.dataclass
+class EndpointMetrics:
+    """The metrics of the requests to a single endpoint
+
+    Attributes:
+        requests: Responses received
+        pages: Responses that are a page of a paginated listing
+        retries: Requests retried after a rate limit refused them
+        rate_limited: Responses refused because of a rate limit
+        errors: Responses with an error status
+        bytes: Bytes of response bodies
+        seconds: The total latency of the responses
+        buckets: The number of responses in each latency bucket of
+            `footing.constants.FORGE_METRICS_LATENCY_BUCKETS`. The last bucket
+            counts the responses slower than every bucket.
+    """
+
+    requests: int = 0
+    pages: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    errors: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    buckets: list[int] = dataclasses.field(
+        default_factory=lambda: [0] * (len(footing.constants.FORGE_METRICS_LATENCY_BUCKETS) + 1)
+    )
+
+
+class ForgeMetrics:
+    """The request metrics of forges keyed on endpoint"""
+
+    def __init__(self):
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, resp) -> EndpointMetrics:
+        endpoint = get_endpoint(resp.request.method, resp.request.url)
+        if endpoint not in self.endpoints:
+            self.endpoints[endpoint] = EndpointMetrics()
+
+        return self.endpoints[endpoint]
+
+    def record(self, resp) -> None:
+        """Records a response. Used as a response hook of the forge session"""
+        seconds = resp.elapsed.total_seconds()
+        with self._lock:
+            metrics = self._get(resp)
+            metrics.requests += 1
+            metrics.pages += "link" in resp.headers
+            metrics.rate_limited += _is_rate_limited(resp)
+            metrics.errors += resp.status_code >= 400
+            metrics.bytes += len(resp.content)
+            metrics.seconds += seconds
+            metrics.buckets[
+                bisect.bisect_left(footing.constants.FORGE_METRICS_LATENCY_BUCKETS, seconds)
+            ] += 1
+
+    def record_retry(self, resp) -> None:
+        """Records that the request of a response is retried"""
+        with self._lock:
+            self._get(resp).retries += 1
+
+    def reset(self) -> None:
+        """Clears all recorded metrics"""
+        with self._lock:
+            self.endpoints.clear()
+
+    def snapshot(self) -> dict[str, EndpointMetrics]:
+        """Returns a copy of the metrics keyed on endpoint"""
+        with self._lock:
+            return {
+                endpoint: dataclasses.replace(metrics, buckets=list(metrics.buckets))
+                for endpoint, metrics in sorted(self.endpoints.items())
+            }
+
+    def to_json(self) -> str:
+        """Returns the metrics as JSON keyed on endpoint"""
+        return json.dumps(
+            {
+                "latency_buckets": list(footing.constants.FORGE_METRICS_LATENCY_BUCKETS),
+                "endpoints": {
+                    endpoint: dataclasses.asdict(metrics)
+                    for endpoint, metrics in self.snapshot().items()
+                },
+            },
+            indent=2,
+        )
+
+    def to_prometheus(self) -> str:
+        """Returns the metrics in the Prometheus text format, as read by textfile collectors"""
+        endpoints = self.snapshot()
+        lines = []
+        for field, description in (
+            ("requests", "Forge API responses received"),
+            ("pages", "Forge API responses that are a page of a listing"),
+            ("retries", "Forge API requests retried after a rate limit"),
+            ("rate_limited", "Forge API responses refused because of a rate limit"),
+            ("errors", "Forge API responses with an error status"),
+            ("bytes", "Bytes of forge API response bodies"),
+        ):
+            name = "footing_forge_{}_total".format(field)
+            lines += ["# HELP {} {}".format(name, description), "# TYPE {} counter".format(name)]
+            lines += [
+                '{}{{endpoint="{}"}} {}'.format(name, _escape(endpoint), getattr(metrics, field))
+                for endpoint, metrics in endpoints.items()
+            ]
+
+        name = "footing_forge_request_duration_seconds"
+        lines += [
+            "# HELP {} Latency of forge API responses".format(name),
+            "# TYPE {} histogram".format(name),
+        ]
+        for endpoint, metrics in endpoints.items():
+            label = 'endpoint="{}"'.format(_escape(endpoint))
+            count = 0
+            for le, bucket in zip(
+                [*footing.constants.FORGE_METRICS_LATENCY_BUCKETS, "+Inf"], metrics.buckets
+            ):
+                count += bucket
+                lines.append('{}_bucket{{{},le="{}"}} {}'.format(name, label, le, count))
+            lines.append("{}_sum{{{}}} {}".format(name, label, metrics.seconds))
+            lines.append("{}_count{{{}}} {}".format(name, label, metrics.requests))
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Writes the metrics to a file
+
+        Files ending in ``.prom`` are written in the Prometheus text format.
+        Other files are written as JSON.
+        """
+        with open(path, "w") as f:
+            f.write(self.to_prometheus() if path.endswith(".prom") else self.to_json())
+
+
+def _escape(label: str) -> str:
+    return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+#: The metrics of every forge API request of the process
+metrics = ForgeMetrics()
@@ -0,0 +1,211 @@
+"""Fetches templates and renders them, caching both on disk.
+
+A `TemplateCache` keeps a single bare mirror of every template repository,
+a single checkout of every template version, and a single rendering of
+every distinct (template, version, context) combination. Entries are
+created in temporary directories and moved into place atomically, so a
+cache directory can be shared by concurrent footing processes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+import cookiecutter.main as cc_main
+
+import footing.git
+import footing.trace
+import footing.utils
+
+#: Keys that footing adds to footing.yaml. They are not part of the cookiecutter context
+FOOTING_CONFIG_KEYS = ("_template", "_version", "_tree")
+
+
+def _get_tree_hash(path):
+    """Returns the git tree hash of all files under a directory
+
+    A throwaway bare repository is used for the index so that no other
+    repository is read or modified.
+    """
+    with tempfile.TemporaryDirectory() as git_dir:
+        footing.git.runner.run("init", "-q", "--bare", git_dir)
+        git_args = ("--git-dir", git_dir, "--work-tree", ".")
+        footing.git.runner.run(*git_args, "add", "-A", cwd=path)
+        return footing.git.runner.output(*git_args, "write-tree", cwd=path)
+
+
+def _get_key(*parts):
+    """Returns a stable cache key for JSON-serializable parts"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def get_context(footing_config):
+    """Returns the cookiecutter context of a footing config, without footing's keys"""
+    return {key: value for key, value in footing_config.items() if key not in FOOTING_CONFIG_KEYS}
+
+
+class TemplateCache:
+    """An on-disk cache of template mirrors, checkouts, and renderings
+
+    Args:
+        root: The cache directory. Defaults to ``templates`` under
+            `footing.utils.get_cache_dir`.
+    """
+
+    def __init__(self, root: str | None = None):
+        self.root = root or os.path.join(footing.utils.get_cache_dir(), "templates")
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.root, kind, key)
+
+    def _create(self, kind: str, key: str, populate) -> str:
+        """Creates a cache entry with ``populate(tmp_path)`` and atomically moves it into place"""
+        path = self._path(kind, key)
+        exists = os.path.exists(path)
+        with footing.trace.span(kind, "cache", key=key[:12], hit=exists):
+            if not exists:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = tempfile.mkdtemp(dir=os.path.dirname(path), prefix=".tmp-")
+                try:
+                    populate(tmp_path)
+                    os.rename(tmp_path, path)
+                except OSError:
+                    # Another process created the entry first
+                    if not os.path.exists(path):
+                        raise
+                finally:
+                    shutil.rmtree(tmp_path, ignore_errors=True)
+
+        return path
+
+    def mirror(self, template: str) -> str:
+        """Returns the path of a bare mirror of the template, cloning it if needed"""
+
+        def clone(tmp_path):
+            footing.git.runner.run(
+                "clone", "--quiet", "--mirror", template, tmp_path, stderr=subprocess.PIPE
+            )
+
+        return self._create("mirrors", _get_key(template), clone)
+
+    def fetch(self, template: str) -> None:
+        """Fetches the latest refs of the template into its mirror"""
+        footing.git.runner.run(
+            "fetch", "--quiet", "--prune", cwd=self.mirror(template), stderr=subprocess.PIPE
+        )
+
+    def lookup(self, template: str, version: str | None = None) -> str | None:
+        """Resolves a git SHA or branch of the template with its mirror, without fetching
+
+        Returns:
+            The git SHA, or None when the template has no mirror or the version is not in it
+        """
+        mirror = self._path("mirrors", _get_key(template))
+        if not os.path.exists(mirror):
+            return None
+
+        ret = footing.git.runner.run(
+            "rev-parse",
+            "--verify",
+            "--quiet",
+            "{}^{{commit}}".format(version or "HEAD"),
+            cwd=mirror,
+            stdout=subprocess.PIPE,
+            check=False,
+        )
+        return ret.stdout.decode("utf-8").strip() if ret.returncode == 0 else None
+
+    def resolve(self, template: str, version: str | None = None) -> str:
+        """Resolves a git SHA or branch of the template to a git SHA
+
+        The mirror is fetched when the version is not already present. When no version
+        is provided, the latest version is fetched and returned.
+        """
+        mirror = self.mirror(template)
+        if version:
+            # Branches are always fetched since they may have moved
+            sha = self.lookup(template, version)
+            if sha and sha.startswith(version):
+                return sha
+
+        self.fetch(template)
+        return footing.git.runner.output(
+            "rev-parse", "--verify", "{}^{{commit}}".format(version or "HEAD"), cwd=mirror
+        )
+
+    def checkout(self, template: str, version: str) -> str:
+        """Returns the path of a checkout of the template at a version"""
+        sha = self.resolve(template, version)
+
+        def clone_version(tmp_path):
+            footing.git.runner.run(
+                "clone",
+                "--quiet",
+                "--shared",
+                "--no-checkout",
+                self.mirror(template),
+                tmp_path,
+            )
+            footing.git.runner.run(
+                "checkout", "--quiet", "--detach", sha, cwd=tmp_path, stderr=subprocess.PIPE
+            )
+
+        return self._create("checkouts", _get_key(template, sha), clone_version)
+
+    def config(self, template: str, version: str) -> dict:
+        """Returns the contents of cookiecutter.json of the template at a version"""
+        with open(os.path.join(self.checkout(template, version), "cookiecutter.json")) as f:
+            return json.load(f)
+
+    def _render(self, template: str, version: str, context: dict) -> str:
+        """Returns the path of the cache entry for a rendered template"""
+        sha = self.resolve(template, version)
+        checkout_dir = self.checkout(template, sha)
+        context = get_context(context)
+
+        def render(tmp_path):
+            with footing.trace.span("cookiecutter", "render"):
+                project_dir = cc_main.cookiecutter(
+                    checkout_dir,
+                    no_input=True,
+                    output_dir=os.path.join(tmp_path, "output"),
+                    extra_context=context,
+                )
+            with open(os.path.join(tmp_path, "render.json"), "w") as f:
+                json.dump(
+                    {
+                        "project": os.path.basename(project_dir),
+                        "tree": _get_tree_hash(project_dir),
+                    },
+                    f,
+                )
+
+        return self._create("renders", _get_key(template, sha, context), render)
+
+    def _render_info(self, template: str, version: str, context: dict) -> tuple[str, dict]:
+        path = self._render(template, version, context)
+        with open(os.path.join(path, "render.json")) as f:
+            return path, json.load(f)
+
+    def render(self, template: str, version: str, context: dict) -> str:
+        """Renders the template at a version with a context
+
+        Args:
+            template: The git path of the template
+            version: The git SHA or branch of the template
+            context: The cookiecutter context, such as the contents of footing.yaml
+
+        Returns:
+            The path of the rendered project directory
+        """
+        path, info = self._render_info(template, version, context)
+        return os.path.join(path, "output", info["project"])
+
+    def tree(self, template: str, version: str, context: dict) -> str:
+        """Returns the git tree hash of the template rendered at a version with a context"""
+        return self._render_info(template, version, context)[1]["tree"]
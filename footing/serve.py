@@ -0,0 +1,364 @@
+"""A long-running footing daemon that keeps caches and clients warm.
+
+Every footing command normally starts cold. It imports cookiecutter and the
+forge clients, opens new HTTP and SSH connections, and looks up the latest
+versions of templates again. `serve` runs a local daemon that keeps all of
+this warm for every command on the host, such as the jobs of CI agents:
+
+* Modules, the shared forge session, and SSH connections stay open.
+* The latest versions of templates are cached for
+  `footing.constants.SERVE_LATEST_VERSION_TTL` seconds.
+* Template mirrors and renders of the on-disk `footing.render.TemplateCache`
+  stay in the page cache.
+
+The daemon is an HTTP server on localhost. Its address and a random token
+are written to ``serve.json`` in `footing.utils.get_cache_dir`, which only
+the user can read. Jobs are sent to ``POST /jobs`` with the token in the
+``X-Footing-Token`` header. Each kind of job runs with the concurrency limit
+of `footing.constants.SERVE_MAX_JOBS`, and jobs over the limit wait their turn.
+
+Jobs change state that is global to their process. Updates and the renders
+of cookiecutter change the working directory, and every command sets the
+``_FOOTING`` environment variable of `footing.utils.set_cmd_env_var`. Jobs
+therefore run in a pool of worker processes, one job per process at a time,
+so that they never change the directory or environment of other jobs.
+Workers start with the latest versions cached by the daemon, such as the
+versions of pushed templates.
+
+Template push webhooks of Github and Gitlab can be posted to ``POST /webhook``
+to precompute the updates of dependent projects with `footing.webhook`. They
+are verified with the secret of `footing.constants.WEBHOOK_SECRET_ENV_VAR`.
+
+The CLI forwards ``footing update -c`` and ``footing ls`` to the daemon with
+`get_client` when it is running. Jobs use the environment of the daemon, such
+as its forge tokens.
+"""
+
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import contextlib
+import dataclasses
+import hmac
+import http.server
+import io
+import json
+import multiprocessing
+import os
+import secrets
+import threading
+import urllib.error
+import urllib.request
+
+import footing
+import footing.constants
+import footing.exceptions
+import footing.utils
+
+
+# Jobs import their modules when they run, so that clients of the daemon never import
+# cookiecutter or the forge clients. The daemon imports them once when it starts
+def _check(path: str, version: str | None = None, rendered: bool = False) -> str:
+    import footing.update
+
+    return footing.update.status(version=version, rendered=rendered, path=path)
+
+
+def _ls(forge: str, template: str | None = None, offline: bool = False) -> dict[str, str]:
+    import footing.ls
+
+    return footing.ls.ls(forge, template=template, offline=offline)
+
+
+def _update(path: str, version: str | None = None, answers: dict | None = None) -> dict:
+    import footing.update
+
+    output = io.StringIO()
+    with footing.utils.cd(path), contextlib.redirect_stdout(output):
+        updated = footing.update.update(new_version=version, answers=answers or {})
+
+    return {"updated": updated, "output": output.getvalue()}
+
+
+def _webhook(payload: dict, forge: str | None = None) -> dict | None:
+    import footing.webhook
+
+    result = footing.webhook.handle_push(payload, forge=forge)
+    return dataclasses.asdict(result) if result else None
+
+
+def _set_latest_version(result: dict | None) -> None:
+    """Caches the pushed version of a webhook job in the daemon for the workers of later jobs"""
+    import footing.forge
+
+    if result:
+        footing.forge.set_latest_version(result["template"], result["sha"])
+
+
+#: The jobs of the daemon keyed on their command
+_JOBS = {"check": _check, "ls": _ls, "update": _update, "webhook": _webhook}
+
+#: Keeps the latest versions of templates cached for the lifetime of a worker process
+_worker_context = contextlib.ExitStack()
+
+
+def _init_worker() -> None:
+    import footing.forge
+
+    _worker_context.enter_context(
+        footing.forge.cache_latest_versions(footing.constants.SERVE_LATEST_VERSION_TTL)
+    )
+
+
+def _get_latest_versions() -> dict[str, str]:
+    import footing.forge
+
+    return footing.forge.get_latest_versions()
+
+
+def _run_job(command: str, args: dict, latest_versions: dict[str, str]):
+    """Runs a job in a worker process with the latest versions cached by the daemon"""
+    import footing.forge
+
+    for template, version in latest_versions.items():
+        footing.forge.set_latest_version(template, version)
+
+    return _JOBS[command](**args)
+
+
+def _create_workers() -> concurrent.futures.ProcessPoolExecutor:
+    """Creates the pool of worker processes that run the jobs of the daemon"""
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=sum(footing.constants.SERVE_MAX_JOBS.values()),
+        # Forking a process with running threads can copy locks that are held forever
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    )
+
+
+def _verify_webhook(body: bytes, headers) -> bool:
+    import footing.webhook
+
+    secret = os.environ.get(footing.constants.WEBHOOK_SECRET_ENV_VAR)
+    return bool(secret) and footing.webhook.verify_signature(body, headers, secret)
+
+
+def _get_address_path() -> str:
+    return os.path.join(footing.utils.get_cache_dir(), footing.constants.SERVE_ADDRESS_FILE)
+
+
+def _error(exc: Exception) -> dict:
+    return {"error": {"type": type(exc).__name__, "message": str(exc)}}
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    server: Server
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send(404, _error(footing.exceptions.DaemonJobError("Not found")))
+        else:
+            self._send(200, self.server.health())
+
+    def _is_authorized(self, body: bytes) -> bool:
+        if hmac.compare_digest(self.headers.get("X-Footing-Token", ""), self.server.token):
+            return True
+
+        # Forges cannot send the token, so webhooks are verified with their secret instead
+        return self.path == "/webhook" and _verify_webhook(body, self.headers)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path not in ("/jobs", "/webhook"):
+            self._send(404, _error(footing.exceptions.DaemonJobError("Not found")))
+        elif not self._is_authorized(body):
+            self._send(403, _error(footing.exceptions.DaemonJobError("Invalid token")))
+        elif self.path == "/webhook":
+            self._send(*self.server.run_job("webhook", {"payload": json.loads(body)}))
+        else:
+            job = json.loads(body)
+            self._send(*self.server.run_job(job.get("command"), job.get("args") or {}))
+
+
+class Server(http.server.ThreadingHTTPServer):
+    """The HTTP server of the footing daemon
+
+    Args:
+        port: The localhost port. A free port is chosen by default.
+        token: The token required by jobs. A random token is created by default.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, token: str | None = None):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.token = token or secrets.token_urlsafe()
+        self.url = "http://127.0.0.1:{}".format(self.server_address[1])
+        self._semaphores = {
+            command: threading.BoundedSemaphore(limit)
+            for command, limit in footing.constants.SERVE_MAX_JOBS.items()
+        }
+        self._lock = threading.Lock()
+        self._running: collections.Counter = collections.Counter()
+        self._workers = _create_workers()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._workers.shutdown(cancel_futures=True)
+
+    def _run_in_worker(self, command: str, args: dict):
+        workers = self._workers
+        try:
+            return workers.submit(_run_job, command, args, _get_latest_versions()).result()
+        except concurrent.futures.process.BrokenProcessPool:
+            # A worker that dies breaks its pool, so later jobs get a new pool
+            with self._lock:
+                if self._workers is workers:
+                    self._workers = _create_workers()
+            raise
+
+    def _run(self, command: str, args: dict):
+        result = self._run_in_worker(command, args)
+        if command == "webhook":
+            _set_latest_version(result)
+
+        return result
+
+    def health(self) -> dict:
+        """Returns the process, version, and running jobs of the daemon"""
+        with self._lock:
+            running = {command: count for command, count in self._running.items() if count}
+
+        return {"pid": os.getpid(), "version": footing.__version__, "running": running}
+
+    def run_job(self, command: str, args: dict) -> tuple[int, dict]:
+        """Runs a job once its command is under the concurrency limit
+
+        Returns:
+            The HTTP status and body of the response
+        """
+        if command not in _JOBS:
+            exc = footing.exceptions.DaemonJobError('Unknown command "{}"'.format(command))
+            return 400, _error(exc)
+
+        with self._semaphores[command]:
+            with self._lock:
+                self._running[command] += 1
+            try:
+                return 200, {"result": self._run(command, args)}
+            except footing.exceptions.Error as exc:
+                return 400, _error(exc)
+            except Exception as exc:
+                # Unexpected errors are reported to the client and never stop the daemon
+                return 500, _error(footing.exceptions.DaemonJobError(repr(exc)))
+            finally:
+                with self._lock:
+                    self._running[command] -= 1
+
+
+@contextlib.contextmanager
+def _address_file(server: Server):
+    """Writes the address of a running server to the cache directory"""
+    path = _get_address_path()
+    # The file holds the token, so only the user may read it
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump({"url": server.url, "pid": os.getpid(), "token": server.token}, f)
+
+    try:
+        yield path
+    finally:
+        os.remove(path)
+
+
+def serve(port: int = 0) -> None:
+    """Runs the footing daemon until it is interrupted
+
+    Args:
+        port: The localhost port. A free port is chosen by default.
+    """
+    import footing.forge
+    import footing.ls
+    import footing.update
+    import footing.webhook
+
+    server = Server(port)
+    try:
+        with (
+            footing.forge.cache_latest_versions(footing.constants.SERVE_LATEST_VERSION_TTL),
+            _address_file(server) as path,
+        ):
+            print("footing daemon serving on {} ({})".format(server.url, path))
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+class Client:
+    """A client of the footing daemon
+
+    Args:
+        url: The URL of the daemon
+        token: The token of the daemon
+    """
+
+    def __init__(self, url: str, token: str):
+        self.url = url
+        self.token = token
+
+    def _request(self, path: str, body: dict | None = None, timeout: float | None = None):
+        request = urllib.request.Request(
+            self.url + path,
+            data=json.dumps(body).encode() if body is not None else None,
+            headers={"Content-Type": "application/json", "X-Footing-Token": self.token},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as resp:
+                return json.loads(resp.read())
+        except urllib.error.HTTPError as exc:
+            error = json.loads(exc.read())["error"]
+
+        # Errors of the daemon are raised again with the footing exception of the job
+        exc_class = getattr(footing.exceptions, error["type"], footing.exceptions.DaemonJobError)
+        raise exc_class(error["message"])
+
+    def health(self, timeout: float | None = None) -> dict:
+        """Returns the process, version, and running jobs of the daemon"""
+        return self._request("/health", timeout=timeout)
+
+    def run(self, command: str, **args):
+        """Runs a job on the daemon and returns its result
+
+        Raises:
+            `footing.exceptions.Error`: The footing error of the job, or `DaemonJobError`
+                when the job failed unexpectedly
+        """
+        return self._request("/jobs", {"command": command, "args": args})["result"]
+
+
+def get_client() -> Client | None:
+    """Returns a client of the running footing daemon
+
+    Returns:
+        None when no daemon is running or the daemon runs another version of footing
+    """
+    try:
+        with open(_get_address_path()) as f:
+            address = json.load(f)
+        client = Client(address["url"], address["token"])
+        health = client.health(timeout=footing.constants.SERVE_CONNECT_TIMEOUT)
+    except (OSError, ValueError, KeyError, footing.exceptions.Error):
+        return None
+
+    return client if health["version"] == footing.__version__ else None
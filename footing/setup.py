@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import subprocess
 import unittest.mock
 
 import cookiecutter.generate as cc_generate
@@ -10,6 +9,8 @@ import cookiecutter.hooks as cc_hooks
 
 import footing.check
 import footing.constants
+import footing.git
+import footing.trace
 import footing.utils
 
 
@@ -70,11 +71,11 @@ def setup(template: str, version: str | None = None) -> None:
     ).format(repo_path)
     print(msg)
 
-    cc_repo_dir, config = footing.utils.get_cookiecutter_config(template, version=version)
+    with footing.trace.span("cookiecutter config", "setup"):
+        cc_repo_dir, config = footing.utils.get_cookiecutter_config(template, version=version)
 
     if not version:
-        with footing.utils.cd(cc_repo_dir):
-            ret = footing.utils.shell("git rev-parse HEAD", stdout=subprocess.PIPE)
-            version = ret.stdout.decode("utf-8").strip()
+        version = footing.git.runner.output("rev-parse", "HEAD", cwd=cc_repo_dir)
 
-    _generate_files(repo_dir=cc_repo_dir, config=config, template=template, version=version)
+    with footing.trace.span("generate files", "setup"):
+        _generate_files(repo_dir=cc_repo_dir, config=config, template=template, version=version)
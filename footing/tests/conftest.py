@@ -1,11 +1,18 @@
 """Footing test setup and fixtures"""
 
+import collections
+import contextlib
+import dataclasses
 import os
+import subprocess
+import unittest.mock
 
 import pytest
 import responses as responses_lib
 
 import footing.constants
+import footing.metrics
+import footing.utils
 
 
 @pytest.fixture
@@ -16,10 +23,20 @@ def github_env(mocker):
     return gh_env
 
 
+@pytest.fixture
+def cache_dir_env(mocker, tmp_path_factory):
+    """Keeps footing's caches in a temporary directory"""
+    cache_env = {
+        footing.constants.FOOTING_CACHE_DIR_ENV_VAR: str(tmp_path_factory.mktemp("cache"))
+    }
+    mocker.patch.dict(os.environ, cache_env)
+    return cache_env
+
+
 @pytest.fixture(autouse=True)
-def footing_env(github_env):
+def footing_env(github_env, cache_dir_env):
     """Provides a complete test footing environment for testing"""
-    return github_env
+    return {**github_env, **cache_dir_env}
 
 
 @pytest.fixture
@@ -27,3 +44,113 @@ def responses():
     """Ensure no http requests happen and allow for mocking out responses"""
     with responses_lib.RequestsMock(assert_all_requests_are_fired=False) as mocked_requests:
         yield mocked_requests
+
+
+@pytest.fixture
+def local_template(tmp_path):
+    """Creates a template repository with two versions in a temporary directory
+
+    Returns a tuple of the template path and the git SHAs of both versions.
+    """
+    template_dir = tmp_path / "template"
+    project_dir = template_dir / "{{cookiecutter.repo_name}}"
+    project_dir.mkdir(parents=True)
+    (template_dir / "cookiecutter.json").write_text('{"repo_name": "project"}')
+    (project_dir / "README.md").write_text("{{cookiecutter.repo_name}}\n")
+
+    def git(*args):
+        ret = subprocess.run(
+            ["git", "-c", "user.name=footing", "-c", "user.email=footing@example.com", *args],
+            cwd=template_dir,
+            check=True,
+            stdout=subprocess.PIPE,
+        )
+        return ret.stdout.decode("utf-8").strip()
+
+    git("init", "-q")
+    git("add", ".")
+    git("commit", "-q", "-m", "v1")
+    v1 = git("rev-parse", "HEAD")
+    (project_dir / "README.md").write_text("{{cookiecutter.repo_name}} v2\n")
+    git("commit", "-q", "-a", "-m", "v2")
+    v2 = git("rev-parse", "HEAD")
+
+    return str(template_dir), [v1, v2]
+
+
+@dataclasses.dataclass
+class CallCounts:
+    """The API requests and spawned processes of a `call_budget` block
+
+    Attributes:
+        requests: Requests keyed on endpoint, such as "GET api.github.com/users/{name}"
+        spawns: Processes keyed on their first two arguments, such as "git clone"
+    """
+
+    requests: collections.Counter = dataclasses.field(default_factory=collections.Counter)
+    spawns: collections.Counter = dataclasses.field(default_factory=collections.Counter)
+
+
+def _get_spawn_name(cmd):
+    return " ".join(cmd.split()[:2] if isinstance(cmd, str) else cmd[:2])
+
+
+def _get_overruns(kind, budget, counts):
+    for name, limit in budget.items():
+        count = sum(counts.values()) if name == "*" else counts[name]
+        if count > limit:
+            yield '{} "{}" happened {} times, over the budget of {}'.format(
+                kind, name, count, limit
+            )
+
+
+@pytest.fixture
+def call_budget():
+    """Fails the test when a block makes more API requests or spawns than budgeted
+
+    Requests are counted by endpoint with `footing.metrics` and processes are counted
+    by their first two arguments as they are spawned with `footing.utils.shell` or
+    `footing.utils.shell_async`.
+    Budgets map names to the most calls allowed. "*" budgets all calls of a kind::
+
+        with call_budget(requests={"*": 1}, spawns={"git ls-remote": 1, "git clone": 0}):
+            footing.update.status()
+
+    The context yields the `CallCounts` of the block.
+    """
+
+    @contextlib.contextmanager
+    def budget(requests=None, spawns=None):
+        counts = CallCounts()
+        footing.metrics.metrics.reset()
+        mock_shell = unittest.mock.patch(
+            "footing.utils.shell", autospec=True, side_effect=footing.utils.shell
+        )
+        mock_shell_async = unittest.mock.patch(
+            "footing.utils.shell_async", autospec=True, side_effect=footing.utils.shell_async
+        )
+        with mock_shell as mock_shell, mock_shell_async as mock_shell_async:
+            yield counts
+
+        counts.requests.update(
+            {
+                endpoint: metrics.requests
+                for endpoint, metrics in footing.metrics.metrics.snapshot().items()
+            }
+        )
+        counts.spawns.update(
+            _get_spawn_name(call.args[0])
+            for call in [*mock_shell.call_args_list, *mock_shell_async.call_args_list]
+        )
+        overruns = [
+            *_get_overruns("Request", requests or {}, counts.requests),
+            *_get_overruns("Spawn", spawns or {}, counts.spawns),
+        ]
+        if overruns:
+            pytest.fail(
+                "Call budget exceeded:\n{}\nRequests: {}\nSpawns: {}".format(
+                    "\n".join(overruns), dict(counts.requests), dict(counts.spawns)
+                )
+            )
+
+    return budget
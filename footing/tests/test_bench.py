@@ -0,0 +1,110 @@
+"""Tests for footing.bench module"""
+
+import json
+import pathlib
+import subprocess
+
+import pytest
+
+import footing.bench
+import footing.exceptions
+import footing.utils
+
+
+@pytest.fixture
+def hooked_template(local_template):
+    """Adds a larger file and a post generation hook to the local template
+
+    Returns a tuple of the template path and the git SHA of the new version.
+    """
+    template, _ = local_template
+    template_dir = pathlib.Path(template)
+    docs_dir = template_dir / "{{cookiecutter.repo_name}}" / "docs"
+    docs_dir.mkdir()
+    (docs_dir / "{{cookiecutter.repo_name}}.md").write_text(
+        "{% for i in range(100) %}{{cookiecutter.repo_name}}\n{% endfor %}"
+    )
+    (template_dir / "hooks").mkdir()
+    (template_dir / "hooks" / "post_gen_project.py").write_text("print('hook')\n")
+
+    def git(*args):
+        ret = subprocess.run(
+            ["git", "-c", "user.name=footing", "-c", "user.email=footing@example.com", *args],
+            cwd=template_dir,
+            check=True,
+            stdout=subprocess.PIPE,
+        )
+        return ret.stdout.decode("utf-8").strip()
+
+    git("add", ".")
+    git("commit", "-q", "-m", "v3")
+    return template, git("rev-parse", "HEAD")
+
+
+def test_bench_template(hooked_template, tmp_path, capfd):
+    """Tests footing.bench.bench_template with the defaults of cookiecutter.json"""
+    template, v3 = hooked_template
+
+    result = footing.bench.bench_template(template, path=str(tmp_path))
+
+    assert result.template == template
+    assert result.version == v3
+    assert result.context == {"repo_name": "project"}
+    assert result.seconds >= sum(timing.seconds for timing in result.files)
+    assert [timing.seconds for timing in result.files] == sorted(
+        (timing.seconds for timing in result.files), reverse=True
+    )
+    assert {(timing.path, timing.kind, timing.bytes) for timing in result.files} == {
+        ("{{cookiecutter.repo_name}}/README.md", "file", len("project v2\n")),
+        ("{{cookiecutter.repo_name}}/docs/{{cookiecutter.repo_name}}.md", "file", 800),
+        ("hooks/post_gen_project.py", "hook", None),
+    }
+    assert "hook" in capfd.readouterr().out
+
+
+def test_bench_template_w_project(local_template, tmp_path):
+    """Tests footing.bench.bench_template renders with the context of a project"""
+    template, (v1, _) = local_template
+    footing.utils.write_footing_config({"repo_name": "a"}, template, v1, path=str(tmp_path))
+
+    with footing.utils.cd(str(tmp_path)):
+        result = footing.bench.bench_template(version=v1)
+
+    assert (result.template, result.version, result.context) == (template, v1, {"repo_name": "a"})
+    assert result.files == [
+        footing.bench.FileTiming(
+            "{{cookiecutter.repo_name}}/README.md", "file", result.files[0].seconds, 2
+        )
+    ]
+
+    result.write(str(tmp_path / "bench.json"))
+    assert json.loads((tmp_path / "bench.json").read_text()) == {
+        "template": template,
+        "version": v1,
+        "context": {"repo_name": "a"},
+        "seconds": result.seconds,
+        "files": [
+            {
+                "path": "{{cookiecutter.repo_name}}/README.md",
+                "kind": "file",
+                "seconds": result.files[0].seconds,
+                "bytes": 2,
+            }
+        ],
+    }
+
+
+def test_bench_template_w_other_template(local_template, tmp_path):
+    """Tests the context of a project of another template is not used"""
+    template, (v1, _) = local_template
+    footing.utils.write_footing_config({"repo_name": "a"}, "other", v1, path=str(tmp_path))
+
+    result = footing.bench.bench_template(template, version=v1, path=str(tmp_path))
+
+    assert result.context == {"repo_name": "project"}
+
+
+def test_bench_template_not_footing_project(tmp_path):
+    """Tests a template is required outside of footing projects"""
+    with pytest.raises(footing.exceptions.InvalidFootingProjectError):
+        footing.bench.bench_template(path=str(tmp_path))
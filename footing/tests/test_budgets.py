@@ -0,0 +1,184 @@
+"""Call budgets of footing commands
+
+Each test bounds the API requests and git processes of a command with the
+``call_budget`` fixture, so that changes that add calls fail the suite.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import footing.cli
+import footing.constants
+import footing.exceptions
+import footing.git
+import footing.ls
+import footing.render
+import footing.update
+import footing.utils
+
+TEMPLATE = "git@github.com:org/template.git"
+
+#: The most API requests and processes of each command. Raise a budget only
+#: when the new calls are intended.
+BUDGETS = {
+    "update -c": {
+        "requests": {"*": 1},
+        "spawns": {"git ls-remote": 1, "git clone": 0, "git config": 1, "*": 3},
+    },
+    "update": {
+        "requests": {"*": 1},
+        "spawns": {
+            "git ls-remote": 1,
+            "git clone": 1,
+            "git checkout": 7,
+            "git merge": 2,
+            "git rev-parse": 13,
+            "*": 35,
+        },
+    },
+    "ls": {
+        "requests": {
+            "GET api.github.com/users/{name}": 0,
+            "GET api.github.com/search/code": 3,
+            "*": 3,
+        },
+        "spawns": {"*": 0},
+    },
+    "ls of large organizations": {
+        "requests": {
+            "GET api.github.com/search/code": 1,
+            "GET api.github.com/users/{name}": 1,
+            "GET api.github.com/orgs/{name}/repos": 2,
+            "GET api.github.com/repos/{owner}/{repo}/contents": 4,
+            "*": 8,
+        },
+        "spawns": {"*": 0},
+    },
+}
+
+
+@pytest.fixture
+def github_template(local_template, mocker):
+    """Serves the local template at a Github SSH path with git's URL rewriting"""
+    template, versions = local_template
+    mocker.patch.dict(
+        os.environ,
+        {
+            "GIT_CONFIG_COUNT": "1",
+            "GIT_CONFIG_KEY_0": "url.{}.insteadOf".format(template),
+            "GIT_CONFIG_VALUE_0": TEMPLATE,
+        },
+    )
+    return TEMPLATE, versions
+
+
+@pytest.fixture
+def project(github_template, tmp_path):
+    """A committed project of the first version of the template"""
+    template, (v1, _) = github_template
+    repo = tmp_path / "project"
+    footing.update._apply_template(
+        template,
+        str(repo),
+        checkout=v1,
+        extra_context={"repo_name": "a"},
+        cache=footing.render.TemplateCache(),
+    )
+    footing.utils.write_footing_config({"repo_name": "a"}, template, v1, path=str(repo))
+    runner = footing.git.GitRunner(cwd=str(repo))
+    runner.run("init", "-q")
+    runner.run("add", ".")
+    runner.run(
+        "-c", "user.name=footing", "-c", "user.email=footing@example.com", "commit", "-qm", "1"
+    )
+    return str(repo)
+
+
+def test_call_budget_exceeded(call_budget):
+    """Tests the call_budget fixture fails blocks that go over budget"""
+    with pytest.raises(pytest.fail.Exception, match='Spawn "git version" happened 2 times'):
+        with call_budget(spawns={"git version": 1, "*": 2}):
+            footing.git.runner.run("version", stdout=subprocess.DEVNULL)
+            footing.utils.shell("git version >/dev/null")
+
+    with call_budget(spawns={"git version": 2}, requests={"*": 0}) as counts:
+        footing.utils.shell("git version >/dev/null")
+
+    assert counts.spawns == {"git version": 1}
+    assert not counts.requests
+
+
+@pytest.mark.usefixtures("responses")
+def test_update_check(project, call_budget, mocker):
+    """footing update -c looks up the latest version without cloning the template"""
+    mocker.patch.object(sys, "argv", ["footing", "update", "-c"])
+
+    with footing.utils.cd(project):
+        with call_budget(**BUDGETS["update -c"]):
+            with pytest.raises(footing.exceptions.NotUpToDateWithTemplateError):
+                footing.cli.main()
+
+
+@pytest.mark.usefixtures("responses")
+def test_update(project, call_budget):
+    """footing update clones only the template version missing from the cache"""
+    with footing.utils.cd(project):
+        with call_budget(**BUDGETS["update"]):
+            footing.update.update()
+
+
+def _add_pages(responses, url, pages):
+    for i, page in enumerate(pages, 1):
+        headers = {}
+        if i < len(pages):
+            headers["link"] = '<{0}?page={1}>; rel="next", <{0}?page={2}>; rel="last"'.format(
+                url, i + 1, len(pages)
+            )
+        responses.add(responses.GET, url, json=page, headers=headers)
+
+
+def test_ls_code_search(responses, call_budget):
+    """footing ls makes one code search request per page of results"""
+    _add_pages(
+        responses,
+        "https://api.github.com/search/code",
+        [{"items": [{"repository": {"full_name": "org/t{}".format(i)}}]} for i in range(3)],
+    )
+
+    with call_budget(**BUDGETS["ls"]):
+        assert len(footing.ls.ls("github.com/org")) == 3
+
+
+def test_ls_repos(responses, call_budget, mocker):
+    """footing ls of large organizations makes one request per page and repository"""
+    mocker.patch.object(footing.constants, "GITHUB_CODE_SEARCH_MAX_RESULTS", 1)
+    responses.add(
+        responses.GET,
+        "https://api.github.com/search/code",
+        json={"total_count": 2, "items": [{"repository": {"full_name": "org/r1"}}]},
+    )
+    responses.add(
+        responses.GET,
+        "https://api.github.com/users/org",
+        json={"login": "org", "type": "Organization", "public_repos": 4},
+    )
+    _add_pages(
+        responses,
+        "https://api.github.com/orgs/org/repos",
+        [
+            [{"full_name": "org/r{}".format(i), "fork": False} for i in range(page, page + 2)]
+            for page in (0, 2)
+        ],
+    )
+    for i in range(4):
+        responses.add(
+            responses.GET,
+            "https://api.github.com/repos/org/r{}/contents/cookiecutter.json".format(i),
+            status=200 if i % 2 else 404,
+        )
+
+    with call_budget(**BUDGETS["ls of large organizations"]):
+        assert len(footing.ls.ls("github.com/org")) == 2
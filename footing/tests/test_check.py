@@ -41,11 +41,11 @@ def test_is_git_ssh_path_invalid(invalid_template_path):
 def test_in_git_repo(revparse_returncode, mocker):
     """Tests footing.check.not_in_git_repo"""
     revparse_return = subprocess.CompletedProcess([], returncode=revparse_returncode)
-    mock_shell = mocker.patch("footing.utils.shell", autospec=True, return_value=revparse_return)
+    mock_run = mocker.patch("footing.git.runner.run", autospec=True, return_value=revparse_return)
 
     assert footing.check.in_git_repo() is None
 
-    mock_shell.assert_called_once_with("git rev-parse", stderr=subprocess.DEVNULL, check=False)
+    mock_run.assert_called_once_with("rev-parse", stderr=subprocess.DEVNULL, check=False, cwd=None)
 
 
 @pytest.mark.parametrize(
@@ -61,11 +61,11 @@ def test_in_git_repo(revparse_returncode, mocker):
 def test_not_in_git_repo(revparse_returncode, mocker):
     """Tests footing.check.not_in_git_repo"""
     revparse_return = subprocess.CompletedProcess([], returncode=revparse_returncode)
-    mock_shell = mocker.patch("footing.utils.shell", autospec=True, return_value=revparse_return)
+    mock_run = mocker.patch("footing.git.runner.run", autospec=True, return_value=revparse_return)
 
     assert footing.check.not_in_git_repo() is None
 
-    mock_shell.assert_called_once_with("git rev-parse", stderr=subprocess.DEVNULL, check=False)
+    mock_run.assert_called_once_with("rev-parse", stderr=subprocess.DEVNULL, check=False, cwd=None)
 
 
 @pytest.mark.parametrize(
@@ -81,11 +81,11 @@ def test_not_in_git_repo(revparse_returncode, mocker):
 def test_in_clean_repo(revparse_returncode, mocker):
     """Tests footing.check.in_clean_repo"""
     revparse_return = subprocess.CompletedProcess([], returncode=revparse_returncode)
-    mock_shell = mocker.patch("footing.utils.shell", autospec=True, return_value=revparse_return)
+    mock_run = mocker.patch("footing.git.runner.run", autospec=True, return_value=revparse_return)
 
     assert footing.check.in_clean_repo() is None
 
-    mock_shell.assert_called_once_with("git diff-index --quiet HEAD --", check=False)
+    mock_run.assert_called_once_with("diff-index", "--quiet", "HEAD", "--", check=False)
 
 
 @pytest.mark.parametrize(
@@ -101,18 +101,34 @@ def test_in_clean_repo(revparse_returncode, mocker):
 def test_not_has_branch(revparse_returncode, mocker):
     """Tests footing.check.not_has_branch"""
     revparse_return = subprocess.CompletedProcess([], returncode=revparse_returncode)
-    mock_shell = mocker.patch("footing.utils.shell", autospec=True, return_value=revparse_return)
+    mock_run = mocker.patch("footing.git.runner.run", autospec=True, return_value=revparse_return)
 
     assert footing.check.not_has_branch("somebranch") is None
 
-    mock_shell.assert_called_once_with(
-        "git rev-parse --verify somebranch",
+    mock_run.assert_called_once_with(
+        "rev-parse",
+        "--verify",
+        "somebranch",
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
         check=False,
     )
 
 
+def test_not_has_branch_multiple(mocker):
+    """Tests footing.check.not_has_branch with multiple branches"""
+
+    def run_side_effect(*args, **kwargs):
+        return subprocess.CompletedProcess(args, returncode=0 if args[-1] == "b2" else 128)
+
+    mock_run = mocker.patch("footing.git.runner.run", autospec=True, side_effect=run_side_effect)
+
+    with pytest.raises(footing.exceptions.ExistingBranchError, match="b2"):
+        footing.check.not_has_branch("b1", "b2")
+
+    assert mock_run.call_count == 2
+
+
 @pytest.mark.parametrize(
     "envvar_names, check_envvar_names",
     [
@@ -156,3 +172,18 @@ def test_check_is_footing_project(footing_file, fs):
     fs.create_file(footing_file)
 
     assert footing.check.is_footing_project() is None
+
+
+def test_has_branch():
+    """Verifies footing.check._has_branch against the current repository"""
+    assert footing.check._has_branch("HEAD")
+    assert not footing.check._has_branch("_footing_branch_that_does_not_exist")
+
+
+def test_check_is_footing_project_w_path(fs):
+    """Tests footing.check.is_footing_project with a project path"""
+    fs.create_file("project/footing.yaml")
+
+    assert footing.check.is_footing_project("project") is None
+    with pytest.raises(footing.exceptions.InvalidFootingProjectError):
+        footing.check.is_footing_project("other")
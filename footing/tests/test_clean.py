@@ -10,14 +10,14 @@ import footing.exceptions
     "update_branch_exists, temp_update_branch_exists, expected_shell_cmds",
     [
         (False, False, []),
-        (True, False, [mock.call("git branch -D _footing_update")]),
-        (False, True, [mock.call("git branch -D _footing_update_temp")]),
+        (True, False, [mock.call("branch", "-D", "_footing_update")]),
+        (False, True, [mock.call("branch", "-D", "_footing_update_temp")]),
         (
             True,
             True,
             [
-                mock.call("git branch -D _footing_update"),
-                mock.call("git branch -D _footing_update_temp"),
+                mock.call("branch", "-D", "_footing_update"),
+                mock.call("branch", "-D", "_footing_update_temp"),
             ],
         ),
     ],
@@ -46,9 +46,9 @@ def test_clean(
         autospec=True,
         side_effect=branch_exists_side_effect,
     )
-    mock_shell = mocker.patch("footing.utils.shell", autospec=True)
+    mock_run = mocker.patch("footing.git.runner.run", autospec=True)
     footing.clean.clean()
-    assert mock_shell.call_args_list == expected_shell_cmds
+    assert mock_run.call_args_list == expected_shell_cmds
 
 
 def test_get_current_branch():
@@ -2,14 +2,22 @@
 
 # pylint: disable=no-value-for-parameter
 import collections
+import importlib.metadata
+import json
+import os
+import subprocess
 import sys
 
 import click
-import pkg_resources
 import pytest
 
+import footing.bench
 import footing.cli
+import footing.constants
 import footing.exceptions
+import footing.fleet
+import footing.ls
+import footing.webhook
 
 
 @pytest.fixture
@@ -45,19 +53,28 @@ def mock_successful_exit(mock_exit):
         (
             "update",
             ["-c", "-v", "v1"],
-            "footing.update.up_to_date",
+            "footing.update.status",
             [],
-            {"version": "v1"},
+            {"version": "v1", "rendered": False},
         ),
-        ("ls", ["user"], "footing.ls.ls", ["user"], {"template": None}),
+        ("update", ["-a"], "footing.update.update_all", [], {}),
+        ("ls", ["user"], "footing.ls.ls", ["user"], {"template": None, "offline": False}),
         (
             "ls",
             ["user", "template"],
             "footing.ls.ls",
             ["user"],
-            {"template": "template"},
+            {"template": "template", "offline": False},
+        ),
+        (
+            "ls",
+            ["user", "--offline"],
+            "footing.ls.ls",
+            ["user"],
+            {"template": None, "offline": True},
         ),
         ("clean", [], "footing.clean.clean", [], {}),
+        ("serve", ["-p", "8000"], "footing.serve.serve", [], {"port": 8000}),
         (
             "switch",
             ["new_t", "-v", "new_v"],
@@ -85,10 +102,32 @@ def test_main_w_version(mocker, capsys):
     footing.cli.main()
 
     out, _ = capsys.readouterr()
-    version = pkg_resources.get_distribution("footing").version
+    version = importlib.metadata.version("footing")
     assert out == "footing %s\n" % version
 
 
+#: The most time importing footing.cli may take in seconds
+CLI_IMPORT_BUDGET = 0.5
+
+
+def test_cli_import_budget():
+    """Verify the CLI starts without importing slow dependencies"""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import footing.cli\n"
+        "seconds = time.perf_counter() - start\n"
+        "print(json.dumps({'seconds': seconds, 'modules': sorted(sys.modules)}))"
+    )
+    ret = subprocess.run([sys.executable, "-c", code], check=True, stdout=subprocess.PIPE)
+    startup = json.loads(ret.stdout)
+
+    imported = {module.split(".")[0] for module in startup["modules"]}
+    slow = {"cookiecutter", "gitlab", "jinja2", "pkg_resources", "requests", "tldextract", "yaml"}
+    assert not imported & slow
+    assert startup["seconds"] < CLI_IMPORT_BUDGET
+
+
 @pytest.mark.usefixtures("mock_successful_exit")
 def test_main_no_args(mocker, capsys):
     """Test calling the CLI with no options"""
@@ -103,31 +142,121 @@ def test_main_no_args(mocker, capsys):
 
 @pytest.mark.usefixtures("mock_exit")
 @pytest.mark.parametrize(
-    "version, up_to_date_return",
+    "version, rendered, status_return, expected_out",
     [
         pytest.param(
             None,
             False,
+            footing.constants.OUT_OF_DATE,
+            None,
             marks=pytest.mark.xfail(raises=footing.exceptions.NotUpToDateWithTemplateError),
         ),
-        (None, True),
-        ("version", True),
+        (None, False, footing.constants.UP_TO_DATE, "Footing package is up to date\n"),
+        ("version", False, footing.constants.UP_TO_DATE, "Footing package is up to date\n"),
+        (
+            None,
+            True,
+            footing.constants.EFFECTIVELY_UP_TO_DATE,
+            "Footing package is effectively up to date (the rendered template is unchanged)\n",
+        ),
     ],
 )
-def test_update_check(version, up_to_date_return, capsys, mocker):
+def test_update_check(version, rendered, status_return, expected_out, capsys, mocker):
     """Verifies checking for updates when calling footing update -c"""
-    mocker.patch.object(sys, "argv", ["footing", "update", "-c", "-v", version])
-    mock_up_to_date = mocker.patch(
-        "footing.update.up_to_date",
+    mocker.patch.object(
+        sys, "argv", ["footing", "update", "-c", "-v", version] + (["-r"] if rendered else [])
+    )
+    mock_status = mocker.patch(
+        "footing.update.status",
         autospec=True,
-        return_value=up_to_date_return,
+        return_value=status_return,
     )
 
     footing.cli.main()
 
+    out, _ = capsys.readouterr()
+    assert out == expected_out
+    mock_status.assert_called_once_with(version=version, rendered=rendered)
+
+
+@pytest.mark.usefixtures("mock_successful_exit")
+def test_update_check_w_daemon(capsys, mocker):
+    """Verifies footing update -c is forwarded to a running footing daemon"""
+    mocker.patch.object(sys, "argv", ["footing", "update", "-c", "-r"])
+    mock_get_client = mocker.patch("footing.serve.get_client", autospec=True)
+    mock_get_client.return_value.run.return_value = footing.constants.UP_TO_DATE
+    mock_status = mocker.patch("footing.update.status", autospec=True)
+
+    footing.cli.main()
+
     out, _ = capsys.readouterr()
     assert out == "Footing package is up to date\n"
-    mock_up_to_date.assert_called_once_with(version=version)
+    mock_get_client.return_value.run.assert_called_once_with(
+        "check", path=os.getcwd(), version=None, rendered=True
+    )
+    assert not mock_status.called
+
+
+@pytest.mark.usefixtures("mock_successful_exit")
+def test_ls_w_daemon(capsys, mocker):
+    """Verifies footing ls of a single forge is forwarded to a running footing daemon"""
+    mocker.patch.object(sys, "argv", ["footing", "ls", "user", "t"])
+    mock_get_client = mocker.patch("footing.serve.get_client", autospec=True)
+    mock_get_client.return_value.run.return_value = {"ls": "ls descr"}
+    mock_ls = mocker.patch("footing.ls.ls", autospec=True)
+
+    footing.cli.main()
+
+    out, _ = capsys.readouterr()
+    assert out == "ls\n"
+    mock_get_client.return_value.run.assert_called_once_with(
+        "ls", forge="user", template="t", offline=False
+    )
+    assert not mock_ls.called
+
+
+@pytest.mark.usefixtures("mock_successful_exit")
+@pytest.mark.parametrize(
+    "result, expected_out, expected_err",
+    [
+        (None, "Ignored push that is not to the default branch\n", ""),
+        (
+            footing.webhook.WebhookResult("t", "sha", ["p1", "p2"], renders=3, errors=["v1: x"]),
+            "Precomputed 3 renders of t at sha for 2 projects\n",
+            "Failed to render v1: x\n",
+        ),
+    ],
+)
+def test_webhook(result, expected_out, expected_err, tmp_path, capsys, mocker):
+    """Verifies footing webhook precomputes updates from a payload file"""
+    payload = tmp_path / "payload.json"
+    payload.write_text('{"ref": "refs/heads/main"}')
+    mocker.patch.object(
+        sys, "argv", ["footing", "webhook", str(payload), "-f", "github.com/o", "--offline"]
+    )
+    mock_handle_push = mocker.patch(
+        "footing.webhook.handle_push", autospec=True, return_value=result
+    )
+
+    footing.cli.main()
+
+    out, err = capsys.readouterr()
+    assert (out, err) == (expected_out, expected_err)
+    mock_handle_push.assert_called_once_with(
+        {"ref": "refs/heads/main"}, forge="github.com/o", offline=True
+    )
+
+
+@pytest.mark.parametrize("args", [["-c"], ["-e"], ["-v", "v1"]])
+def test_update_all_w_invalid_args(args, mock_exit, mocker):
+    """Verifies "footing update -a" cannot be combined with other options"""
+    mocker.patch.object(sys, "argv", ["footing", "update", "-a"] + args)
+    mock_update_all = mocker.patch("footing.update.update_all", autospec=True)
+
+    footing.cli.main()
+
+    mock_exit.assert_called_once_with(2)
+    assert not mock_update_all.called
 
 
 @pytest.mark.usefixtures("mock_successful_exit")
@@ -159,3 +288,311 @@ def test_ls(ls_args, expected_out, capsys, mocker):
 
     out, _ = capsys.readouterr()
     assert out == expected_out
+
+
+@pytest.mark.parametrize(
+    "args, manifest_paths, expected_paths, expected_answers",
+    [
+        ([], None, ["./p"], {}),
+        (["dir1", "dir2", "-j", "2"], None, ["dir1/p", "dir2/p"], {}),
+        (["-m", "manifest.txt", "-A", "a=b", "-A", "c=d=e"], ["m"], ["m"], {"a": "b", "c": "d=e"}),
+        (["-m", "manifest.txt", "dir1"], ["m"], ["m", "dir1/p"], {}),
+    ],
+)
+def test_fleet_update(
+    args,
+    manifest_paths,
+    expected_paths,
+    expected_answers,
+    mock_successful_exit,
+    capsys,
+    mocker,
+    tmp_path,
+    monkeypatch,
+):
+    """Verifies footing fleet update collects projects and prints a summary"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "manifest.txt").write_text("m\n")
+    mocker.patch.object(sys, "argv", ["footing", "fleet", "update"] + args)
+    mocker.patch("footing.fleet.read_manifest", autospec=True, return_value=manifest_paths)
+    mocker.patch(
+        "footing.fleet.find_projects",
+        autospec=True,
+        side_effect=lambda directory: [directory + "/p"],
+    )
+    mock_update = mocker.patch(
+        "footing.fleet.update",
+        autospec=True,
+        return_value=[footing.fleet.FleetResult("p", footing.constants.UPDATED)],
+    )
+
+    footing.cli.main()
+
+    mock_update.assert_called_once_with(
+        expected_paths,
+        max_workers=2 if "-j" in args else None,
+        answers=expected_answers,
+    )
+    assert capsys.readouterr().out.startswith("Updated: 1\n")
+
+
+def test_fleet_update_w_failures(mock_exit, mocker):
+    """Verifies footing fleet update raises an error when projects fail to update"""
+    mocker.patch.object(sys, "argv", ["footing", "fleet", "update"])
+    mocker.patch("footing.fleet.find_projects", autospec=True, return_value=["p1", "p2"])
+    mocker.patch(
+        "footing.fleet.update",
+        autospec=True,
+        return_value=[
+            footing.fleet.FleetResult("p1", footing.constants.UPDATED),
+            footing.fleet.FleetResult("p2", footing.constants.FAILED, "error"),
+        ],
+    )
+
+    with pytest.raises(footing.exceptions.FleetUpdateError, match="1 of 2 projects"):
+        footing.cli.main()
+
+
+def test_fleet_update_w_invalid_answer(mock_exit, mocker):
+    """Verifies footing fleet update validates answers"""
+    mocker.patch.object(sys, "argv", ["footing", "fleet", "update", "-A", "invalid"])
+    mock_update = mocker.patch("footing.fleet.update", autospec=True)
+
+    footing.cli.main()
+
+    mock_exit.assert_called_once_with(2)
+    assert not mock_update.called
+
+
+def test_ls_status(mock_successful_exit, capsys, mocker):
+    """Verify ls -s prints a version histogram and the out of date projects"""
+    mocker.patch.object(sys, "argv", ["footing", "ls", "github.com/u", "t", "-s"])
+    mock_status = mocker.patch(
+        "footing.ls.status",
+        autospec=True,
+        return_value=footing.ls.TemplateStatus(
+            template="t",
+            latest_version="v2",
+            versions={"p1": "v2", "p2": "v1", "p3": "v1", "p4": None},
+        ),
+    )
+
+    footing.cli.main()
+
+    mock_status.assert_called_once_with("github.com/u", "t", offline=False)
+    assert capsys.readouterr().out == (
+        "Latest version of t: v2\n"
+        "\n"
+        "Versions:\n"
+        "  v1: 2\n"
+        "  v2 (latest): 1\n"
+        "  unknown: 1\n"
+        "\n"
+        "Out of date:\n"
+        "  p2 (v1)\n"
+        "  p3 (v1)\n"
+    )
+
+
+def test_ls_status_up_to_date(mock_successful_exit, capsys, mocker):
+    """Verify ls -s does not print out of date projects when all are up to date"""
+    mocker.patch.object(sys, "argv", ["footing", "ls", "github.com/u", "t", "-s"])
+    mocker.patch(
+        "footing.ls.status",
+        autospec=True,
+        return_value=footing.ls.TemplateStatus(
+            template="t", latest_version="v2", versions={"p1": "v2"}
+        ),
+    )
+
+    footing.cli.main()
+
+    assert "Out of date" not in capsys.readouterr().out
+
+
+@pytest.mark.usefixtures("mock_successful_exit")
+def test_main_ssh_multiplexing(mocker):
+    """Verify commands share SSH connections between their git calls"""
+    mocker.patch.dict(os.environ)
+    os.environ.pop("GIT_SSH_COMMAND", None)
+    mocker.patch.object(sys, "argv", ["footing", "ls", "user"])
+    ssh_commands = []
+    mocker.patch(
+        "footing.ls.ls",
+        autospec=True,
+        side_effect=lambda *args, **kwargs: ssh_commands.append(os.environ["GIT_SSH_COMMAND"])
+        or {},
+    )
+
+    footing.cli.main()
+
+    assert "ControlMaster=auto" in ssh_commands[0]
+    assert "GIT_SSH_COMMAND" not in os.environ
+
+
+@pytest.mark.usefixtures("mock_successful_exit")
+def test_main_ssh_multiplexing_local_commands(mocker):
+    """Verify commands that do not talk to remotes leave SSH alone"""
+    mocker.patch.dict(os.environ)
+    os.environ.pop("GIT_SSH_COMMAND", None)
+    mocker.patch.object(sys, "argv", ["footing", "ls", "user", "--offline"])
+    mocker.patch("footing.ls.ls", autospec=True, return_value={})
+    mock_ssh_multiplexing = mocker.patch("footing.git.ssh_multiplexing", autospec=True)
+
+    footing.cli.main()
+
+    assert not mock_ssh_multiplexing.called
+
+
+@pytest.mark.usefixtures("mock_successful_exit")
+def test_main_w_trace(tmp_path, mocker):
+    """Verifies "footing --trace" writes the spans of the command"""
+    trace_path = tmp_path / "trace.json"
+    mocker.patch.object(sys, "argv", ["footing", "--trace", str(trace_path), "clean"])
+    mocker.patch("footing.clean.clean", autospec=True)
+
+    footing.cli.main()
+
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    assert [(event["name"], event["cat"]) for event in events if event["ph"] == "X"] == [
+        ("clean", "command")
+    ]
+
+
+@pytest.mark.usefixtures("mock_successful_exit")
+def test_main_w_metrics(tmp_path, mocker):
+    """Verifies "footing --metrics" writes the forge requests of the command"""
+    metrics_path = tmp_path / "metrics.prom"
+    mocker.patch.object(sys, "argv", ["footing", "--metrics", str(metrics_path), "clean"])
+    mocker.patch("footing.clean.clean", autospec=True)
+
+    footing.cli.main()
+
+    assert "# TYPE footing_forge_requests_total counter" in metrics_path.read_text()
+
+
+@pytest.mark.usefixtures("mock_successful_exit")
+def test_ls_many_forges(capsys, mocker):
+    """Verify ls lists several comma separated forges and prints their timing"""
+    mocker.patch.object(sys, "argv", ["footing", "ls", "github.com/a, gitlab.com/g", "t"])
+    listings = [
+        footing.ls.ForgeListing("github.com/a", {"r2": "d2", "r1": "d1"}, 1.234),
+        footing.ls.ForgeListing("gitlab.com/g", {"r1": "d1"}, 0.5),
+    ]
+    mock_ls_many = mocker.patch("footing.ls.ls_many", autospec=True, return_value=listings)
+
+    footing.cli.main()
+
+    mock_ls_many.assert_called_once_with(
+        ["github.com/a", "gitlab.com/g"], template="t", offline=False
+    )
+    out, err = capsys.readouterr()
+    assert out == "r1\nr2\n"
+    assert err == "github.com/a: 2 results in 1.23s\ngitlab.com/g: 1 results in 0.50s\n"
+
+
+def test_ls_status_many_forges(mock_exit, mocker):
+    """Verify ls -s requires a single forge"""
+    mocker.patch.object(sys, "argv", ["footing", "ls", "github.com/a,github.com/b", "t", "-s"])
+    mock_status = mocker.patch("footing.ls.status", autospec=True)
+
+    footing.cli.main()
+
+    mock_exit.assert_called_once_with(2)
+    assert not mock_status.called
+
+
+def test_ls_status_wo_template(mock_exit, mocker):
+    """Verify ls -s requires a template"""
+    mocker.patch.object(sys, "argv", ["footing", "ls", "github.com/u", "-s"])
+    mock_status = mocker.patch("footing.ls.status", autospec=True)
+
+    footing.cli.main()
+
+    mock_exit.assert_called_once_with(2)
+    assert not mock_status.called
+
+
+@pytest.mark.parametrize(
+    "up_to_date, error, expected_exception",
+    [
+        (True, None, None),
+        (False, None, footing.exceptions.NotUpToDateWithTemplateError),
+        (None, "error", footing.exceptions.CheckRunError),
+    ],
+)
+def test_check_all(up_to_date, error, expected_exception, mock_exit, capsys, mocker):
+    """Verify check-all prints results as JSON and fails for out of date projects"""
+    mocker.patch.object(sys, "argv", ["footing", "check-all", "dir"])
+    results = [
+        {"path": "a", "up_to_date": True, "error": None},
+        {"path": "b", "up_to_date": up_to_date, "error": error},
+    ]
+    mock_check_all = mocker.patch("footing.update.check_all", autospec=True, return_value=results)
+
+    if expected_exception:
+        with pytest.raises(expected_exception, match="1 of 2 footing projects"):
+            footing.cli.main()
+    else:
+        footing.cli.main()
+        mock_exit.assert_called_once_with(0)
+
+    mock_check_all.assert_called_once_with("dir")
+    assert json.loads(capsys.readouterr().out) == results
+
+
+@pytest.mark.parametrize("offline", [True, False])
+def test_ls_older_than(offline, mock_successful_exit, capsys, mocker):
+    """Verify ls -o prints the projects on older template versions"""
+    mocker.patch.object(
+        sys,
+        "argv",
+        ["footing", "ls", "github.com/u", "t", "-o", "v2"] + (["--offline"] if offline else []),
+    )
+    mock_older_than = mocker.patch(
+        "footing.ls.older_than", autospec=True, return_value={"p1": "v1"}
+    )
+
+    footing.cli.main()
+
+    mock_older_than.assert_called_once_with("github.com/u", "t", "v2", offline=offline)
+    assert capsys.readouterr().out == "p1 (v1)\n"
+
+
+@pytest.mark.usefixtures("mock_successful_exit")
+@pytest.mark.parametrize("write_output", [True, False])
+def test_bench_template(write_output, tmp_path, capsys, mocker):
+    """Verifies footing bench-template prints the slowest files and writes JSON"""
+    output = tmp_path / "bench.json"
+    output_args = ["-o", str(output)] if write_output else []
+    mocker.patch.object(
+        sys, "argv", ["footing", "bench-template", "t", "-v", "v1", "-n", "2", *output_args]
+    )
+    result = footing.bench.TemplateBenchmark(
+        "t",
+        "sha",
+        {"repo_name": "a"},
+        1.5,
+        [
+            footing.bench.FileTiming("hooks/post_gen_project.py", "hook", 0.5),
+            footing.bench.FileTiming("{{cookiecutter.repo_name}}/a.md", "file", 0.25, 1234),
+            footing.bench.FileTiming("{{cookiecutter.repo_name}}/b.md", "file", 0.125, 5),
+        ],
+    )
+    mock_bench_template = mocker.patch(
+        "footing.bench.bench_template", autospec=True, return_value=result
+    )
+
+    footing.cli.main()
+
+    mock_bench_template.assert_called_once_with(template="t", version="v1")
+    out, err = capsys.readouterr()
+    assert out == (
+        "     500.0 ms            -  hook  hooks/post_gen_project.py\n"
+        "     250.0 ms      1,234 B  file  {{cookiecutter.repo_name}}/a.md\n"
+    )
+    assert err == "Rendered 3 files and hooks of t at sha in 1.50s\n"
+    if write_output:
+        assert json.loads(output.read_text())["files"][0]["kind"] == "hook"
+    else:
+        assert not output.exists()
@@ -0,0 +1,201 @@
+"""Tests for footing.fleet module"""
+
+import concurrent.futures
+import subprocess
+
+import pytest
+
+import footing.constants
+import footing.exceptions
+import footing.fleet
+import footing.git
+import footing.render
+import footing.update
+import footing.utils
+
+
+def test_find_projects(tmpdir):
+    """Tests footing.fleet.find_projects only returns directories with footing.yaml"""
+    tmpdir.mkdir("b").join("footing.yaml").write("")
+    tmpdir.mkdir("a").join("footing.yaml").write("")
+    tmpdir.mkdir("c")
+    tmpdir.join("footing.yaml").write("")
+
+    assert footing.fleet.find_projects(str(tmpdir)) == [str(tmpdir / "a"), str(tmpdir / "b")]
+
+
+def test_read_manifest(tmpdir):
+    """Tests footing.fleet.read_manifest"""
+    manifest = tmpdir.join("manifest.txt")
+    manifest.write("# Projects\nrepo1\n\n  /abs/repo2  \n")
+
+    assert footing.fleet.read_manifest(str(manifest)) == [str(tmpdir / "repo1"), "/abs/repo2"]
+
+
+@pytest.mark.parametrize(
+    "updated, conflicts, exc, expected_result",
+    [
+        (False, "", None, footing.fleet.FleetResult("p", footing.constants.UP_TO_DATE)),
+        (True, "", None, footing.fleet.FleetResult("p", footing.constants.UPDATED)),
+        (True, "footing.yaml", None, footing.fleet.FleetResult("p", footing.constants.UPDATED)),
+        (
+            True,
+            "a.py\nfooting.yaml\nb.py",
+            None,
+            footing.fleet.FleetResult("p", footing.constants.CONFLICTED, "a.py, b.py"),
+        ),
+        (
+            False,
+            "",
+            footing.exceptions.InDirtyRepoError("dirty"),
+            footing.fleet.FleetResult("p", footing.constants.FAILED, "dirty"),
+        ),
+        (
+            False,
+            "",
+            subprocess.CalledProcessError(returncode=1, cmd="git"),
+            footing.fleet.FleetResult(
+                "p", footing.constants.FAILED, "Command 'git' returned non-zero exit status 1."
+            ),
+        ),
+        (
+            False,
+            "",
+            KeyError(),
+            footing.fleet.FleetResult("p", footing.constants.FAILED, "KeyError"),
+        ),
+    ],
+)
+def test_update_project(updated, conflicts, exc, expected_result, mocker, tmpdir):
+    """Tests footing.fleet._update_project"""
+    tmpdir.mkdir("p")
+    mock_update = mocker.patch(
+        "footing.update.update", autospec=True, return_value=updated, side_effect=exc
+    )
+    mocker.patch("footing.git.runner.output", autospec=True, return_value=conflicts)
+
+    with footing.utils.cd(str(tmpdir)):
+        assert footing.fleet._update_project("p", "v2", {"a": "b"}) == expected_result
+
+    mock_update.assert_called_once_with(new_version="v2", answers={"a": "b"})
+
+
+def test_update(mocker):
+    """Tests footing.fleet.update shares template lookups between projects"""
+    configs = {
+        "p1": {"_template": "t1", "_version": "v1"},
+        "p2": {"_template": "t1", "_version": "v0"},
+        "p3": {"_template": "t2", "_version": "v1"},
+        "p5": {"_version": "v1"},
+        "p6": {"_template": "t1", "_version": "v1"},
+    }
+
+    def read_footing_config(path):
+        if path not in configs:
+            raise FileNotFoundError("No footing.yaml")
+        return configs[path]
+
+    def get_latest_template_version(template):
+        if template == "t2":
+            raise footing.exceptions.InvalidEnvironmentError("No token")
+        return "v2"
+
+    mocker.patch(
+        "footing.utils.read_footing_config", autospec=True, side_effect=read_footing_config
+    )
+    mock_from_path = mocker.patch("footing.forge.from_path", autospec=True)
+    mock_from_path.return_value.get_latest_template_version.side_effect = (
+        get_latest_template_version
+    )
+    mock_cache = mocker.patch("footing.render.TemplateCache", autospec=True).return_value
+    mocker.patch(
+        "concurrent.futures.ProcessPoolExecutor",
+        side_effect=lambda max_workers: concurrent.futures.ThreadPoolExecutor(max_workers),
+    )
+
+    def update_project(path, new_version, answers):
+        if path == "p6":
+            raise concurrent.futures.process.BrokenProcessPool("A worker died")
+        return footing.fleet.FleetResult(path, footing.constants.UPDATED)
+
+    mock_update_project = mocker.patch(
+        "footing.fleet._update_project", autospec=True, side_effect=update_project
+    )
+
+    results = footing.fleet.update(["p1", "p2", "p3", "p4", "p5", "p6"], max_workers=2)
+
+    assert results == [
+        footing.fleet.FleetResult("p1", footing.constants.UPDATED),
+        footing.fleet.FleetResult("p2", footing.constants.UPDATED),
+        footing.fleet.FleetResult("p3", footing.constants.FAILED, "No token"),
+        footing.fleet.FleetResult("p4", footing.constants.FAILED, "No footing.yaml"),
+        footing.fleet.FleetResult(
+            "p5",
+            footing.constants.FAILED,
+            'p5/footing.yaml has no "_template" or "_version"',
+        ),
+        footing.fleet.FleetResult("p6", footing.constants.FAILED, "A worker died"),
+    ]
+    assert mock_from_path.return_value.get_latest_template_version.call_count == 2
+    assert mock_cache.resolve.call_args_list == [
+        mocker.call("t1", "v0"),
+        mocker.call("t1", "v1"),
+        mocker.call("t1", "v2"),
+    ]
+    assert sorted(mock_update_project.call_args_list) == [
+        mocker.call("p1", "v2", {}),
+        mocker.call("p2", "v2", {}),
+        mocker.call("p6", "v2", {}),
+    ]
+
+
+def test_update_w_local_template(local_template, tmp_path, mocker):
+    """Tests footing.fleet.update with worker processes and a local template"""
+    template, (v1, v2) = local_template
+    cache = footing.render.TemplateCache()
+    paths = []
+    for name in ("a", "b"):
+        path = tmp_path / "fleet" / name
+        runner = footing.git.GitRunner(cwd=str(path))
+        footing.update._apply_template(
+            template, str(path), checkout=v1, extra_context={"repo_name": name}, cache=cache
+        )
+        footing.utils.write_footing_config({"repo_name": name}, template, v1, path=str(path))
+        if name == "a":
+            (path / "README.md").write_text("a local change\n")
+        runner.run("init", "-q")
+        runner.run("add", ".")
+        runner.run(
+            "-c", "user.name=footing", "-c", "user.email=footing@example.com", "commit", "-qm", "1"
+        )
+        paths.append(str(path))
+    mock_from_path = mocker.patch("footing.forge.from_path", autospec=True)
+    mock_from_path.return_value.get_latest_template_version.return_value = v2
+    # Worker processes are forked and also use the mocked forge
+    mock_from_path.return_value.get_changed_files.return_value = None
+
+    results = footing.fleet.update(paths + [str(tmp_path / "missing")], max_workers=2)
+
+    assert [(result.status, result.message) for result in results] == [
+        (footing.constants.CONFLICTED, "README.md"),
+        (footing.constants.UPDATED, ""),
+        (footing.constants.FAILED, mocker.ANY),
+    ]
+    assert (tmp_path / "fleet" / "b" / "README.md").read_text() == "b v2\n"
+    assert footing.utils.read_footing_config(paths[1])["_version"] == v2
+
+
+def test_summarize():
+    """Tests footing.fleet.summarize"""
+    results = [
+        footing.fleet.FleetResult("p1", footing.constants.UPDATED),
+        footing.fleet.FleetResult("p2", footing.constants.UP_TO_DATE),
+        footing.fleet.FleetResult("p3", footing.constants.CONFLICTED, "a.py"),
+        footing.fleet.FleetResult("p4", footing.constants.FAILED, "error"),
+        footing.fleet.FleetResult("p5", footing.constants.UPDATED),
+    ]
+
+    assert footing.fleet.summarize(results) == (
+        "Updated: 2\nUp to date: 1\nConflicted: 1\nFailed: 1\n"
+        "p3 (conflicted) - a.py\np4 (failed) - error"
+    )
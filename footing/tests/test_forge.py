@@ -1,16 +1,22 @@
 """Tests for footing.ls module"""
 
+import asyncio
 import os
+import signal
 import subprocess
+import threading
+import time
 import urllib
 
 import pytest
 import requests
 from requests import codes as http_codes
+from responses import matchers as responses_matchers
 
 import footing.constants
 import footing.exceptions
 import footing.forge
+import footing.trace
 
 
 @pytest.mark.parametrize(
@@ -30,6 +36,91 @@ def test_gitlab_get_client(gitlab_api_token, mocker):
     assert footing.forge.Gitlab().get_client("https://gitlab.com")
 
 
+def test_gitlab_ls(mocker):
+    """Tests footing.forge.Gitlab.ls runs the blocking Gitlab listing in the shared pool"""
+    mock_ls = mocker.patch.object(
+        footing.forge.Gitlab, "_ls", autospec=True, return_value={"repo": "description"}
+    )
+
+    assert footing.forge.Gitlab().ls("gitlab.com/g", "t") == {"repo": "description"}
+    mock_ls.assert_called_once_with(mocker.ANY, "gitlab.com/g", "t")
+
+
+def test_get_domain_offline(responses):
+    """Tests footing.forge._get_domain never downloads the public suffix list"""
+    footing.forge._get_tld_extractor.cache_clear()
+    footing.forge._get_domain.cache_clear()
+
+    assert footing.forge._get_domain("gitlab.com") == "gitlab"
+    assert footing.forge._get_domain("gitlab.example.co.uk") == "example"
+    assert footing.forge._get_domain("gitlab.com") == "gitlab"
+
+    assert not responses.calls
+    assert footing.forge._get_tld_extractor.cache_info().currsize == 1
+    assert footing.forge._get_domain.cache_info().hits == 1
+
+
+def test_shared_pools():
+    """Tests the connection and thread pools are shared until a process is forked"""
+    session = footing.forge.get_session()
+    executor = footing.forge.get_executor()
+    assert footing.forge.get_session() is session
+    assert footing.forge.get_executor() is executor
+
+    footing.forge._reset_shared()
+
+    assert footing.forge.get_session() is not session
+    assert footing.forge.get_executor() is not executor
+
+
+def test_get_footing_configs_async(mocker):
+    """Tests footing.forge.Forge.get_footing_configs_async bounds concurrent calls"""
+    lock = threading.Lock()
+    running = []
+    max_running = []
+
+    def get_footing_config(self, project):
+        with lock:
+            running.append(project)
+            max_running.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(project)
+        return {"_template": project}
+
+    mocker.patch.object(
+        footing.forge.Github,
+        "get_footing_config",
+        autospec=True,
+        side_effect=get_footing_config,
+    )
+    projects = ["p{}".format(i) for i in range(8)]
+
+    configs = asyncio.run(
+        footing.forge.Github(max_concurrency=2).get_footing_configs_async(projects)
+    )
+
+    assert configs == {project: {"_template": project} for project in projects}
+    assert max(max_running) == 2
+
+
+def test_get_latest_template_versions_async(mocker):
+    """Tests footing.forge.Forge.get_latest_template_versions_async"""
+    mocker.patch(
+        "footing.forge._get_latest_template_version_w_ssh",
+        autospec=True,
+        side_effect=lambda template, timeout: template + "-sha",
+    )
+
+    async def get_versions(client):
+        # Forges can be shared by several event loops
+        return await client.get_latest_template_versions_async(["t1", "t2"])
+
+    client = footing.forge.Github()
+    assert asyncio.run(get_versions(client)) == {"t1": "t1-sha", "t2": "t2-sha"}
+    assert asyncio.run(get_versions(client)) == {"t1": "t1-sha", "t2": "t2-sha"}
+
+
 def test_gitlab_get_gitlab_url_and_repo_path():
     """Tests footing.forge.Gitlab._get_gitlab_url_and_repo_path"""
     assert footing.forge.Gitlab()._get_gitlab_url_and_repo_path(
@@ -43,6 +134,8 @@ def test_gitlab_get_gitlab_url_and_repo_path():
         ("gitlab.com/my/group", ("https://gitlab.com", "my/group")),
         ("gitlab.com/my/group/", ("https://gitlab.com", "my/group")),
         ("http://gitlab.com/my/group", ("http://gitlab.com", "my/group")),
+        ("gitlab.example.co.uk", ("https://gitlab.example.co.uk", "")),
+        ("https://GitLab.com:8443/group", ("https://GitLab.com:8443", "group")),
         pytest.param(
             "gitlab.com",
             None,
@@ -76,11 +169,69 @@ def test_github_get_latest_template_version_api(http_status, mocker, responses):
     assert latest == "v1"
 
 
+@pytest.mark.parametrize(
+    "files, expected_changed_files",
+    [
+        ([], []),
+        ([{"filename": "a.txt"}], ["a.txt"]),
+        (
+            [{"filename": "b.txt", "previous_filename": "a.txt"}, {"filename": "c.txt"}],
+            ["b.txt", "a.txt", "c.txt"],
+        ),
+        ([{"filename": "a.txt"}] * footing.constants.GITHUB_COMPARE_MAX_FILES, None),
+    ],
+)
+def test_github_get_changed_files(files, expected_changed_files, responses):
+    """Tests footing.forge.Github.get_changed_files"""
+    api = "https://api.github.com/repos/owner/template/compare/v1...v2"
+    responses.add(responses.GET, api, json={"files": files})
+
+    changed_files = footing.forge.Github().get_changed_files(
+        "git@github.com:owner/template.git", "v1", "v2"
+    )
+    assert changed_files == expected_changed_files
+
+
+@pytest.mark.parametrize("status", [http_codes.not_found, None])
+def test_github_get_changed_files_error(status, responses, mocker):
+    """Tests footing.forge.Github.get_changed_files when the API cannot be used"""
+    if status:
+        api = "https://api.github.com/repos/owner/template/compare/v1...v2"
+        responses.add(responses.GET, api, json={}, status=status)
+    else:
+        mocker.patch.dict(os.environ, clear=True)
+
+    changed_files = footing.forge.Github().get_changed_files(
+        "git@github.com:owner/template.git", "v1", "v2"
+    )
+    assert changed_files is None
+
+
+@pytest.mark.parametrize(
+    "status, body, expected_config",
+    [
+        (http_codes.ok, "_template: t\n_version: v\n", {"_template": "t", "_version": "v"}),
+        (http_codes.ok, "", None),
+        (http_codes.ok, "- not a mapping\n", None),
+        (http_codes.ok, "invalid: [yaml", None),
+        (http_codes.not_found, "", None),
+        (http_codes.internal_server_error, "", None),
+    ],
+)
+def test_github_get_footing_config(status, body, expected_config, responses):
+    """Tests footing.forge.Github.get_footing_config"""
+    api = "https://api.github.com/repos/owner/project/contents/footing.yaml"
+    responses.add(responses.GET, api, body=body, status=status)
+
+    footing_config = footing.forge.Github().get_footing_config("git@github.com:owner/project.git")
+    assert footing_config == expected_config
+
+
 @pytest.mark.parametrize(
     "stdout, stderr, expected",
     [
-        (b"version\n", b"", "version"),
-        (b"version\n", b"stderr_can_be_there_w_stdout", "version"),
+        (b"version\tHEAD\n", b"", "version"),
+        (b"version\tHEAD\n", b"stderr_can_be_there_w_stdout", "version"),
         pytest.param(
             b"\n",
             b"stderr_w_no_stdout_is_an_error",
@@ -92,11 +243,16 @@ def test_github_get_latest_template_version_api(http_status, mocker, responses):
 def test_get_latest_template_version_w_ssh(mocker, stdout, stderr, expected):
     """Tests footing.forge._get_latest_template_version_w_ssh"""
     ls_remote_return = subprocess.CompletedProcess([], returncode=0, stdout=stdout, stderr=stderr)
-    mock_shell = mocker.patch("footing.utils.shell", autospec=True, return_value=ls_remote_return)
+    mock_run = mocker.patch(
+        "footing.git.runner.run_async", autospec=True, return_value=ls_remote_return
+    )
 
-    assert footing.forge._get_latest_template_version_w_ssh("t") == expected
-    cmd = "git ls-remote t | grep HEAD | cut -f1"
-    mock_shell.assert_called_once_with(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    assert asyncio.run(footing.forge._get_latest_template_version_w_ssh("t", timeout=5)) == (
+        expected
+    )
+    mock_run.assert_called_once_with(
+        "ls-remote", "t", "HEAD", stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=5
+    )
 
 
 @pytest.mark.parametrize(
@@ -141,6 +297,152 @@ def test_github_get_latest_template_version(
     assert version == expected
 
 
+def test_cache_latest_versions(mocker):
+    """Tests latest versions are cached only inside of footing.forge.cache_latest_versions"""
+    mock_ssh = mocker.patch(
+        "footing.forge._get_latest_template_version_w_ssh", autospec=True, return_value="v1"
+    )
+    github = footing.forge.Github()
+
+    with footing.forge.cache_latest_versions(60):
+        assert github.get_latest_template_version("t") == "v1"
+        mock_ssh.return_value = "v2"
+        assert github.get_latest_template_version("t") == "v1"
+        assert mock_ssh.call_count == 1
+
+        # Expire the cached version
+        footing.forge._latest_versions["t"] = (time.monotonic() - 1, "v1")
+        assert github.get_latest_template_version("t") == "v2"
+
+    assert not footing.forge._latest_versions
+    assert github.get_latest_template_version("t") == "v2"
+    assert mock_ssh.call_count == 3
+
+
+def test_get_latest_versions():
+    """Tests footing.forge.get_latest_versions skips expired versions"""
+    with footing.forge.cache_latest_versions(60):
+        footing.forge.set_latest_version("t1", "v1")
+        footing.forge._latest_versions["t2"] = (time.monotonic() - 1, "v2")
+
+        assert footing.forge.get_latest_versions() == {"t1": "v1"}
+
+
+@pytest.mark.parametrize(
+    "template, expected_host",
+    [
+        ("git@github.com:user/template.git", "github.com"),
+        ("https://gitlab.com/group/template.git", "gitlab.com"),
+        ("/local/template", ""),
+    ],
+)
+def test_get_host(template, expected_host):
+    """Tests footing.forge._get_host"""
+    assert footing.forge._get_host(template) == expected_host
+
+
+@pytest.mark.parametrize("contents", [None, "invalid", "[]"])
+def test_lookup_winners(contents):
+    """Tests remembering the winning latest version lookup of each host"""
+    if contents is not None:
+        os.makedirs(os.path.dirname(footing.forge._get_lookups_path()), exist_ok=True)
+        with open(footing.forge._get_lookups_path(), "w") as f:
+            f.write(contents)
+    assert footing.forge._read_lookup_winners() == {}
+
+    footing.forge._record_lookup_winner("github.com", "api")
+    footing.forge._record_lookup_winner("github.com", "api")
+    footing.forge._record_lookup_winner("", "ssh")
+
+    assert footing.forge._read_lookup_winners() == {"github.com": "api"}
+
+
+def test_github_get_latest_template_version_hedged(mocker):
+    """Tests footing.forge.Forge.get_latest_template_version takes the first successful lookup"""
+
+    async def slow_ssh(template, timeout):
+        await asyncio.sleep(5)
+        return "ssh-version"
+
+    mock_ssh = mocker.patch(
+        "footing.forge._get_latest_template_version_w_ssh", autospec=True, side_effect=slow_ssh
+    )
+    mock_api = mocker.patch.object(
+        footing.forge.Github,
+        "_get_latest_template_version",
+        autospec=True,
+        return_value="api-version",
+    )
+    template = "git@github.com:u/t.git"
+
+    # A slow SSH lookup is hedged with the API
+    start = time.monotonic()
+    version = footing.forge.Github(hedge_delay=0.01).get_latest_template_version(template)
+
+    assert version == "api-version"
+    assert time.monotonic() - start < 5
+    assert footing.forge._read_lookup_winners() == {"github.com": "api"}
+
+    # The API is tried first on later runs
+    mock_ssh.reset_mock()
+    mock_span = mocker.spy(footing.trace, "span")
+    assert footing.forge.Github(hedge_delay=None).get_latest_template_version(template) == (
+        "api-version"
+    )
+    assert not mock_ssh.called
+    mock_span.assert_called_once_with("latest_version.api", "forge")
+    mock_api.assert_called_with(
+        mocker.ANY, template, timeout=footing.constants.LATEST_VERSION_API_TIMEOUT
+    )
+
+    # SSH wins again when the API fails
+    mock_api.side_effect = requests.exceptions.ConnectionError
+    assert footing.forge.Github(hedge_delay=None).get_latest_template_version(template) == (
+        "ssh-version"
+    )
+    assert footing.forge._read_lookup_winners() == {"github.com": "ssh"}
+
+    # A slow SSH lookup still wins when the hedged API lookup fails
+    async def ssh(template, timeout):
+        await asyncio.sleep(0.2)
+        return "ssh-version"
+
+    mock_ssh.side_effect = ssh
+    assert footing.forge.Github(hedge_delay=0.01).get_latest_template_version(template) == (
+        "ssh-version"
+    )
+
+
+def test_github_get_latest_template_version_kills_hedged_ssh(mocker):
+    """Tests the git process of a hedged SSH lookup is killed when the API wins"""
+    # The SSH command of git hangs instead of connecting
+    mocker.patch.dict(os.environ, {"GIT_SSH_COMMAND": "sleep 30 #"})
+    mocker.patch.object(
+        footing.forge.Github,
+        "_get_latest_template_version",
+        autospec=True,
+        side_effect=lambda self, template, timeout: time.sleep(0.5) or "api-version",
+    )
+    procs = []
+    create_subprocess_exec = asyncio.create_subprocess_exec
+
+    async def create_and_record(*args, **kwargs):
+        proc = await create_subprocess_exec(*args, **kwargs)
+        procs.append(proc)
+        return proc
+
+    mocker.patch("asyncio.create_subprocess_exec", side_effect=create_and_record)
+
+    start = time.monotonic()
+    version = footing.forge.Github(hedge_delay=0.01).get_latest_template_version(
+        "git@github.com:u/t.git"
+    )
+
+    assert version == "api-version"
+    assert time.monotonic() - start < 10
+    assert [proc.returncode for proc in procs] == [-signal.SIGKILL]
+
+
 @pytest.mark.parametrize(
     "root, expected_client_cls",
     [
@@ -158,6 +460,21 @@ def test_from_path(root, expected_client_cls):
     assert client.__class__ == expected_client_cls
 
 
+def test_repo_record():
+    """Tests footing.forge.RepoRecord only keeps the requested fields"""
+    repo = {"full_name": "o/r", "description": "d", "owner": {"login": "o"}, "fork": False}
+
+    record = footing.forge.RepoRecord.from_github(repo, fields=("fork",))
+
+    assert record == footing.forge.RepoRecord("git@github.com:o/r.git", "d", {"fork": False})
+    assert record != footing.forge.RepoRecord("git@github.com:o/r.git", "d")
+    assert record != "git@github.com:o/r.git"
+    assert not hasattr(record, "__dict__")
+    assert repr(record) == (
+        "RepoRecord(url='git@github.com:o/r.git', description='d', fields={'fork': False})"
+    )
+
+
 @pytest.mark.parametrize(
     "headers, expected_links",
     [
@@ -199,11 +516,11 @@ def test_github_code_search_single_page(mocker, responses):
     query = 'user:user {} in:path "template_path" in:file'.format(
         footing.constants.FOOTING_CONFIG_FILE
     )
-    repos = footing.forge.Github()._code_search(query)
+    repos = footing.forge.Github()._code_search(query, max_results=3)
 
     assert repos == {
-        "git@github.com:repo/repo1.git": {"full_name": "repo/repo1"},
-        "git@github.com:repo/repo2.git": {"full_name": "repo/repo2"},
+        "git@github.com:repo/repo1.git": footing.forge.RepoRecord("git@github.com:repo/repo1.git"),
+        "git@github.com:repo/repo2.git": footing.forge.RepoRecord("git@github.com:repo/repo2.git"),
     }
     assert len(responses.calls) == 1
     url = urllib.parse.urlparse(responses.calls[0].request.url)
@@ -214,6 +531,19 @@ def test_github_code_search_single_page(mocker, responses):
     }
 
 
+def test_github_code_search_max_results(responses):
+    """Tests footing.forge.Github._code_search stops when results reach the maximum"""
+    responses.add(
+        responses.GET,
+        "https://api.github.com/search/code",
+        json={"total_count": 5000, "items": [{"repository": {"full_name": "o/r"}}]},
+        headers={"link": '<https://api.github.com/search/code?page=2>; rel="next"'},
+    )
+
+    assert footing.forge.Github()._code_search("query", max_results=1000) is None
+    assert len(responses.calls) == 1
+
+
 def test_github_code_search_multiple_pages(mocker, responses):
     """Tests footing.forge.Github._code_search for a single page of responses"""
     response_content1 = {
@@ -261,14 +591,192 @@ def test_github_code_search_multiple_pages(mocker, responses):
         json=response_content2,
     )
 
-    repos = footing.forge.Github()._code_search("query")
+    repos = footing.forge.Github()._code_search("query", fields=("full_name",))
 
     assert repos == {
-        "git@github.com:repo/repo1.git": {"full_name": "repo/repo1"},
-        "git@github.com:repo/repo2.git": {"full_name": "repo/repo2"},
-        "git@github.com:repo/repo3.git": {"full_name": "repo/repo3"},
-        "git@github.com:repo/repo4.git": {"full_name": "repo/repo4"},
+        "git@github.com:repo/repo{}.git".format(i): footing.forge.RepoRecord(
+            "git@github.com:repo/repo{}.git".format(i),
+            fields={"full_name": "repo/repo{}".format(i)},
+        )
+        for i in range(1, 5)
+    }
+
+
+@pytest.mark.parametrize(
+    "status",
+    [
+        http_codes.ok,
+        pytest.param(
+            http_codes.not_found,
+            marks=pytest.mark.xfail(raises=footing.exceptions.InvalidForgeError),
+        ),
+    ],
+)
+def test_github_get_owner(status, responses):
+    """Tests footing.forge.Github._get_owner"""
+    responses.add(
+        responses.GET, "https://api.github.com/users/org", json={"login": "org"}, status=status
+    )
+
+    assert footing.forge.Github()._get_owner("org", forge="github.com/org") == {"login": "org"}
+
+
+@pytest.mark.parametrize(
+    "owner_type, expected_api, expected_type, num_pages",
+    [
+        ("Organization", "https://api.github.com/orgs/o/repos", "all", 3),
+        ("User", "https://api.github.com/users/o/repos", "owner", 1),
+    ],
+)
+def test_github_list_repos(owner_type, expected_api, expected_type, num_pages, responses):
+    """Tests footing.forge.Github._list_repos fetches all pages"""
+    for page in range(1, num_pages + 1):
+        headers = (
+            {
+                "link": '<{}?page=2>; rel="next", <{}?page={}>; rel="last"'.format(
+                    expected_api, expected_api, num_pages
+                )
+            }
+            if page == 1 and num_pages > 1
+            else {}
+        )
+        responses.add(
+            responses.GET,
+            expected_api,
+            json=[{"full_name": "o/repo{}".format(page)}],
+            adding_headers=headers,
+            match=[
+                responses_matchers.query_param_matcher(
+                    {"type": expected_type, "per_page": "100", "page": str(page)}
+                )
+            ],
+        )
+
+    repos = asyncio.run(footing.forge.Github()._list_repos({"type": owner_type, "login": "o"}))
+
+    assert repos == [
+        footing.forge.RepoRecord("git@github.com:o/repo{}.git".format(page))
+        for page in range(1, num_pages + 1)
+    ]
+
+
+@pytest.mark.parametrize(
+    "since, expected_pushed",
+    [
+        (
+            None,
+            {
+                "git@github.com:o/a.git": "2024-03-01T00:00:00Z",
+                "git@github.com:o/b.git": "2024-02-01T00:00:00Z",
+                "git@github.com:o/c.git": "2024-01-01T00:00:00Z",
+            },
+        ),
+        (
+            "2024-01-15T00:00:00Z",
+            {
+                "git@github.com:o/a.git": "2024-03-01T00:00:00Z",
+                "git@github.com:o/b.git": "2024-02-01T00:00:00Z",
+            },
+        ),
+    ],
+)
+def test_github_get_pushed_since(since, expected_pushed, mocker, responses):
+    """Tests footing.forge.Github.get_pushed_since stops at repositories pushed before since"""
+    mocker.patch.object(
+        footing.forge.Github,
+        "_get_owner",
+        autospec=True,
+        return_value={"type": "Organization", "login": "o"},
+    )
+    api = "https://api.github.com/orgs/o/repos"
+    pages = [
+        [
+            {"full_name": "o/a", "pushed_at": "2024-03-01T00:00:00Z"},
+            {"full_name": "o/b", "pushed_at": "2024-02-01T00:00:00Z"},
+        ],
+        [{"full_name": "o/c", "pushed_at": "2024-01-01T00:00:00Z"}],
+    ]
+    for page, repos in enumerate(pages, 1):
+        responses.add(
+            responses.GET,
+            api,
+            json=repos,
+            adding_headers={"link": '<{}?page=2>; rel="next"'.format(api)} if page == 1 else {},
+            match=[
+                responses_matchers.query_param_matcher(
+                    {
+                        "type": "all",
+                        "per_page": "100",
+                        "sort": "pushed",
+                        "direction": "desc",
+                        "page": str(page),
+                    }
+                )
+            ],
+        )
+
+    assert footing.forge.Github().get_pushed_since("github.com/o/", since) == expected_pushed
+
+
+@pytest.mark.parametrize(
+    "status, expected_has_file",
+    [
+        (http_codes.ok, True),
+        (http_codes.not_found, False),
+        pytest.param(
+            http_codes.internal_server_error,
+            None,
+            marks=pytest.mark.xfail(raises=requests.exceptions.HTTPError),
+        ),
+    ],
+)
+def test_github_has_file(status, expected_has_file, responses):
+    """Tests footing.forge.Github._has_file"""
+    api = "https://api.github.com/repos/o/repo/contents/cookiecutter.json"
+    responses.add(responses.GET, api, json={}, status=status)
+
+    assert footing.forge.Github()._has_file("o/repo", "cookiecutter.json") == expected_has_file
+
+
+@pytest.mark.parametrize(
+    "template, expected_repos",
+    [
+        (None, ["git@github.com:o/a.git", "git@github.com:o/b.git"]),
+        ("git@github.com:o/t.git", ["git@github.com:o/a.git"]),
+    ],
+)
+def test_github_ls_repos(template, expected_repos, mocker):
+    """Tests footing.forge.Github._ls_repos"""
+    repos = [
+        footing.forge.RepoRecord.from_github(
+            {"full_name": full_name, "fork": fork}, fields=("full_name", "fork")
+        )
+        for full_name, fork in [("o/a", False), ("o/b", False), ("o/c", False), ("o/d", True)]
+    ]
+    mocker.patch.object(footing.forge.Github, "_list_repos", autospec=True, return_value=repos)
+    mocker.patch.object(
+        footing.forge.Github,
+        "_has_file",
+        autospec=True,
+        side_effect=lambda self, repo_path, file_path: repo_path != "o/c",
+    )
+    footing_configs = {
+        "git@github.com:o/a.git": {"_template": "git@github.com:o/t.git"},
+        "git@github.com:o/b.git": {"_template": "git@github.com:o/other.git"},
+        "git@github.com:o/c.git": None,
     }
+    mocker.patch.object(
+        footing.forge.Github,
+        "get_footing_config",
+        autospec=True,
+        side_effect=lambda self, project: footing_configs[project],
+    )
+
+    results = asyncio.run(
+        footing.forge.Github()._ls_repos({"type": "Organization", "login": "o"}, template)
+    )
+
+    assert list(results) == expected_repos
 
 
 @pytest.mark.parametrize(
@@ -0,0 +1,147 @@
+"""Tests for footing.git module"""
+
+import asyncio
+import os
+import subprocess
+
+import pytest
+
+import footing.git
+
+
+def test_git_runner_run(mocker):
+    """Tests footing.git.GitRunner.run executes argument lists without a shell"""
+    mock_shell = mocker.patch(
+        "footing.utils.shell",
+        autospec=True,
+        return_value=subprocess.CompletedProcess([], returncode=0),
+    )
+    runner = footing.git.GitRunner(cwd="repo")
+
+    runner.run("checkout", "-b", "branch name", stderr=subprocess.DEVNULL)
+
+    mock_shell.assert_called_once_with(
+        ["git", "checkout", "-b", "branch name"],
+        check=True,
+        stdin=None,
+        stdout=None,
+        stderr=subprocess.DEVNULL,
+        cwd="repo",
+        timeout=None,
+    )
+    assert len(runner.spawns) == 1
+    assert runner.spawns[0].argv == ("git", "checkout", "-b", "branch name")
+    assert runner.spawns[0].returncode == 0
+
+
+def test_git_runner_run_failure(mocker):
+    """Tests footing.git.GitRunner.run records failed processes"""
+    mocker.patch(
+        "footing.utils.shell",
+        autospec=True,
+        side_effect=subprocess.CalledProcessError(returncode=128, cmd="cmd"),
+    )
+    runner = footing.git.GitRunner()
+
+    with pytest.raises(subprocess.CalledProcessError):
+        runner.run("status")
+
+    assert runner.stats() == {"count": 1, "failed": 1, "duration": mocker.ANY}
+
+
+def test_git_runner_run_async(tmp_path):
+    """Tests footing.git.GitRunner.run_async records successful and failed processes"""
+    runner = footing.git.GitRunner(cwd=str(tmp_path))
+
+    ret = asyncio.run(runner.run_async("version", stdout=subprocess.PIPE))
+    assert ret.stdout.startswith(b"git version")
+    with pytest.raises(subprocess.CalledProcessError):
+        asyncio.run(runner.run_async("rev-parse", "--verify", "HEAD", stderr=subprocess.DEVNULL))
+
+    assert [(spawn.argv[1], spawn.returncode) for spawn in runner.spawns] == [
+        ("version", 0),
+        ("rev-parse", 128),
+    ]
+
+
+def test_git_runner_output(tmpdir):
+    """Tests footing.git.GitRunner.output against a real repository"""
+    runner = footing.git.GitRunner(cwd=str(tmpdir))
+    runner.run("init", "-q")
+
+    assert runner.output("rev-parse", "--is-inside-work-tree") == "true"
+    assert runner.stats()["count"] == 2
+
+
+def test_git_runner_run_many(mocker):
+    """Tests footing.git.GitRunner.run_many preserves the order of commands"""
+
+    def shell_side_effect(argv, **kwargs):
+        return subprocess.CompletedProcess(argv, returncode=0, stdout=argv[-1])
+
+    mocker.patch("footing.utils.shell", autospec=True, side_effect=shell_side_effect)
+    runner = footing.git.GitRunner()
+
+    rets = runner.run_many([("rev-parse", str(i)) for i in range(5)], check=False)
+
+    assert [ret.stdout for ret in rets] == ["0", "1", "2", "3", "4"]
+    assert runner.stats()["count"] == 5
+
+    runner.reset()
+    assert runner.stats() == {"count": 0, "failed": 0, "duration": 0}
+
+
+@pytest.mark.parametrize(
+    "configured_ssh_command, expected_ssh_command",
+    [(b"", "ssh"), (b"ssh -i ~/.ssh/deploy -J bastion\n", "ssh -i ~/.ssh/deploy -J bastion")],
+)
+def test_ssh_multiplexing(configured_ssh_command, expected_ssh_command, mocker):
+    """Tests footing.git.ssh_multiplexing shares and then closes SSH connections"""
+    mocker.patch.dict(os.environ)
+    os.environ.pop("GIT_SSH_COMMAND", None)
+    os.environ.pop("GIT_SSH", None)
+    mock_shell = mocker.patch(
+        "footing.utils.shell",
+        autospec=True,
+        side_effect=lambda argv, **kwargs: subprocess.CompletedProcess(
+            argv, returncode=0 if configured_ssh_command else 1, stdout=configured_ssh_command
+        ),
+    )
+
+    with footing.git.ssh_multiplexing():
+        ssh_command = os.environ["GIT_SSH_COMMAND"]
+        control_dir = ssh_command.split("ControlPath=")[1].split("/%C")[0]
+        # The options are added to the SSH command of core.sshCommand
+        assert ssh_command.startswith(expected_ssh_command + " -o ControlMaster=auto ")
+        # An outer context is never overridden
+        with footing.git.ssh_multiplexing():
+            assert os.environ["GIT_SSH_COMMAND"] == ssh_command
+        # Simulate a master connection started by ssh
+        open(os.path.join(control_dir, "socket"), "w").close()
+
+    assert "GIT_SSH_COMMAND" not in os.environ
+    assert not os.path.exists(control_dir)
+    assert mock_shell.call_args_list == [
+        mocker.call(
+            ["git", "config", "--get", "core.sshCommand"],
+            check=False,
+            stdin=None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=None,
+            timeout=None,
+        ),
+        mocker.call(
+            [
+                "ssh",
+                "-o",
+                "ControlPath={}".format(os.path.join(control_dir, "socket")),
+                "-O",
+                "exit",
+                "footing",
+            ],
+            check=False,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        ),
+    ]
@@ -0,0 +1,44 @@
+"""Tests for footing.index module"""
+
+import os
+
+import footing.index
+
+
+def test_index(footing_env):
+    """Tests footing.index.Index records listings and template versions"""
+    index = footing.index.Index()
+    assert index.path == os.path.join(footing_env["FOOTING_CACHE_DIR"], "index.sqlite3")
+
+    assert index.get_synced_at("github.com/u") is None
+    index.record_ls("github.com/u/", None, {"t1": "template 1"}, synced_at="2024-01-01T00:00:00Z")
+    index.record_ls("github.com/u", "t1", {"p1": "project 1", "p2": "project 2"})
+    index.record_ls("github.com/u", "t1", {"p2": "project 2 updated", "p3": "project 3"})
+
+    assert index.get_synced_at("github.com/u") == "2024-01-01T00:00:00Z"
+    assert index.ls("github.com/u") == {"t1": "template 1"}
+    assert index.ls("github.com/u", "t1") == {"p2": "project 2 updated", "p3": "project 3"}
+
+    index.record_configs(
+        {"p2": {"_template": "t1", "_version": "v1"}, "p3": None},
+        read_at="2024-01-02T00:00:00Z",
+    )
+    assert index.get_versions("github.com/u", "t1") == {"p2": "v1", "p3": None}
+
+    assert index.get_pushed_synced_at("github.com/u") is None
+    index.record_pushed_at(
+        "github.com/u",
+        {"p2": "2024-01-01T12:00:00Z", "p3": "2024-01-03T00:00:00Z"},
+        synced_at="2024-01-04T00:00:00Z",
+    )
+    assert index.get_pushed_synced_at("github.com/u/") == "2024-01-04T00:00:00Z"
+    assert index.get_stale_configs(["p1", "p2", "p3"]) == ["p1", "p3"]
+
+    assert index.get_latest_version("t1") is None
+    index.record_latest_version("t1", "v2")
+    assert footing.index.Index().get_latest_version("t1") == "v2"
+
+
+def test_now():
+    """Tests footing.index.now uses the time format of forges"""
+    assert len(footing.index.now()) == len("2024-01-01T00:00:00Z")
@@ -2,8 +2,10 @@ import collections
 
 import pytest
 
+import footing.exceptions
 import footing.forge
 import footing.ls
+import footing.render
 
 
 @pytest.mark.parametrize(
@@ -19,22 +21,222 @@ import footing.ls
     ],
 )
 def test_ls(forge, template, github_query, mocker):
+    mock_get_owner = mocker.patch.object(footing.forge.Github, "_get_owner", autospec=True)
     mock_code_search = mocker.patch.object(
         footing.forge.Github,
         "_code_search",
         autospec=True,
         return_value={
-            "repo2": {"description": "description 2"},
-            "repo1": {"description": "description 1"},
+            "repo2": footing.forge.RepoRecord("repo2", "description 2"),
+            "repo1": footing.forge.RepoRecord("repo1", "description 1"),
         },
     )
 
     results = footing.ls.ls(forge, template=template)
 
-    mock_code_search.assert_called_once_with(mocker.ANY, github_query, forge=forge)
+    mock_code_search.assert_called_once_with(
+        mocker.ANY, github_query, forge=forge, max_results=1000
+    )
+    assert not mock_get_owner.called
     assert results == collections.OrderedDict(
         [
             ("repo1", "description 1"),
             ("repo2", "description 2"),
         ]
     )
+
+
+@pytest.mark.parametrize("template", [None, "git@github.com:u/t.git"])
+def test_ls_large_org(template, mocker):
+    """Tests footing.ls.ls checks every repository when code search reaches its cap"""
+    owner = {"login": "u", "type": "Organization"}
+    mock_get_owner = mocker.patch.object(
+        footing.forge.Github, "_get_owner", autospec=True, return_value=owner
+    )
+    mock_code_search = mocker.patch.object(
+        footing.forge.Github, "_code_search", autospec=True, return_value=None
+    )
+    mock_ls_repos = mocker.patch.object(
+        footing.forge.Github,
+        "_ls_repos",
+        autospec=True,
+        return_value={"repo1": footing.forge.RepoRecord("repo1")},
+    )
+
+    results = footing.ls.ls("github.com/u", template=template)
+
+    mock_ls_repos.assert_called_once_with(mocker.ANY, owner, template)
+    mock_get_owner.assert_called_once_with(mocker.ANY, "u", forge="github.com/u")
+    assert mock_code_search.call_args[1]["max_results"] == 1000
+    assert results == collections.OrderedDict([("repo1", "(no description found)")])
+
+
+def test_ls_offline(mocker):
+    """Tests footing.ls.ls serves offline results from the index"""
+    mocker.patch.object(
+        footing.forge.Github,
+        "ls",
+        autospec=True,
+        return_value={"repo1": "description 1"},
+    )
+
+    with pytest.raises(footing.exceptions.NotIndexedError):
+        footing.ls.ls("github.com/u", offline=True)
+
+    footing.ls.ls("github.com/u/")
+
+    assert footing.ls.ls("github.com/u", offline=True) == {"repo1": "description 1"}
+
+
+def test_ls_many(mocker):
+    """Tests footing.ls.ls_many lists Github and Gitlab forges and records each one"""
+    mock_github_ls = mocker.patch.object(
+        footing.forge.Github,
+        "ls_async",
+        autospec=True,
+        side_effect=lambda self, forge, template: {
+            "git@github.com:{}/t.git".format(forge.split("/")[1]): forge,
+            "git@github.com:shared/t.git": forge,
+        },
+    )
+    mock_gitlab_ls = mocker.patch.object(
+        footing.forge.Gitlab,
+        "ls_async",
+        autospec=True,
+        return_value={"git@gitlab.com:g/t.git": "gitlab"},
+    )
+    forges = ["github.com/a", "gitlab.com/g", "github.com/b", "github.com/a"]
+
+    listings = footing.ls.ls_many(forges, template="t")
+
+    assert [listing.forge for listing in listings] == [
+        "github.com/a",
+        "gitlab.com/g",
+        "github.com/b",
+    ]
+    assert all(listing.seconds >= 0 for listing in listings)
+    assert mock_github_ls.call_count == 2
+    mock_gitlab_ls.assert_called_once_with(mocker.ANY, "gitlab.com/g", "t")
+    assert footing.ls.merge(listings) == collections.OrderedDict(
+        [
+            ("git@github.com:a/t.git", "github.com/a"),
+            ("git@github.com:b/t.git", "github.com/b"),
+            ("git@github.com:shared/t.git", "github.com/a"),
+            ("git@gitlab.com:g/t.git", "gitlab"),
+        ]
+    )
+
+    offline_listings = footing.ls.ls_many(forges, template="t", offline=True)
+    assert list(footing.ls.merge(offline_listings)) == list(footing.ls.merge(listings))
+    assert mock_github_ls.call_count == 2
+
+
+def test_status(mocker):
+    """Tests footing.ls.status only reads projects pushed since the last sync"""
+    template = "git@github.com:u/t.git"
+    mock_ls = mocker.patch.object(
+        footing.forge.Github,
+        "ls",
+        autospec=True,
+        return_value={"p1": "", "p2": "", "p3": "", "p4": "", "p5": ""},
+    )
+    mock_get_latest_version = mocker.patch.object(
+        footing.forge.Github,
+        "get_latest_template_version_async",
+        autospec=True,
+        return_value="v2",
+    )
+    mock_get_pushed_since = mocker.patch.object(
+        footing.forge.Github,
+        "get_pushed_since",
+        autospec=True,
+        return_value={"p1": "2020-01-01T00:00:00Z"},
+    )
+    footing_configs = {
+        "p1": {"_template": template, "_version": "v2"},
+        "p2": {"_template": template, "_version": "v1"},
+        "p3": {"_template": template, "_version": "v1"},
+        "p4": {"_template": "git@github.com:u/other.git", "_version": "v1"},
+        "p5": None,
+        "p6": {"_template": template, "_version": "v1"},
+        "p7": {"_template": "git@github.com:u/other.git", "_version": "v1"},
+    }
+    mock_get_footing_config = mocker.patch.object(
+        footing.forge.Github,
+        "get_footing_config",
+        autospec=True,
+        side_effect=lambda self, project: footing_configs[project],
+    )
+
+    with pytest.raises(footing.exceptions.NotIndexedError):
+        footing.ls.status("github.com/u", template, offline=True)
+
+    template_status = footing.ls.status("github.com/u", template)
+
+    mock_get_latest_version.assert_called_once_with(mocker.ANY, template)
+    mock_get_pushed_since.assert_called_once_with(mocker.ANY, "github.com/u", None)
+    assert mock_get_footing_config.call_count == 5
+    assert template_status.latest_version == "v2"
+    assert template_status.versions == {"p1": "v2", "p2": "v1", "p3": "v1", "p4": None, "p5": None}
+    assert template_status.histogram == {"v2": 1, "v1": 2, None: 2}
+    assert template_status.out_of_date == ["p2", "p3"]
+
+    # Only repositories pushed since the previous sync are read again, without listing
+    # every project. Pushed repositories that use the template are added to the listing
+    mock_get_footing_config.reset_mock()
+    mock_get_pushed_since.return_value = {
+        "p2": "2999-01-01T00:00:00Z",
+        "p6": "2999-01-01T00:00:00Z",
+        "p7": "2999-01-01T00:00:00Z",
+        "p8": "2000-01-01T00:00:00Z",
+    }
+    footing_configs["p2"] = {"_template": template, "_version": "v2"}
+
+    template_status = footing.ls.status("github.com/u", template)
+
+    mock_ls.assert_called_once_with(mocker.ANY, "github.com/u", template)
+    assert mock_get_pushed_since.call_args[0][2] is not None
+    assert sorted(call[0][1] for call in mock_get_footing_config.call_args_list) == [
+        "p2",
+        "p6",
+        "p7",
+    ]
+    assert template_status.out_of_date == ["p3", "p6"]
+    assert footing.ls.ls("github.com/u", template, offline=True)["p6"] == "(no description found)"
+    assert footing.ls.status("github.com/u", template, offline=True) == template_status
+
+
+def test_older_than(local_template, mocker):
+    """Tests footing.ls.older_than finds projects on ancestors of a version"""
+    template, (v1, v2) = local_template
+    mock_status = mocker.patch(
+        "footing.ls.status",
+        autospec=True,
+        return_value=footing.ls.TemplateStatus(
+            template=template,
+            latest_version=v2,
+            versions={"p1": v1, "p2": v2, "p3": None, "p4": "unknown"},
+        ),
+    )
+
+    assert footing.ls.older_than("github.com/u", template, v2) == {"p1": v1}
+    assert footing.ls.older_than("github.com/u", template, v1, offline=True) == {}
+    mock_status.assert_called_with("github.com/u", template, offline=True)
+
+
+def test_older_than_offline(local_template, mocker):
+    """Tests footing.ls.older_than never clones or fetches the template when offline"""
+    template, (v1, _) = local_template
+    mocker.patch(
+        "footing.ls.status",
+        autospec=True,
+        return_value=footing.ls.TemplateStatus(template, None, {"p1": v1}),
+    )
+
+    with pytest.raises(footing.exceptions.NotIndexedError, match="not in the template cache"):
+        footing.ls.older_than("github.com/u", template, v1, offline=True)
+    assert footing.render.TemplateCache().lookup(template) is None
+
+    footing.render.TemplateCache().mirror(template)
+    with pytest.raises(footing.exceptions.NotIndexedError, match='Version "missing"'):
+        footing.ls.older_than("github.com/u", template, "missing", offline=True)
@@ -0,0 +1,169 @@
+"""Tests for footing.metrics module"""
+
+import json
+
+import pytest
+
+import footing.constants
+import footing.forge
+import footing.metrics
+
+
+@pytest.fixture
+def metrics():
+    """The process metrics, cleared before and after the test"""
+    footing.metrics.metrics.reset()
+    yield footing.metrics.metrics
+    footing.metrics.metrics.reset()
+
+
+@pytest.mark.parametrize(
+    "method, url, expected_endpoint",
+    [
+        (
+            "get",
+            "https://api.github.com/repos/org/repo/contents/footing.yaml?ref=main",
+            "GET api.github.com/repos/{owner}/{repo}/contents",
+        ),
+        (
+            "GET",
+            "https://api.github.com/orgs/org/repos?page=2",
+            "GET api.github.com/orgs/{name}/repos",
+        ),
+        (
+            "POST",
+            "https://api.github.com/app/installations/1/access_tokens",
+            "POST api.github.com/app/installations/{id}/access_tokens",
+        ),
+        ("GET", "https://api.github.com/search/code", "GET api.github.com/search/code"),
+        (
+            "GET",
+            "https://gitlab.com/api/v4/projects/g%2Fp/repository/files/footing.yaml/raw",
+            "GET gitlab.com/api/v4/projects/{id}/repository/files/{path}",
+        ),
+        (
+            "GET",
+            "https://gitlab.com/api/v4/groups/1/projects",
+            "GET gitlab.com/api/v4/groups/{id}/projects",
+        ),
+    ],
+)
+def test_get_endpoint(method, url, expected_endpoint):
+    """Tests footing.metrics.get_endpoint"""
+    assert footing.metrics.get_endpoint(method, url) == expected_endpoint
+
+
+def test_record(metrics, responses, mocker):
+    """Tests responses of the forge session are recorded per endpoint"""
+    mocker.patch.object(footing.constants, "FORGE_METRICS_LATENCY_BUCKETS", (0.1, 1.0))
+    repos_api = "https://api.github.com/orgs/org/repos"
+    contents_api = "https://api.github.com/repos/org/repo/contents/footing.yaml"
+    responses.add(responses.GET, repos_api, json=[], headers={"link": "<next>"})
+    responses.add(
+        responses.GET,
+        contents_api,
+        body="limited",
+        status=403,
+        headers={"X-RateLimit-Remaining": "0"},
+    )
+    responses.add(responses.GET, contents_api, body="body")
+
+    session = footing.forge.get_session()
+    session.get(repos_api)
+    resp = session.get(contents_api)
+    metrics.record_retry(resp)
+    session.get(contents_api)
+
+    snapshot = metrics.snapshot()
+    assert list(snapshot) == [
+        "GET api.github.com/orgs/{name}/repos",
+        "GET api.github.com/repos/{owner}/{repo}/contents",
+    ]
+    contents = snapshot["GET api.github.com/repos/{owner}/{repo}/contents"]
+    assert contents == footing.metrics.EndpointMetrics(
+        requests=2,
+        retries=1,
+        rate_limited=1,
+        errors=1,
+        bytes=11,
+        seconds=contents.seconds,
+        buckets=[2, 0, 0],
+    )
+    assert snapshot["GET api.github.com/orgs/{name}/repos"].pages == 1
+
+    # Snapshots are copies
+    contents.buckets[0] = 0
+    assert metrics.snapshot()["GET api.github.com/repos/{owner}/{repo}/contents"].buckets == [
+        2,
+        0,
+        0,
+    ]
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
+    assert footing.forge.Github().metrics is metrics
+
+
+@pytest.fixture
+def recorded_metrics(metrics, mocker):
+    """Metrics with a slow and fast response of one endpoint"""
+    mocker.patch.object(footing.constants, "FORGE_METRICS_LATENCY_BUCKETS", (0.1, 1.0))
+    for seconds, status in ((0.05, 200), (2.0, 429)):
+        resp = mocker.Mock(status_code=status, headers={}, content=b"ab")
+        resp.request.method = "GET"
+        resp.request.url = 'https://api.github.com/search/"code"'
+        resp.elapsed.total_seconds.return_value = seconds
+        metrics.record(resp)
+
+    return metrics
+
+
+def test_to_json(recorded_metrics):
+    """Tests footing.metrics.ForgeMetrics.to_json"""
+    assert json.loads(recorded_metrics.to_json()) == {
+        "latency_buckets": [0.1, 1.0],
+        "endpoints": {
+            'GET api.github.com/search/"code"': {
+                "requests": 2,
+                "pages": 0,
+                "retries": 0,
+                "rate_limited": 1,
+                "errors": 1,
+                "bytes": 4,
+                "seconds": 2.05,
+                "buckets": [1, 0, 1],
+            }
+        },
+    }
+
+
+def test_to_prometheus(recorded_metrics):
+    """Tests footing.metrics.ForgeMetrics.to_prometheus"""
+    lines = recorded_metrics.to_prometheus().splitlines()
+    label = 'endpoint="GET api.github.com/search/\\"code\\""'
+
+    assert lines[:3] == [
+        "# HELP footing_forge_requests_total Forge API responses received",
+        "# TYPE footing_forge_requests_total counter",
+        "footing_forge_requests_total{%s} 2" % label,
+    ]
+    assert "footing_forge_rate_limited_total{%s} 1" % label in lines
+    assert lines[-5:] == [
+        'footing_forge_request_duration_seconds_bucket{%s,le="0.1"} 1' % label,
+        'footing_forge_request_duration_seconds_bucket{%s,le="1.0"} 1' % label,
+        'footing_forge_request_duration_seconds_bucket{%s,le="+Inf"} 2' % label,
+        "footing_forge_request_duration_seconds_sum{%s} 2.05" % label,
+        "footing_forge_request_duration_seconds_count{%s} 2" % label,
+    ]
+
+
+@pytest.mark.parametrize("filename, is_json", [("metrics.json", True), ("metrics.prom", False)])
+def test_write(filename, is_json, recorded_metrics, tmp_path):
+    """Tests footing.metrics.ForgeMetrics.write picks the format from the file name"""
+    path = tmp_path / filename
+    recorded_metrics.write(str(path))
+
+    contents = path.read_text()
+    assert contents == (
+        recorded_metrics.to_json() if is_json else recorded_metrics.to_prometheus()
+    )
@@ -0,0 +1,106 @@
+"""Tests for footing.render module"""
+
+import os
+import subprocess
+
+import pytest
+
+import footing.git
+import footing.render
+
+
+def test_get_tree_hash(tmpdir):
+    """Tests footing.render._get_tree_hash against real files"""
+    tmpdir.join("a.txt").write("a")
+    tmpdir.mkdir("b").join("b.txt").write("b")
+
+    tree = footing.render._get_tree_hash(str(tmpdir))
+    assert len(tree) == 40
+    assert footing.render._get_tree_hash(str(tmpdir)) == tree
+
+    tmpdir.join("a.txt").write("changed")
+    assert footing.render._get_tree_hash(str(tmpdir)) != tree
+
+
+def test_get_context():
+    """Tests footing.render.get_context removes the keys managed by footing"""
+    assert footing.render.get_context(
+        {"_template": "t", "_version": "v", "_tree": "tree", "_extensions": [], "name": "n"}
+    ) == {"_extensions": [], "name": "n"}
+
+
+def test_template_cache_default_root(footing_env):
+    """Tests the default root of footing.render.TemplateCache"""
+    assert footing.render.TemplateCache().root == os.path.join(
+        footing_env["FOOTING_CACHE_DIR"], "templates"
+    )
+
+
+def test_template_cache(local_template, tmpdir):
+    """Tests footing.render.TemplateCache with a local template repository"""
+    template, (v1, v2) = local_template
+    cache = footing.render.TemplateCache(str(tmpdir))
+
+    mirror = cache.mirror(template)
+    assert cache.mirror(template) == mirror
+
+    assert cache.resolve(template) == v2
+    assert cache.resolve(template, v1) == v1
+    assert cache.resolve(template, v1[:10]) == v1
+    assert cache.resolve(template, "HEAD") == v2
+    assert cache.lookup(template, v1[:10]) == v1
+    assert cache.lookup(template) == v2
+    assert cache.lookup(template, "missing") is None
+    assert footing.render.TemplateCache(str(tmpdir.join("empty"))).lookup(template) is None
+
+    assert cache.config(template, v1) == {"repo_name": "project"}
+
+    render_v1 = cache.render(template, v1, {"repo_name": "a", "_version": v1})
+    assert os.path.basename(render_v1) == "a"
+    with open(os.path.join(render_v1, "README.md")) as readme:
+        assert readme.read() == "a\n"
+
+    render_v2 = cache.render(template, v2, {"repo_name": "a"})
+    with open(os.path.join(render_v2, "README.md")) as readme:
+        assert readme.read() == "a v2\n"
+
+    # Footing's own keys do not change the rendered context
+    assert cache.tree(template, v1, {"repo_name": "a"}) == cache.tree(
+        template, v1, {"repo_name": "a", "_version": "other"}
+    )
+    assert cache.tree(template, v1, {"repo_name": "a"}) != cache.tree(
+        template, v2, {"repo_name": "a"}
+    )
+
+    # Templates are fetched once. Later lookups are served from the cache
+    footing.git.runner.reset()
+    cache.render(template, v1, {"repo_name": "a"})
+    assert not any(spawn.argv[1] in ("clone", "fetch") for spawn in footing.git.runner.spawns)
+
+
+def test_template_cache_create_race(tmpdir):
+    """Tests footing.render.TemplateCache._create when another process creates the entry"""
+    cache = footing.render.TemplateCache(str(tmpdir))
+
+    def populate(tmp_path):
+        # Simulate another process finishing first
+        os.makedirs(os.path.join(str(tmpdir), "kind", "key", "entry"))
+
+    assert cache._create("kind", "key", populate) == os.path.join(str(tmpdir), "kind", "key")
+    assert os.listdir(os.path.join(str(tmpdir), "kind")) == ["key"]
+
+
+def test_template_cache_create_error(tmpdir):
+    """Tests footing.render.TemplateCache._create cleans up after errors"""
+    cache = footing.render.TemplateCache(str(tmpdir))
+
+    def populate(tmp_path):
+        raise subprocess.CalledProcessError(returncode=128, cmd="git clone")
+
+    with pytest.raises(subprocess.CalledProcessError):
+        cache._create("kind", "key", populate)
+
+    with pytest.raises(FileNotFoundError):
+        cache._create("kind", "key", lambda tmp_path: os.rmdir(tmp_path))
+
+    assert os.listdir(os.path.join(str(tmpdir), "kind")) == []
@@ -0,0 +1,344 @@
+"""Tests for footing.serve module"""
+
+import concurrent.futures
+import json
+import os
+import stat
+import threading
+import urllib.request
+
+import pytest
+
+import footing
+import footing.constants
+import footing.exceptions
+import footing.forge
+import footing.serve
+import footing.webhook
+
+
+@pytest.fixture
+def thread_workers(mocker):
+    """Runs the jobs of worker processes in threads, so that they can be mocked"""
+    mocker.patch(
+        "concurrent.futures.ProcessPoolExecutor",
+        side_effect=lambda max_workers, **kwargs: concurrent.futures.ThreadPoolExecutor(
+            max_workers
+        ),
+    )
+
+
+@pytest.fixture
+def server(thread_workers):
+    """A footing daemon running in a thread"""
+    server = footing.serve.Server(token="test_token")
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def client(server):
+    return footing.serve.Client(server.url, server.token)
+
+
+@pytest.mark.parametrize("rendered", [True, False])
+def test_check(rendered, server, client, mocker):
+    """Tests running a check job in a worker"""
+    mock_status = mocker.patch(
+        "footing.update.status", autospec=True, return_value=footing.constants.OUT_OF_DATE
+    )
+    mock_submit = mocker.spy(server._workers, "submit")
+
+    assert client.run("check", path="/p", rendered=rendered) == footing.constants.OUT_OF_DATE
+    mock_status.assert_called_once_with(version=None, rendered=rendered, path="/p")
+    assert mock_submit.called
+
+
+def test_ls(client, mocker):
+    """Tests running an ls job"""
+    mock_ls = mocker.patch("footing.ls.ls", autospec=True, return_value={"a": "b"})
+
+    assert client.run("ls", forge="github.com/u", offline=True) == {"a": "b"}
+    mock_ls.assert_called_once_with("github.com/u", template=None, offline=True)
+
+
+def test_update(client, tmp_path, mocker):
+    """Tests running an update job in the directory of the project"""
+
+    def update(new_version, answers):
+        print("Updated in", os.getcwd())
+        return True
+
+    mock_update = mocker.patch("footing.update.update", autospec=True, side_effect=update)
+
+    assert client.run("update", path=str(tmp_path), version="v2") == {
+        "updated": True,
+        "output": "Updated in {}\n".format(tmp_path),
+    }
+    mock_update.assert_called_once_with(new_version="v2", answers={})
+
+
+def test_webhook_job(client, mocker):
+    """Tests running a webhook job and caching its version in the daemon"""
+    mock_set_latest_version = mocker.patch("footing.forge.set_latest_version", autospec=True)
+    mock_handle_push = mocker.patch(
+        "footing.webhook.handle_push",
+        autospec=True,
+        side_effect=[footing.webhook.WebhookResult("t", "sha", ["p"], renders=2), None],
+    )
+
+    assert client.run("webhook", payload={"ref": "r"}) == {
+        "template": "t",
+        "sha": "sha",
+        "projects": ["p"],
+        "renders": 2,
+        "errors": [],
+    }
+    assert client.run("webhook", payload={"ref": "r"}, forge="github.com/o") is None
+    assert mock_handle_push.call_args_list == [
+        mocker.call({"ref": "r"}, forge=None),
+        mocker.call({"ref": "r"}, forge="github.com/o"),
+    ]
+    mock_set_latest_version.assert_called_once_with("t", "sha")
+
+
+@pytest.mark.parametrize(
+    "secret, headers, expected_status",
+    [
+        ("secret", {"X-Gitlab-Token": "secret"}, 200),
+        ("secret", {"X-Gitlab-Token": "invalid"}, 403),
+        ("", {"X-Gitlab-Token": ""}, 403),
+        ("", {"X-Footing-Token": "test_token"}, 200),
+    ],
+)
+def test_webhook(secret, headers, expected_status, server, mocker):
+    """Tests forges posting webhooks to the daemon"""
+    mocker.patch.dict(os.environ, {footing.constants.WEBHOOK_SECRET_ENV_VAR: secret})
+    mock_handle_push = mocker.patch(
+        "footing.webhook.handle_push", autospec=True, return_value=None
+    )
+    request = urllib.request.Request(
+        server.url + "/webhook", data=b'{"ref": "r"}', headers=headers
+    )
+
+    try:
+        with urllib.request.urlopen(request) as resp:
+            status = resp.status
+    except urllib.error.HTTPError as exc:
+        status = exc.code
+
+    assert status == expected_status
+    assert mock_handle_push.called == (expected_status == 200)
+
+
+@pytest.mark.parametrize(
+    "exc, expected_exc, expected_message",
+    [
+        (
+            footing.exceptions.NotInGitRepoError("not in repo"),
+            footing.exceptions.NotInGitRepoError,
+            "not in repo",
+        ),
+        (KeyError("k"), footing.exceptions.DaemonJobError, "KeyError"),
+    ],
+)
+def test_run_w_error(exc, expected_exc, expected_message, client, mocker):
+    """Tests errors of jobs are raised by the client"""
+    mocker.patch("footing.update.status", autospec=True, side_effect=exc)
+
+    with pytest.raises(expected_exc, match=expected_message):
+        client.run("check", path="/p")
+
+
+def test_run_w_broken_workers(server, client, tmp_path, mocker):
+    """Tests a new pool of workers is created when a worker dies"""
+    mocker.patch(
+        "footing.update.update",
+        autospec=True,
+        side_effect=concurrent.futures.process.BrokenProcessPool("died"),
+    )
+    workers = server._workers
+
+    with pytest.raises(footing.exceptions.DaemonJobError, match="BrokenProcessPool"):
+        client.run("update", path=str(tmp_path))
+
+    assert server._workers is not workers
+
+
+def test_run_w_replaced_workers(server, mocker):
+    """Tests a pool of workers replaced by another job is kept"""
+    new_workers = footing.serve._create_workers()
+
+    def submit(*args, **kwargs):
+        server._workers = new_workers
+        raise concurrent.futures.process.BrokenProcessPool("died")
+
+    mocker.patch.object(server._workers, "submit", autospec=True, side_effect=submit)
+
+    with pytest.raises(concurrent.futures.process.BrokenProcessPool):
+        server._run_in_worker("update", {})
+
+    assert server._workers is new_workers
+
+
+def test_run_in_worker_process(tmp_path):
+    """Tests updates run in a worker process without changing the directory of the daemon"""
+    server = footing.serve.Server()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    cwd = os.getcwd()
+    try:
+        with pytest.raises(footing.exceptions.NotInGitRepoError):
+            footing.serve.Client(server.url, server.token).run("update", path=str(tmp_path))
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    assert os.getcwd() == cwd
+
+
+def test_run_job(mocker):
+    """Tests jobs in workers start with the latest versions cached by the daemon"""
+    mocker.patch("footing.update.status", autospec=True, return_value=footing.constants.UP_TO_DATE)
+
+    with footing.forge.cache_latest_versions(60):
+        footing.forge.set_latest_version("t", "v1")
+        latest_versions = footing.serve._get_latest_versions()
+        footing.forge._latest_versions.clear()
+
+        assert footing.serve._run_job("check", {"path": "/p"}, latest_versions) == (
+            footing.constants.UP_TO_DATE
+        )
+        assert footing.forge.get_latest_versions() == {"t": "v1"}
+
+
+def test_init_worker():
+    """Tests worker processes cache the latest versions of templates"""
+    footing.serve._init_worker()
+    try:
+        footing.forge.set_latest_version("t", "v1")
+        assert footing.forge._latest_versions["t"][1] == "v1"
+    finally:
+        footing.serve._worker_context.close()
+
+    assert not footing.forge._latest_versions
+
+
+def test_run_w_unknown_command(client):
+    """Tests running a job that does not exist"""
+    with pytest.raises(footing.exceptions.DaemonJobError, match='Unknown command "x"'):
+        client.run("x")
+
+
+def test_run_w_invalid_token(server):
+    """Tests jobs are refused without the token of the daemon"""
+    with pytest.raises(footing.exceptions.DaemonJobError, match="Invalid token"):
+        footing.serve.Client(server.url, "invalid").run("check", path="/p")
+
+
+@pytest.mark.parametrize("method", ["GET", "POST"])
+def test_not_found(method, server):
+    """Tests requesting unknown paths of the daemon"""
+    request = urllib.request.Request(
+        server.url + "/unknown", method=method, data=b"{}" if method == "POST" else None
+    )
+
+    with pytest.raises(urllib.error.HTTPError) as exc_info:
+        urllib.request.urlopen(request)
+
+    assert exc_info.value.code == 404
+    assert json.loads(exc_info.value.read())["error"]["message"] == "Not found"
+
+
+def test_max_jobs(mocker):
+    """Tests jobs over the concurrency limit of their command wait their turn"""
+    mocker.patch.dict(footing.constants.SERVE_MAX_JOBS, {"check": 1})
+    started = threading.Event()
+    release = threading.Event()
+
+    def status(**kwargs):
+        started.set()
+        release.wait()
+        return footing.constants.UP_TO_DATE
+
+    mocker.patch("footing.update.status", autospec=True, side_effect=status)
+    # Semaphores are created with the server
+    server = footing.serve.Server()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    client = footing.serve.Client(server.url, server.token)
+    results = []
+    jobs = [
+        threading.Thread(target=lambda: results.append(client.run("check", path="/p")))
+        for _ in range(2)
+    ]
+    try:
+        for job in jobs:
+            job.start()
+        started.wait()
+        assert client.health()["running"] == {"check": 1}
+        release.set()
+        for job in jobs:
+            job.join()
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    assert results == [footing.constants.UP_TO_DATE] * 2
+
+
+def test_serve(mocker):
+    """Tests the daemon publishes its address and caches latest versions while serving"""
+    address_path = os.path.join(
+        os.environ[footing.constants.FOOTING_CACHE_DIR_ENV_VAR], "serve.json"
+    )
+
+    def serve_forever(server):
+        with open(address_path) as f:
+            address = json.load(f)
+        assert address == {"url": server.url, "pid": os.getpid(), "token": server.token}
+        assert stat.S_IMODE(os.stat(address_path).st_mode) == 0o600
+        footing.forge.set_latest_version("t", "v1")
+        assert footing.forge._latest_versions["t"][1] == "v1"
+        raise KeyboardInterrupt
+
+    mocker.patch.object(
+        footing.serve.Server, "serve_forever", autospec=True, side_effect=serve_forever
+    )
+
+    footing.serve.serve()
+
+    assert not os.path.exists(address_path)
+    assert not footing.forge._latest_versions
+
+
+def test_get_client(server, mocker):
+    """Tests finding the running daemon"""
+    address_path = footing.serve._get_address_path()
+    assert footing.serve.get_client() is None
+
+    with open(address_path, "w") as f:
+        json.dump({"url": server.url, "token": server.token}, f)
+    client = footing.serve.get_client()
+    assert (client.url, client.token) == (server.url, server.token)
+
+    mocker.patch.object(
+        footing.serve.Client, "health", autospec=True, return_value={"version": "0.0.0"}
+    )
+    assert footing.serve.get_client() is None
+
+
+def test_get_client_w_stopped_daemon(mocker):
+    """Tests the address of a stopped daemon is ignored"""
+    server = footing.serve.Server()
+    server.server_close()
+    with open(footing.serve._get_address_path(), "w") as f:
+        json.dump({"url": server.url, "token": server.token}, f)
+
+    assert footing.serve.get_client() is None
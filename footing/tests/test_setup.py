@@ -1,7 +1,6 @@
 """Tests for footing.setup module"""
 
 import os
-import subprocess
 
 import pytest
 
@@ -28,16 +27,13 @@ def test_setup(version, expected_revparse_called, expected_version, mocker):
         return_value=(".", config),
     )
 
-    revparse_return = subprocess.CompletedProcess([], stdout=b"latest_version", returncode=0)
     mock_generate_files = mocker.patch(
         "footing.setup.cc_generate.generate_files",
         autospec=True,
         return_value=".",
     )
-    mock_shell = mocker.patch(
-        "footing.utils.shell",
-        autospec=True,
-        side_effect=[revparse_return, None, None, None, None, None],
+    mock_output = mocker.patch(
+        "footing.git.runner.output", autospec=True, return_value="latest_version"
     )
 
     footing.setup.setup(template, version=version)
@@ -53,7 +49,9 @@ def test_setup(version, expected_revparse_called, expected_version, mocker):
         overwrite_if_exists=False,
         repo_dir=".",
     )
-    assert mock_shell.called == expected_revparse_called
+    assert mock_output.called == expected_revparse_called
+    if expected_revparse_called:
+        mock_output.assert_called_once_with("rev-parse", "HEAD", cwd=".")
 
 
 def test_generate_files(tmpdir):
@@ -0,0 +1,214 @@
+"""Tests for footing.tokens module"""
+
+import concurrent.futures
+import contextlib
+import os
+import threading
+import time
+
+import pytest
+import requests
+from responses import matchers as responses_matchers
+
+import footing.constants
+import footing.exceptions
+import footing.forge
+import footing.tokens
+
+
+def _response(status=200, headers=None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers.update(headers or {})
+    return resp
+
+
+def test_get_pool(mocker):
+    """Tests footing.tokens.get_pool combines and shares configured tokens"""
+    mocker.patch.dict(
+        os.environ,
+        {
+            footing.constants.GITHUB_API_TOKEN_ENV_VAR: "a",
+            footing.constants.GITHUB_API_TOKENS_ENV_VAR: "b, a,,c",
+        },
+    )
+
+    pool = footing.tokens.get_pool()
+
+    assert [token.value for token in pool.tokens] == ["a", "b", "c"]
+    assert footing.tokens.get_pool() is pool
+
+    mocker.patch.dict(os.environ, {}, clear=True)
+    with pytest.raises(footing.exceptions.InvalidEnvironmentError):
+        footing.tokens.get_pool()
+
+
+def test_get_pool_w_app(mocker, tmp_path):
+    """Tests footing.tokens.get_pool mints and refreshes Github App installation tokens"""
+    private_key = tmp_path / "app.pem"
+    private_key.write_text("key")
+    mocker.patch.dict(
+        os.environ,
+        {
+            footing.constants.GITHUB_APP_ID_ENV_VAR: "1",
+            footing.constants.GITHUB_APP_PRIVATE_KEY_ENV_VAR: str(private_key),
+            footing.constants.GITHUB_APP_INSTALLATION_IDS_ENV_VAR: "10,20",
+        },
+        clear=True,
+    )
+    mock_mint = mocker.patch(
+        "footing.tokens.mint_installation_token",
+        autospec=True,
+        side_effect=lambda app_id, key, installation_id: (
+            "{}-{}-{}".format(app_id, key, installation_id),
+            time.time() + 3600,
+        ),
+    )
+
+    pool = footing.tokens.get_pool()
+    token, value = pool.acquire()
+
+    assert value == "1-key-10"
+    assert pool.acquire()[1] == "1-key-20"
+    assert pool.acquire()[1] == "1-key-10"
+    assert mock_mint.call_count == 2
+
+    # Expired installation tokens are minted again
+    token.expires_at = time.time()
+    assert pool.acquire()[1] == "1-key-20"
+    assert pool.acquire()[1] == "1-key-10"
+    assert mock_mint.call_count == 3
+
+
+def test_token_pool():
+    """Tests footing.tokens.TokenPool spreads requests and skips exhausted tokens"""
+    pool = footing.tokens.TokenPool([footing.tokens.Token("a"), footing.tokens.Token("b")])
+
+    assert len(pool) == 2
+    assert [pool.acquire()[1] for _ in range(4)] == ["a", "b", "a", "b"]
+
+    token_a, token_b = pool.tokens
+    pool.update(token_a, _response(headers={"X-RateLimit-Remaining": "4000"}))
+    assert pool.acquire()[1] == "b"
+
+    reset_at = time.time() + 3600
+    pool.update(
+        token_b,
+        _response(
+            status=403,
+            headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset_at)},
+        ),
+    )
+    assert token_b.is_exhausted(time.time())
+    assert [pool.acquire()[1] for _ in range(2)] == ["a", "a"]
+
+    # The token that resets first is used when every token is exhausted
+    pool.update(
+        token_a,
+        _response(headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset_at + 1)}),
+    )
+    assert pool.acquire()[1] == "b"
+
+
+def test_token_pool_mints_outside_lock(mocker):
+    """Tests minting an installation token does not hold up requests of other tokens"""
+    started = threading.Event()
+    release = threading.Event()
+
+    def mint():
+        started.set()
+        release.wait(timeout=10)
+        return "minted", time.time() + 3600
+
+    minted = footing.tokens.Token(mint=mint)
+    pool = footing.tokens.TokenPool([footing.tokens.Token("a", remaining=4999), minted])
+
+    with concurrent.futures.ThreadPoolExecutor(1) as executor:
+        acquired = executor.submit(pool.acquire)
+        assert started.wait(timeout=10)
+        assert pool.acquire()[1] == "a"
+        release.set()
+        assert acquired.result() == (minted, "minted")
+
+    # Callers that waited for another mint use its token
+    minted.expires_at = time.time()
+    mock_mint = mocker.Mock()
+    minted.mint = mock_mint
+
+    @contextlib.contextmanager
+    def minted_while_waiting():
+        minted.value, minted.expires_at = "other", time.time() + 3600
+        yield
+
+    minted._mint_lock = minted_while_waiting()
+    assert minted.get_value(time.time()) == "other"
+    assert not mock_mint.called
+
+
+@pytest.mark.parametrize(
+    "status, headers, expected_rate_limited",
+    [
+        (403, {"X-RateLimit-Remaining": "0"}, True),
+        (429, {"X-RateLimit-Remaining": "0"}, True),
+        (403, {"X-RateLimit-Remaining": "10"}, False),
+        (200, {"X-RateLimit-Remaining": "0"}, False),
+    ],
+)
+def test_is_rate_limited(status, headers, expected_rate_limited):
+    """Tests footing.tokens.is_rate_limited"""
+    assert footing.tokens.is_rate_limited(_response(status, headers)) == expected_rate_limited
+
+
+def test_mint_installation_token(mocker, responses):
+    """Tests footing.tokens.mint_installation_token"""
+    mocker.patch("footing.tokens._create_app_jwt", autospec=True, return_value="jwt")
+    responses.add(
+        responses.POST,
+        "https://api.github.com/app/installations/10/access_tokens",
+        json={"token": "installation-token", "expires_at": "2030-01-01T00:00:00Z"},
+        match=[responses_matchers.header_matcher({"Authorization": "Bearer jwt"})],
+    )
+
+    get_session = mocker.spy(footing.forge, "get_session")
+
+    assert footing.tokens.mint_installation_token("1", "key", "10") == (
+        "installation-token",
+        1893456000.0,
+    )
+    assert get_session.called
+
+
+def test_github_call_api_rotates_tokens(mocker, responses):
+    """Tests footing.forge.Github._call_api retries exhausted tokens with another token"""
+    mocker.patch.dict(
+        os.environ, {footing.constants.GITHUB_API_TOKENS_ENV_VAR: "rotate1,rotate2"}, clear=True
+    )
+    api = "https://api.github.com/users/u"
+    for token, status, remaining in [("rotate1", 403, "0"), ("rotate2", 200, "4999")]:
+        responses.add(
+            responses.GET,
+            api,
+            json={"login": token},
+            status=status,
+            adding_headers={"X-RateLimit-Remaining": remaining},
+            match=[responses_matchers.header_matcher({"Authorization": "token {}".format(token)})],
+        )
+
+    resp = footing.forge.Github()._get("/users/u")
+
+    assert resp.json() == {"login": "rotate2"}
+    assert [token.remaining for token in footing.tokens.get_pool().tokens] == [0, 4999]
+
+
+def test_github_call_api_exhausted_pool(mocker, responses):
+    """Tests footing.forge.Github._call_api returns the refusal when every token is exhausted"""
+    mocker.patch.dict(os.environ, {footing.constants.GITHUB_API_TOKEN_ENV_VAR: "exhausted"})
+    responses.add(
+        responses.GET,
+        "https://api.github.com/users/u",
+        status=403,
+        adding_headers={"X-RateLimit-Remaining": "0"},
+    )
+
+    assert footing.forge.Github()._get("/users/u").status_code == 403
+    assert len(responses.calls) == 1
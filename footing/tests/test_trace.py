@@ -0,0 +1,86 @@
+"""Tests for footing.trace module"""
+
+import json
+import os
+import threading
+
+import pytest
+
+import footing.trace
+import footing.utils
+
+
+def test_span_wo_tracing():
+    """Tests spans are not recorded outside of footing.trace.tracing"""
+    assert not footing.trace.is_enabled()
+
+    with footing.trace.span("phase", files=1) as span_args:
+        span_args["bytes"] = 2
+
+    assert span_args == {"files": 1, "bytes": 2}
+
+
+def test_tracing(tmp_path):
+    """Tests spans are written in Chrome trace-event format"""
+    trace_path = tmp_path / "trace.json"
+
+    @footing.trace.span("decorated", "test")
+    def decorated():
+        footing.utils.shell(["true"])
+
+    with footing.trace.tracing(str(trace_path)) as tracer:
+        assert footing.trace.is_enabled()
+        with footing.trace.span("outer", "test", key="value") as span_args:
+            span_args["files"] = 2
+            decorated()
+            thread = threading.Thread(target=decorated, name="worker")
+            thread.start()
+            thread.join()
+        footing.utils.shell("true")
+
+    assert not footing.trace.is_enabled()
+    assert [span.name for span in sorted(tracer.spans, key=lambda span: span.start)] == [
+        "outer",
+        "decorated",
+        "true",
+        "decorated",
+        "true",
+        "true",
+    ]
+
+    trace = json.loads(trace_path.read_text())
+    assert trace["displayTimeUnit"] == "ms"
+    metadata = [event for event in trace["traceEvents"] if event["ph"] == "M"]
+    assert {event["args"]["name"] for event in metadata} == {
+        threading.main_thread().name,
+        "worker",
+    }
+
+    events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert events[0] == {
+        "name": "outer",
+        "cat": "test",
+        "ph": "X",
+        "ts": pytest.approx(events[0]["ts"]),
+        "dur": pytest.approx(events[0]["dur"]),
+        "pid": os.getpid(),
+        "tid": threading.main_thread().ident,
+        "args": {"key": "value", "files": 2, "subprocesses": 2},
+    }
+    assert events[1]["args"] == {"subprocesses": 1}
+    assert events[2]["args"] == {}
+    assert events[2]["cat"] == "subprocess"
+    assert events[0]["ts"] <= events[1]["ts"] <= events[0]["ts"] + events[0]["dur"]
+
+
+def test_tracing_w_error(tmp_path):
+    """Tests traces are written when the traced command fails"""
+    trace_path = tmp_path / "trace.json"
+
+    with pytest.raises(ValueError):
+        with footing.trace.tracing(str(trace_path)):
+            with footing.trace.span("failing"):
+                raise ValueError
+
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    assert [event["name"] for event in events if event["ph"] == "X"] == ["failing"]
@@ -1,12 +1,58 @@
 """Tests for footing.update module"""
 
+import json
 import subprocess
 
 import pytest
 
 import footing.constants
+import footing.exceptions
 import footing.forge
+import footing.git
+import footing.render
+import footing.trace
 import footing.update
+import footing.utils
+
+
+@pytest.mark.parametrize(
+    "path, expected_is_template_file",
+    [
+        ("cookiecutter.json", True),
+        ("hooks/post_gen_project.py", True),
+        ("{{cookiecutter.repo_name}}/setup.py", True),
+        ("{{ cookiecutter.repo_name }}/README.md", True),
+        ("README.md", False),
+        (".circleci/config.yml", False),
+        ("tests/cookiecutter.json", False),
+    ],
+)
+def test_is_template_file(path, expected_is_template_file):
+    """Tests footing.update._is_template_file"""
+    assert footing.update._is_template_file(path) == expected_is_template_file
+
+
+@pytest.mark.parametrize(
+    "template, changed_files, expected_changed",
+    [
+        ("git@github.com:org/template.git", None, True),
+        ("git@github.com:org/template.git", [], False),
+        ("git@github.com:org/template.git", ["README.md"], False),
+        ("git@github.com:org/template.git", ["README.md", "cookiecutter.json"], True),
+        ("/local/template", [], True),
+    ],
+)
+def test_template_files_have_changed(template, changed_files, expected_changed, mocker):
+    """Tests footing.update._template_files_have_changed"""
+    mock_get_changed_files = mocker.patch.object(
+        footing.forge.Github,
+        "get_changed_files",
+        autospec=True,
+        return_value=changed_files,
+    )
+
+    assert footing.update._template_files_have_changed(template, "v1", "v2") == expected_changed
+    assert mock_get_changed_files.called == template.startswith("git@")
 
 
 def test_get_latest_template_version(mocker):
@@ -23,34 +69,32 @@ def test_get_latest_template_version(mocker):
 @pytest.mark.parametrize(
     "old_config, new_config, expected_has_changed",
     [
-        ('{"config": "same"}', '{"config": "same"}', False),
-        ('{"config": "same"}', '{"config": "diff"}', True),
+        ({"config": "same"}, {"config": "same"}, False),
+        ({"config": "same"}, {"config": "diff"}, True),
     ],
 )
-def test_cookiecutter_configs_have_changed(
-    old_config, new_config, expected_has_changed, mocker, responses
-):
+def test_cookiecutter_configs_have_changed(old_config, new_config, expected_has_changed, mocker):
     """Tests footing.update._cookiecutter_configs_have_changed"""
-    mock_clone = mocker.patch("footing.update.cc_vcs.clone", autospec=True, return_value="path")
-    mock_open = mocker.patch("footing.update.open")
-    mock_open().read.side_effect = [old_config, new_config]
-    mock_call = mocker.patch("subprocess.check_call", autospec=True)
+    cache = mocker.Mock(spec=footing.render.TemplateCache)
+    cache.config.side_effect = [old_config, new_config]
     template = "git@github.com:org/template.git"
 
-    config_has_changed = footing.update._cookiecutter_configs_have_changed(template, "old", "new")
+    config_has_changed = footing.update._cookiecutter_configs_have_changed(
+        template, "old", "new", cache
+    )
     assert config_has_changed == expected_has_changed
-    mock_clone.assert_called_once_with(template, "old", mocker.ANY)
-    assert mock_call.call_count == 1
+    assert cache.config.call_args_list == [
+        mocker.call(template, "old"),
+        mocker.call(template, "new"),
+    ]
 
 
 @pytest.mark.parametrize("existing_files", [True, False])
 def test_apply_template(mocker, existing_files):
-    mock_td = mocker.patch("tempfile.TemporaryDirectory", autospec=True)
-    mock_cc = mocker.patch(
-        "cookiecutter.main.cookiecutter",
-        autospec=True,
-        return_value="basepath",
-    )
+    cache = mocker.Mock(spec=footing.render.TemplateCache)
+    cache.render.return_value = "basepath"
+    cache.tree.return_value = "tree"
+    mock_makedirs = mocker.patch("os.makedirs", autospec=True)
     mock_list = mocker.patch("os.listdir", autospec=True, return_value=["a", "b"])
     mocker.patch("os.path.isdir", autospec=True, side_effect=[True, False])
     mocker.patch("os.path.exists", autospec=True, return_value=existing_files)
@@ -59,16 +103,15 @@ def test_apply_template(mocker, existing_files):
     mock_rmtree = mocker.patch("shutil.rmtree", autospec=True)
     mock_remove = mocker.patch("os.remove", autospec=True)
 
-    footing.update._apply_template("t", ".", checkout="v1", extra_context={"c": "tx"})
-
-    mock_cc.assert_called_once_with(
-        "t",
-        checkout="v1",
-        no_input=True,
-        output_dir=mock_td.return_value.__enter__.return_value,
-        extra_context={"c": "tx"},
+    tree = footing.update._apply_template(
+        "t", ".", checkout="v1", extra_context={"c": "tx"}, cache=cache
     )
-    mock_list.assert_called_once_with(mock_cc.return_value)
+
+    assert tree == "tree"
+    cache.render.assert_called_once_with("t", "v1", {"c": "tx"})
+    cache.tree.assert_called_once_with("t", "v1", {"c": "tx"})
+    mock_makedirs.assert_called_once_with(".", exist_ok=True)
+    mock_list.assert_called_once_with("basepath")
     mock_shutil_ct.assert_called_once_with("basepath/a", "./a")
     mock_shutil_cp.assert_called_once_with("basepath/b", "./b")
     if existing_files:
@@ -79,6 +122,71 @@ def test_apply_template(mocker, existing_files):
         assert not mock_remove.called
 
 
+@pytest.mark.parametrize(
+    "footing_config, configs_changed, rendered_tree, expected_unchanged",
+    [
+        ({"_template": "t", "_version": "v1"}, False, "tree", False),
+        ({"_template": "t", "_version": "v1", "_tree": "tree"}, False, "tree", True),
+        ({"_template": "t", "_version": "v1", "_tree": "tree"}, True, "tree", False),
+        ({"_template": "t", "_version": "v1", "_tree": "tree"}, False, "new_tree", False),
+    ],
+)
+def test_rendered_tree_is_unchanged(
+    footing_config, configs_changed, rendered_tree, expected_unchanged, mocker
+):
+    """Tests footing.update._rendered_tree_is_unchanged"""
+    cache = mocker.Mock(spec=footing.render.TemplateCache)
+    cache.tree.return_value = rendered_tree
+    mocker.patch(
+        "footing.update._cookiecutter_configs_have_changed",
+        autospec=True,
+        return_value=configs_changed,
+    )
+
+    assert (
+        footing.update._rendered_tree_is_unchanged(footing_config, "v2", cache)
+        == expected_unchanged
+    )
+
+
+@pytest.mark.parametrize(
+    "latest_version, rendered, files_changed, tree_unchanged, expected_status",
+    [
+        ("v1", False, True, False, footing.constants.UP_TO_DATE),
+        ("v2", False, False, True, footing.constants.OUT_OF_DATE),
+        ("v2", True, False, False, footing.constants.EFFECTIVELY_UP_TO_DATE),
+        ("v2", True, True, True, footing.constants.EFFECTIVELY_UP_TO_DATE),
+        ("v2", True, True, False, footing.constants.OUT_OF_DATE),
+    ],
+)
+def test_status(latest_version, rendered, files_changed, tree_unchanged, expected_status, mocker):
+    """Tests footing.update.status"""
+    mocker.patch("footing.check.in_git_repo", autospec=True)
+    mocker.patch("footing.check.is_footing_project", autospec=True)
+    mocker.patch(
+        "footing.utils.read_footing_config",
+        autospec=True,
+        return_value={"_version": "v1", "_template": "t", "_tree": "tree"},
+    )
+    mocker.patch(
+        "footing.update._get_latest_template_version",
+        autospec=True,
+        return_value=latest_version,
+    )
+    mocker.patch(
+        "footing.update._template_files_have_changed",
+        autospec=True,
+        return_value=files_changed,
+    )
+    mocker.patch(
+        "footing.update._rendered_tree_is_unchanged",
+        autospec=True,
+        return_value=tree_unchanged,
+    )
+
+    assert footing.update.status(rendered=rendered) == expected_status
+
+
 @pytest.mark.parametrize(
     "footing_config, latest_version, supplied_version, expected_up_to_date",
     [
@@ -113,6 +221,93 @@ def test_up_to_date(
     assert footing.update.up_to_date(version=supplied_version) == expected_up_to_date
 
 
+def test_check_all(fs, mocker):
+    """Tests footing.update.check_all checks projects in place"""
+    fs.create_file("/root_dir/a/footing.yaml", contents="_template: t1\n_version: v1\n")
+    fs.create_file("/root_dir/b/footing.yaml", contents="_template: t1\n_version: v2\n")
+    fs.create_file("/root_dir/c/footing.yaml", contents="_template: t2\n_version: v1\n")
+    fs.create_file("/root_dir/d/footing.yaml", contents="_template: t3\n_version: v1\n")
+    fs.create_file("/root_dir/e/footing.yaml", contents="_template: [t4\n")
+    fs.create_file("/root_dir/f/footing.yaml", contents="_version: v1\n")
+
+    def get_latest_template_version(template):
+        if template == "t2":
+            raise footing.exceptions.CheckRunError("No access")
+        return "v2"
+
+    mock_get_latest = mocker.patch(
+        "footing.update._get_latest_template_version",
+        autospec=True,
+        side_effect=get_latest_template_version,
+    )
+    mock_read_config = mocker.patch(
+        "footing.utils.read_footing_config",
+        autospec=True,
+        side_effect=footing.utils.read_footing_config,
+    )
+    mocker.patch(
+        "footing.check._in_git_repo",
+        autospec=True,
+        side_effect=lambda path: path != "/root_dir/a",
+    )
+
+    results = footing.update.check_all("/root_dir")
+
+    assert results == [
+        {
+            "path": "a",
+            "template": "t1",
+            "version": "v1",
+            "latest_version": "v2",
+            "up_to_date": None,
+            "error": "Must be inside git repository of project to run this command.",
+        },
+        {
+            "path": "b",
+            "template": "t1",
+            "version": "v2",
+            "latest_version": "v2",
+            "up_to_date": True,
+            "error": None,
+        },
+        {
+            "path": "c",
+            "template": "t2",
+            "version": "v1",
+            "latest_version": None,
+            "up_to_date": None,
+            "error": "No access",
+        },
+        {
+            "path": "d",
+            "template": "t3",
+            "version": "v1",
+            "latest_version": "v2",
+            "up_to_date": False,
+            "error": None,
+        },
+        {
+            "path": "e",
+            "template": None,
+            "version": None,
+            "latest_version": None,
+            "up_to_date": None,
+            "error": mocker.ANY,
+        },
+        {
+            "path": "f",
+            "template": None,
+            "version": None,
+            "latest_version": None,
+            "up_to_date": None,
+            "error": '/root_dir/f/footing.yaml has no "_template" or "_version"',
+        },
+    ]
+    assert results[4]["error"].startswith("Invalid /root_dir/e/footing.yaml:")
+    assert mock_get_latest.call_count == 3
+    assert mock_read_config.call_count == 6
+
+
 @pytest.mark.parametrize(
     "version, supplied_version, latest_version",
     [
@@ -140,15 +335,53 @@ def test_update_w_up_to_date(version, supplied_version, latest_version, mocker):
     assert not footing.update.update(new_version=supplied_version)
 
 
+@pytest.mark.parametrize("files_changed", [True, False])
+def test_update_w_unchanged_rendered_tree(files_changed, mocker):
+    """Tests footing.update.update when the template files or rendered template are unchanged"""
+    footing_config = {"_version": "v1", "_template": "t", "_tree": "tree"}
+    mocker.patch("footing.check.not_has_branch", autospec=True)
+    mocker.patch("footing.check.in_git_repo", autospec=True)
+    mocker.patch("footing.check.in_clean_repo", autospec=True)
+    mocker.patch("footing.check.is_footing_project", autospec=True)
+    mocker.patch(
+        "footing.utils.read_footing_config",
+        autospec=True,
+        return_value=footing_config,
+    )
+    mocker.patch(
+        "footing.update._get_latest_template_version",
+        autospec=True,
+        return_value="v2",
+    )
+    mocker.patch(
+        "footing.update._template_files_have_changed",
+        autospec=True,
+        return_value=files_changed,
+    )
+    mock_rendered_tree = mocker.patch(
+        "footing.update._rendered_tree_is_unchanged", autospec=True, return_value=True
+    )
+    mock_write_config = mocker.patch("footing.utils.write_footing_config", autospec=True)
+    mock_run = mocker.patch("footing.git.runner.run", autospec=True)
+
+    assert not footing.update.update()
+
+    mock_write_config.assert_called_once_with(footing_config, "t", "v2")
+    assert not mock_run.called
+    assert mock_rendered_tree.called == files_changed
+
+
 @pytest.mark.parametrize(
-    "cc_configs_changed, enter_parameters, current_version, latest_version, old_template",
+    "cc_configs_changed, enter_parameters, current_version, latest_version, old_template, answers",
     [
-        (False, False, "v1", "v2", None),
-        (False, False, "v1", "v2", "git@github.com:owner/old_repo.git"),
-        (True, False, "v1", "v2", None),
-        (False, True, "v1", "v2", None),
+        (False, False, "v1", "v2", None, None),
+        (False, False, "v1", "v2", "git@github.com:owner/old_repo.git", None),
+        (True, False, "v1", "v2", None, None),
+        (False, True, "v1", "v2", None, None),
         # Updates should still proceed when entering parameters and up to date with latest
-        (False, True, "v1", "v1", None),
+        (False, True, "v1", "v1", None, None),
+        # Answers are used instead of prompting
+        (True, False, "v1", "v2", None, {"new_var": "value", "_version": "ignored"}),
     ],
 )
 def test_update_w_out_of_date(
@@ -157,6 +390,7 @@ def test_update_w_out_of_date(
     current_version,
     latest_version,
     old_template,
+    answers,
     mocker,
     fs,
 ):
@@ -177,6 +411,8 @@ def test_update_w_out_of_date(
         autospec=True,
         return_value=latest_version,
     )
+    mocker.patch("footing.update._template_files_have_changed", autospec=True, return_value=True)
+    mock_cache = mocker.patch("footing.render.TemplateCache", autospec=True).return_value
     mock_apply_template = mocker.patch("footing.update._apply_template", autospec=True)
     mock_cc_configs_have_changed = mocker.patch(
         "footing.update._cookiecutter_configs_have_changed",
@@ -189,77 +425,299 @@ def test_update_w_out_of_date(
         autospec=True,
         return_value=("repo", footing_config),
     )
-    mock_shell = mocker.patch("footing.utils.shell", autospec=True)
+    mock_run = mocker.patch("footing.git.runner.run", autospec=True)
     mock_write_config = mocker.patch("footing.utils.write_footing_config", autospec=True)
 
-    footing.update.update(enter_parameters=enter_parameters, old_template=old_template)
+    footing.update.update(
+        enter_parameters=enter_parameters, old_template=old_template, answers=answers
+    )
 
-    assert mock_input.called == cc_configs_changed or old_template is not None
+    assert (
+        mock_input.called == (cc_configs_changed and answers is None) or old_template is not None
+    )
     assert mock_get_cc_config.called == (
         cc_configs_changed or enter_parameters or old_template is not None
     )
+    if mock_get_cc_config.called:
+        mock_get_cc_config.assert_called_once_with(
+            mock_cache.checkout.return_value,
+            default_config={**(answers or {}), **footing_config},
+            no_input=answers is not None,
+        )
+        mock_cache.checkout.assert_called_once_with(template, latest_version)
     assert mock_apply_template.call_args_list == [
         mocker.call(
             old_template or template,
             ".",
             checkout=current_version,
             extra_context=footing_config,
+            cache=mock_cache,
         ),
         mocker.call(
             template,
             ".",
             checkout=latest_version,
             extra_context=footing_config,
+            cache=mock_cache,
         ),
     ]
-    mock_write_config.assert_called_once_with(footing_config, template, latest_version)
+    mock_write_config.assert_called_once_with(
+        footing_config,
+        template,
+        latest_version,
+        tree=mock_apply_template.return_value,
+        path=".",
+    )
     if not old_template:
         mock_cc_configs_have_changed.assert_called_once_with(
-            template, current_version, latest_version
+            template, current_version, latest_version, mock_cache
         )
     else:
         assert not mock_cc_configs_have_changed.called
 
-    assert mock_shell.call_args_list == [
-        mocker.call("git checkout -b _footing_update", stderr=subprocess.DEVNULL),
+    assert mock_run.call_args_list == [
+        mocker.call("checkout", "-b", "_footing_update", stderr=subprocess.DEVNULL),
+        mocker.call("checkout", "--orphan", "_footing_update_temp", stderr=subprocess.DEVNULL),
+        mocker.call("rm", "-rf", ".", stdout=subprocess.DEVNULL),
+        mocker.call("add", "."),
         mocker.call(
-            "git checkout --orphan _footing_update_temp",
-            stderr=subprocess.DEVNULL,
-        ),
-        mocker.call("git rm -rf .", stdout=subprocess.DEVNULL),
-        mocker.call("git add ."),
-        mocker.call(
-            'git commit --no-verify -m "Initialize template from version {}"'.format(
-                current_version
-            ),
+            "commit",
+            "--no-verify",
+            "-m",
+            "Initialize template from version {}".format(current_version),
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         ),
-        mocker.call("git checkout _footing_update", stderr=subprocess.DEVNULL),
+        mocker.call("checkout", "_footing_update", stderr=subprocess.DEVNULL),
         mocker.call(
-            "git merge -s ours --no-edit --allow-unrelated-histories " "_footing_update_temp",
+            "merge",
+            "-s",
+            "ours",
+            "--no-edit",
+            "--allow-unrelated-histories",
+            "_footing_update_temp",
             stderr=subprocess.DEVNULL,
         ),
-        mocker.call("git checkout _footing_update_temp", stderr=subprocess.DEVNULL),
-        mocker.call("git rm -rf .", stdout=subprocess.DEVNULL),
-        mocker.call("git add ."),
+        mocker.call("checkout", "_footing_update_temp", stderr=subprocess.DEVNULL),
+        mocker.call("rm", "-rf", ".", stdout=subprocess.DEVNULL),
+        mocker.call("add", "."),
         mocker.call(
-            'git commit --no-verify -m "Update template to version {}"'.format(latest_version),
+            "commit",
+            "--no-verify",
+            "-m",
+            "Update template to version {}".format(latest_version),
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         ),
-        mocker.call("git checkout _footing_update", stderr=subprocess.DEVNULL),
+        mocker.call("checkout", "_footing_update", stderr=subprocess.DEVNULL),
         mocker.call(
-            "git merge --no-commit _footing_update_temp",
+            "merge",
+            "--no-commit",
+            "_footing_update_temp",
             check=False,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         ),
         mocker.call(
-            "git checkout --theirs footing.yaml",
+            "checkout",
+            "--theirs",
+            "footing.yaml",
             check=False,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         ),
-        mocker.call("git branch -D _footing_update_temp", stdout=subprocess.DEVNULL),
+        mocker.call("branch", "-D", "_footing_update_temp", stdout=subprocess.DEVNULL),
+    ]
+
+
+def test_update_all_wo_projects(mocker, tmpdir):
+    """Tests footing.update.update_all when there are no footing projects"""
+    mocker.patch("footing.check.in_git_repo", autospec=True)
+    mocker.patch("footing.check.in_clean_repo", autospec=True)
+    mocker.patch("footing.check.not_has_branch", autospec=True)
+    mocker.patch("footing.git.runner.output", autospec=True, return_value=str(tmpdir))
+
+    with pytest.raises(footing.exceptions.InvalidFootingProjectError):
+        footing.update.update_all()
+
+
+@pytest.mark.parametrize("configs_changed", [True, False])
+def test_update_all(configs_changed, mocker):
+    """Tests footing.update.update_all groups projects by template and version"""
+    configs = {
+        "a": {"_template": "t1", "_version": "v1", "name": "a"},
+        "b": {"_template": "t1", "_version": "v1", "name": "b"},
+        "c": {"_template": "t1", "_version": "v2", "name": "c"},
+        "d": {"_template": "t2", "_version": "v1", "name": "d"},
+    }
+    mocker.patch("footing.check.in_git_repo", autospec=True)
+    mocker.patch("footing.check.in_clean_repo", autospec=True)
+    mocker.patch("footing.check.not_has_branch", autospec=True)
+    mocker.patch("footing.git.runner.output", autospec=True, return_value=".")
+    mocker.patch("footing.utils.find_footing_projects", autospec=True, return_value=list(configs))
+    mocker.patch("footing.utils.read_footing_config", autospec=True, side_effect=configs.get)
+    mock_get_latest = mocker.patch(
+        "footing.update._get_latest_template_version",
+        autospec=True,
+        side_effect={"t1": "v2", "t2": "v3"}.get,
+    )
+    mocker.patch(
+        "footing.update._template_files_have_changed",
+        autospec=True,
+        side_effect=lambda template, old, new: template == "t1",
+    )
+    mocker.patch(
+        "footing.update._cookiecutter_configs_have_changed",
+        autospec=True,
+        return_value=configs_changed,
+    )
+    mocker.patch(
+        "footing.update._rendered_tree_is_unchanged",
+        autospec=True,
+        side_effect=lambda config, version, cache: config["name"] == "b",
+    )
+    mock_cache = mocker.patch("footing.render.TemplateCache", autospec=True).return_value
+    mock_get_cc_config = mocker.patch(
+        "footing.utils.get_cookiecutter_config",
+        autospec=True,
+        return_value=("repo", {"name": "new"}),
+    )
+    mock_update_branches = mocker.patch("footing.update._update_branches", autospec=True)
+    mock_write_config = mocker.patch("footing.utils.write_footing_config", autospec=True)
+
+    assert footing.update.update_all()
+
+    assert mock_get_latest.call_count == 2
+    new_config = {"name": "new"} if configs_changed else configs["a"]
+    mock_update_branches.assert_called_once_with(
+        [
+            footing.update._ProjectUpdate(
+                path="a",
+                old_template="t1",
+                old_version="v1",
+                old_config=configs["a"],
+                new_template="t1",
+                new_version="v2",
+                new_config=new_config,
+            )
+        ],
+        mock_cache,
+        old_message="Initialize templates of 1 projects",
+        new_message="Update templates of 1 projects",
+    )
+    if configs_changed:
+        mock_get_cc_config.assert_called_once_with(
+            mock_cache.checkout.return_value, default_config=configs["a"], no_input=True
+        )
+    else:
+        assert not mock_get_cc_config.called
+    assert mock_write_config.call_args_list == [
+        mocker.call(configs["b"], "t1", "v2", path="b"),
+        mocker.call(configs["d"], "t2", "v3", path="d"),
     ]
+
+
+def test_update_all_up_to_date(mocker, capsys):
+    """Tests footing.update.update_all when every project is up to date"""
+    mocker.patch("footing.check.in_git_repo", autospec=True)
+    mocker.patch("footing.check.in_clean_repo", autospec=True)
+    mocker.patch("footing.check.not_has_branch", autospec=True)
+    mocker.patch("footing.git.runner.output", autospec=True, return_value=".")
+    mocker.patch("footing.utils.find_footing_projects", autospec=True, return_value=["."])
+    mocker.patch(
+        "footing.utils.read_footing_config",
+        autospec=True,
+        return_value={"_template": "t", "_version": "v"},
+    )
+    mocker.patch("footing.update._get_latest_template_version", autospec=True, return_value="v")
+    mock_update_branches = mocker.patch("footing.update._update_branches", autospec=True)
+
+    assert not footing.update.update_all()
+
+    assert not mock_update_branches.called
+    assert "No updates have happened" in capsys.readouterr().out
+
+
+def test_update_all_w_local_template(local_template, tmp_path, mocker):
+    """Tests footing.update.update_all merges several projects into one update branch"""
+    template, (v1, v2) = local_template
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    def git(*args):
+        return footing.git.runner.output(
+            "-c", "user.name=footing", "-c", "user.email=footing@example.com", *args, cwd=str(repo)
+        )
+
+    git("init", "-q")
+    cache = footing.render.TemplateCache(str(tmp_path / "cache"))
+    for name in ("a", "b"):
+        config = {"repo_name": name}
+        footing.update._apply_template(
+            template, str(repo / name), checkout=v1, extra_context=config, cache=cache
+        )
+        footing.utils.write_footing_config(config, template, v1, path=str(repo / name))
+    (repo / "a" / "README.md").write_text("a\nlocal change\n")
+    git("add", ".")
+    git("commit", "-q", "-m", "Initial commit")
+    mocker.patch("footing.update._get_latest_template_version", autospec=True, return_value=v2)
+
+    with footing.utils.cd(str(repo / "b")):
+        assert footing.update.update_all()
+
+    assert git("rev-parse", "--abbrev-ref", "HEAD") == "_footing_update"
+    assert (repo / "b" / "README.md").read_text() == "b v2\n"
+    for name in ("a", "b"):
+        config = footing.utils.read_footing_config(str(repo / name))
+        assert config["_version"] == v2
+        assert config["_tree"] == cache.tree(template, v2, {"repo_name": name})
+    # Both projects were updated in the same merge
+    assert git("log", "--format=%s", "-1", "MERGE_HEAD") == "Update templates of 2 projects"
+
+
+def test_update_w_trace(local_template, tmp_path, mocker):
+    """Tests the phases of footing.update.update are traced"""
+    template, (v1, v2) = local_template
+    repo = tmp_path / "repo"
+    cache = footing.render.TemplateCache()
+    footing.update._apply_template(
+        template, str(repo), checkout=v1, extra_context={"repo_name": "a"}, cache=cache
+    )
+    footing.utils.write_footing_config({"repo_name": "a"}, template, v1, path=str(repo))
+    runner = footing.git.GitRunner(cwd=str(repo))
+    runner.run("init", "-q")
+    runner.run("add", ".")
+    runner.run(
+        "-c", "user.name=footing", "-c", "user.email=footing@example.com", "commit", "-qm", "1"
+    )
+    mocker.patch("footing.update._get_latest_template_version", autospec=True, return_value=v2)
+    trace_path = tmp_path / "trace.json"
+
+    with footing.utils.cd(str(repo)), footing.trace.tracing(str(trace_path)):
+        assert footing.update.update()
+
+    events = {
+        event["name"]: event
+        for event in json.loads(trace_path.read_text())["traceEvents"]
+        if event["ph"] == "X"
+    }
+    assert {
+        "check project",
+        "latest version",
+        "check unchanged",
+        "compare cookiecutter configs",
+        "apply old templates",
+        "merge old template history",
+        "apply new templates",
+        "merge new templates",
+        "copy files",
+        "renders",
+        "git merge",
+    } <= set(events)
+    assert events["copy files"]["args"] == {
+        "target": ".",
+        "files": 1,
+        "bytes": len("a v2\n"),
+        "subprocesses": 0,
+    }
+    assert events["merge new templates"]["args"]["subprocesses"] == 3
@@ -1,29 +1,39 @@
 """Tests fr footing.utils module"""
 
+import asyncio
 import os
 import subprocess
 
 import pytest
 
 import footing.constants
+import footing.exceptions
 import footing.utils
 
 
 @pytest.mark.parametrize(
-    "cmd, check, stdin, stdout, stderr",
+    "cmd, expected_shell, check, stdin, stdout, stderr",
     [
-        ("cmd", True, subprocess.PIPE, subprocess.PIPE, subprocess.PIPE),
-        ("cmd", False, None, None, None),
+        ("cmd", True, True, subprocess.PIPE, subprocess.PIPE, subprocess.PIPE),
+        ("cmd", True, False, None, None, None),
+        (["cmd", "arg"], False, True, None, None, None),
     ],
 )
-def test_shell(cmd, check, stdin, stdout, stderr, mocker):
+def test_shell(cmd, expected_shell, check, stdin, stdout, stderr, mocker):
     """Tests footing.utils.shell"""
     mock_run = mocker.patch("subprocess.run", autospec=True)
 
     footing.utils.shell(cmd, check=check, stdin=stdin, stdout=stdout, stderr=stderr)
 
     mock_run.assert_called_once_with(
-        cmd, shell=True, check=check, stdin=stdin, stdout=stdout, stderr=stderr
+        cmd,
+        shell=expected_shell,
+        check=check,
+        stdin=stdin,
+        stdout=stdout,
+        stderr=stderr,
+        cwd=None,
+        timeout=None,
     )
 
 
@@ -37,6 +47,33 @@ def test_cd(fs):
     assert os.getcwd() == orig_cwd
 
 
+def test_get_cache_dir(mocker, tmpdir):
+    """Tests footing.utils.get_cache_dir"""
+    mocker.patch.dict(os.environ, {"XDG_CACHE_HOME": str(tmpdir)})
+    del os.environ[footing.constants.FOOTING_CACHE_DIR_ENV_VAR]
+    assert footing.utils.get_cache_dir() == os.path.join(str(tmpdir), "footing")
+    assert os.path.isdir(os.path.join(str(tmpdir), "footing"))
+
+    os.environ[footing.constants.FOOTING_CACHE_DIR_ENV_VAR] = str(tmpdir.join("custom"))
+    assert footing.utils.get_cache_dir() == str(tmpdir.join("custom"))
+
+
+def test_find_footing_projects(fs):
+    """Tests footing.utils.find_footing_projects with a fake file system"""
+    fs.create_file("/repo/footing.yaml")
+    fs.create_file("/repo/services/a/footing.yaml")
+    fs.create_file("/repo/services/b/footing.yaml")
+    fs.create_file("/repo/services/c/README.md")
+    fs.create_file("/repo/.git/footing.yaml")
+    fs.create_file("/repo/node_modules/pkg/footing.yaml")
+    fs.create_file("/repo/venv/pyvenv.cfg")
+    fs.create_file("/repo/venv/lib/pkg/footing.yaml")
+    fs.create_symlink("/repo/link", "/repo/services")
+
+    assert footing.utils.find_footing_projects("/repo") == [".", "services/a", "services/b"]
+    assert footing.utils.find_footing_projects("/missing") == []
+
+
 def test_read_footing_config(fs):
     """Tests footing.utils.read_footing_config with a fake file system"""
     footing_config_yaml = (
@@ -51,6 +88,26 @@ def test_read_footing_config(fs):
     }
 
 
+@pytest.mark.parametrize(
+    "contents, expected_error",
+    [
+        ("_template: t\n_version: v\n", None),
+        ("_template: [t\n", "Invalid footing.yaml"),
+        ("_version: v\n", 'footing.yaml has no "_template" or "_version"'),
+        ("t\n", 'footing.yaml has no "_template" or "_version"'),
+    ],
+)
+def test_read_valid_footing_config(contents, expected_error, fs):
+    """Tests footing.utils.read_valid_footing_config rejects invalid configs"""
+    fs.create_file("footing.yaml", contents=contents)
+
+    if expected_error:
+        with pytest.raises(footing.exceptions.InvalidFootingProjectError, match=expected_error):
+            footing.utils.read_valid_footing_config()
+    else:
+        assert footing.utils.read_valid_footing_config() == {"_template": "t", "_version": "v"}
+
+
 def test_write_footing_config(fs):
     """Tests footing.utils.write_footing_config with a fake file system"""
     footing.utils.write_footing_config(
@@ -72,14 +129,27 @@ def test_write_footing_config(fs):
         }
 
 
+def test_write_footing_config_w_tree(fs):
+    """Tests footing.utils.write_footing_config records the rendered tree"""
+    footing.utils.write_footing_config({"repo_name": "repo_name"}, "t", "version", tree="tree")
+
+    assert footing.utils.read_footing_config() == {
+        "_template": "t",
+        "_tree": "tree",
+        "_version": "version",
+        "repo_name": "repo_name",
+    }
+
+
 @pytest.mark.parametrize(
-    "default_config",
+    "default_config, no_input",
     [
-        None,
-        {"my": "config"},
+        (None, False),
+        ({"my": "config"}, False),
+        ({"my": "config"}, True),
     ],
 )
-def test_get_cookiecutter_config(default_config, mocker):
+def test_get_cookiecutter_config(default_config, no_input, mocker):
     """Tests footing.utils.get_cookiecutter_config"""
     default_context = {"default": "context"}
     generated_context = {"generated": "context"}
@@ -111,7 +181,9 @@ def test_get_cookiecutter_config(default_config, mocker):
         return_value=prompted_context,
     )
 
-    assert footing.utils.get_cookiecutter_config("t", default_config=default_config) == (  # noqa
+    assert footing.utils.get_cookiecutter_config(
+        "t", default_config=default_config, no_input=no_input
+    ) == (
         "repo_dir",
         prompted_context,
     )
@@ -130,7 +202,7 @@ def test_get_cookiecutter_config(default_config, mocker):
             **default_context,
         },
     )
-    mock_prompt_for_conf.assert_called_once_with(generated_context)
+    mock_prompt_for_conf.assert_called_once_with(generated_context, no_input=no_input)
 
 
 def test_set_cmd_env_var():
@@ -162,3 +234,14 @@ def test_set_cmd_env_var():
         assert os.environ[footing.constants.FOOTING_ENV_VAR] == "testvalue"
     finally:
         os.environ.pop(footing.constants.FOOTING_ENV_VAR, None)
+
+
+def test_shell_async():
+    """Tests footing.utils.shell_async checks processes and kills them when they time out"""
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(footing.utils.shell_async(["sleep", "30"], timeout=0.1))
+
+    ret = asyncio.run(footing.utils.shell_async(["echo", "out"], stdout=subprocess.PIPE))
+    assert ret.stdout == b"out\n"
+    with pytest.raises(subprocess.CalledProcessError):
+        asyncio.run(footing.utils.shell_async(["false"]))
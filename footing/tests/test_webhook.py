@@ -0,0 +1,150 @@
+"""Tests for footing.webhook module"""
+
+import hashlib
+import hmac
+import os
+
+import pytest
+
+import footing.exceptions
+import footing.forge
+import footing.index
+import footing.render
+import footing.webhook
+
+
+def _github_payload(template, sha, ref="refs/heads/main"):
+    return {
+        "ref": ref,
+        "after": sha,
+        "repository": {"ssh_url": template, "default_branch": "main"},
+    }
+
+
+@pytest.mark.parametrize(
+    "payload, expected_push",
+    [
+        (
+            _github_payload("git@github.com:org/t.git", "abc"),
+            footing.webhook.Push("git@github.com:org/t.git", "abc", "refs/heads/main", "main"),
+        ),
+        (
+            {
+                "object_kind": "push",
+                "ref": "refs/heads/dev",
+                "checkout_sha": None,
+                "project": {"git_ssh_url": "git@gitlab.com:g/t.git", "default_branch": "main"},
+            },
+            footing.webhook.Push("git@gitlab.com:g/t.git", "", "refs/heads/dev", "main"),
+        ),
+        pytest.param(
+            {"ref": "refs/heads/main"},
+            None,
+            marks=pytest.mark.xfail(raises=footing.exceptions.InvalidWebhookError),
+        ),
+    ],
+)
+def test_parse_push(payload, expected_push):
+    """Tests footing.webhook.parse_push"""
+    assert footing.webhook.parse_push(payload) == expected_push
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        (
+            {
+                "X-Hub-Signature-256": "sha256="
+                + hmac.new(b"secret", b"body", hashlib.sha256).hexdigest()
+            },
+            True,
+        ),
+        ({"X-Hub-Signature-256": "sha256=invalid"}, False),
+        ({"X-Gitlab-Token": "secret"}, True),
+        ({"X-Gitlab-Token": "invalid"}, False),
+        ({}, False),
+    ],
+)
+def test_verify_signature(headers, expected):
+    """Tests footing.webhook.verify_signature"""
+    assert footing.webhook.verify_signature(b"body", headers, "secret") == expected
+
+
+@pytest.mark.parametrize(
+    "template, expected_forge",
+    [
+        ("git@github.com:org/t.git", "github.com/org"),
+        ("git@gitlab.com:group/sub/t.git", "gitlab.com/group/sub"),
+    ],
+)
+def test_get_forge(template, expected_forge):
+    """Tests footing.webhook.get_forge"""
+    assert footing.webhook.get_forge(template) == expected_forge
+
+
+@pytest.mark.parametrize("offline", [True, False])
+def test_handle_push(offline, local_template, mocker):
+    """Tests footing.webhook.handle_push renders every distinct context once"""
+    template, (v1, v2) = local_template
+    projects = {"p1": "", "p2": "", "p3": "", "p4": "", "p5": ""}
+    mocker.patch("footing.ls.ls", autospec=True, return_value=projects)
+    mocker.patch("footing.index.Index.ls", autospec=True, return_value=projects)
+    mocker.patch.object(
+        footing.forge.Github,
+        "get_footing_configs_async",
+        autospec=True,
+        return_value={
+            "p1": {"_template": template, "_version": v1, "repo_name": "a"},
+            "p2": {"_template": template, "_version": v1, "repo_name": "a"},
+            "p3": {"_template": template, "_version": v1, "repo_name": "b"},
+            "p4": {"_template": "other", "_version": v1, "repo_name": "c"},
+            "p5": None,
+        },
+    )
+    mock_render = mocker.spy(footing.render.TemplateCache, "render")
+
+    result = footing.webhook.handle_push(
+        _github_payload(template, v2), forge="github.com/org", offline=offline
+    )
+
+    assert result == footing.webhook.WebhookResult(template, v2, list(projects), renders=4)
+    assert sorted(
+        (call.args[2], call.args[3]["repo_name"]) for call in mock_render.call_args_list
+    ) == sorted([(v1, "a"), (v2, "a"), (v1, "b"), (v2, "b")])
+
+    # Updates render from the cache
+    cache = footing.render.TemplateCache()
+    render_dir = cache.render(template, v2, {"repo_name": "b"})
+    with open(os.path.join(render_dir, "README.md")) as f:
+        assert f.read() == "b v2\n"
+    assert footing.index.Index().get_latest_version(template) == v2
+
+
+def test_handle_push_w_render_error(local_template, mocker):
+    """Tests a failed render does not stop other renders"""
+    template, (v1, v2) = local_template
+    mocker.patch("footing.ls.ls", autospec=True, return_value={"p1": ""})
+    mocker.patch.object(
+        footing.forge.Github,
+        "get_footing_configs_async",
+        autospec=True,
+        return_value={"p1": {"_template": template, "_version": "missing", "repo_name": "a"}},
+    )
+
+    result = footing.webhook.handle_push(_github_payload(template, v2), forge="github.com/org")
+
+    assert result.renders == 1
+    assert result.errors == [mocker.ANY]
+    assert result.errors[0].startswith("missing: ")
+
+
+@pytest.mark.parametrize(
+    "ref, sha",
+    [("refs/heads/dev", "abc"), ("refs/heads/main", "0" * 40)],
+)
+def test_handle_push_ignored(ref, sha, mocker):
+    """Tests pushes to other branches and deleted branches are ignored"""
+    mock_cache = mocker.patch("footing.render.TemplateCache", autospec=True)
+
+    assert footing.webhook.handle_push(_github_payload("git@github.com:o/t.git", sha, ref)) is None
+    assert not mock_cache.called
@@ -0,0 +1,237 @@
+"""Pools of Github API tokens.
+
+Github limits each token to a number of API requests per hour. A `TokenPool`
+spreads requests over several tokens so that bulk commands, such as listing
+large organizations or reading the footing.yaml of every project, can make as
+many requests as the pool allows in total.
+
+Tokens are configured with environment variables:
+
+* `footing.constants.GITHUB_API_TOKEN_ENV_VAR` - A single personal access token
+* `footing.constants.GITHUB_API_TOKENS_ENV_VAR` - Comma-separated personal access tokens
+* `footing.constants.GITHUB_APP_ID_ENV_VAR`,
+  `footing.constants.GITHUB_APP_PRIVATE_KEY_ENV_VAR`, and
+  `footing.constants.GITHUB_APP_INSTALLATION_IDS_ENV_VAR` - A Github App whose
+  installation tokens are minted from a local private key. Requires
+  [PyJWT](https://pyjwt.readthedocs.io) with its ``crypto`` extra.
+
+Each request uses the token with the most remaining requests. The remaining
+requests and reset time of a token are read from Github's rate limit headers.
+Exhausted tokens are skipped until their limit resets. Installation tokens
+are minted outside of the lock of the pool, so a refresh only holds up the
+requests that use the same token.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import functools
+import os
+import threading
+import time
+from typing import Callable
+
+import requests
+
+import footing.constants
+import footing.exceptions
+import footing.forge
+
+
+@dataclasses.dataclass
+class Token:
+    """A Github API token and its rate limit
+
+    Attributes:
+        value: The token. Tokens of Github App installations are minted when first used.
+        mint: A callable returning a new token and its expiry time in epoch seconds.
+            Only used by Github App installations.
+        expires_at: When a minted token expires in epoch seconds
+        remaining: The remaining requests of the token
+        reset_at: When the rate limit of the token resets in epoch seconds
+    """
+
+    value: str | None = None
+    mint: Callable[[], tuple[str, float]] | None = dataclasses.field(default=None, repr=False)
+    expires_at: float | None = None
+    remaining: int = footing.constants.GITHUB_RATE_LIMIT
+    reset_at: float = 0.0
+    _mint_lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def _is_expired(self, now: float) -> bool:
+        return bool(self.mint) and (not self.value or (self.expires_at or 0) - 60 < now)
+
+    def is_exhausted(self, now: float) -> bool:
+        """True when the token has no remaining requests until its limit resets"""
+        return self.remaining <= 0 and self.reset_at > now
+
+    def get_value(self, now: float) -> str:
+        """Returns the token, minting a new one when an installation token expires
+
+        Concurrent callers of an expired token wait for a single mint.
+        """
+        if self._is_expired(now):
+            with self._mint_lock:
+                if self._is_expired(now):
+                    self.value, self.expires_at = self.mint()  # type: ignore
+
+        return self.value  # type: ignore
+
+
+def is_rate_limited(resp: requests.Response) -> bool:
+    """True when a Github API response was refused because of a rate limit"""
+    return (
+        resp.status_code in (requests.codes.forbidden, requests.codes.too_many_requests)
+        and resp.headers.get("X-RateLimit-Remaining") == "0"
+    )
+
+
+class TokenPool:
+    """A pool of Github API tokens that spreads requests by remaining rate limit
+
+    Args:
+        tokens: The tokens of the pool
+    """
+
+    def __init__(self, tokens: list[Token]):
+        self.tokens = tokens
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def acquire(self) -> tuple[Token, str]:
+        """Chooses the token for the next request
+
+        The token with the most remaining requests is used. One request is
+        counted immediately, so concurrent requests are spread over the pool.
+        When every token is exhausted, the token that resets first is used.
+
+        Returns:
+            The token and its value
+        """
+        now = time.time()
+        with self._lock:
+            available = [token for token in self.tokens if not token.is_exhausted(now)]
+            if available:
+                token = max(available, key=lambda token: token.remaining)
+            else:
+                token = min(self.tokens, key=lambda token: token.reset_at)
+            token.remaining -= 1
+
+        return token, token.get_value(now)
+
+    def update(self, token: Token, resp: requests.Response) -> None:
+        """Records the rate limit of a token from the headers of a response"""
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        reset_at = resp.headers.get("X-RateLimit-Reset")
+        with self._lock:
+            if remaining is not None:
+                token.remaining = int(remaining)
+            if reset_at is not None:
+                token.reset_at = float(reset_at)
+
+
+def _create_app_jwt(app_id: str, private_key: str) -> str:  # pragma: no cover
+    """Creates the JSON web token that authenticates a Github App"""
+    try:
+        import jwt
+    except ImportError as exc:
+        raise footing.exceptions.InvalidEnvironmentError(
+            'Github App authentication requires PyJWT. Install it with "pip install pyjwt[crypto]"'
+        ) from exc
+
+    now = int(time.time())
+    # Github rejects tokens issued in the future, so clock drift is allowed for
+    payload = {"iat": now - 60, "exp": now + 540, "iss": app_id}
+    return jwt.encode(payload, private_key, algorithm="RS256")
+
+
+def mint_installation_token(app_id: str, private_key: str, installation_id: str):
+    """Mints an access token of a Github App installation
+
+    The request is sent with the shared session of `footing.forge.get_session`.
+
+    Returns:
+        tuple: The token and its expiry time in epoch seconds
+    """
+    resp = footing.forge.get_session().post(
+        "{}/app/installations/{}/access_tokens".format(
+            footing.constants.GITHUB_API_URL, installation_id
+        ),
+        headers={
+            "Authorization": "Bearer {}".format(_create_app_jwt(app_id, private_key)),
+            "Accept": "application/vnd.github+json",
+        },
+    )
+    resp.raise_for_status()
+
+    data = resp.json()
+    expires_at = datetime.datetime.strptime(data["expires_at"], "%Y-%m-%dT%H:%M:%SZ")
+    return data["token"], expires_at.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+def _split(value: str | None) -> tuple[str, ...]:
+    return tuple(item.strip() for item in (value or "").split(",") if item.strip())
+
+
+@functools.lru_cache(maxsize=None)
+def _create_pool(tokens: tuple[str, ...], app: tuple[str, str, tuple[str, ...]] | None):
+    pool = [Token(token) for token in tokens]
+    if app:
+        app_id, private_key_path, installation_ids = app
+        with open(private_key_path) as f:
+            private_key = f.read()
+
+        pool += [
+            Token(
+                mint=functools.partial(
+                    mint_installation_token, app_id, private_key, installation_id
+                )
+            )
+            for installation_id in installation_ids
+        ]
+
+    return TokenPool(pool)
+
+
+def get_pool() -> TokenPool:
+    """Returns the token pool of the configured environment variables
+
+    Pools are shared by every call with the same configuration, so the rate
+    limits of tokens are tracked for the life of the process.
+
+    Raises:
+        `InvalidEnvironmentError`: When no tokens are configured
+    """
+    tokens = tuple(
+        dict.fromkeys(
+            _split(os.environ.get(footing.constants.GITHUB_API_TOKEN_ENV_VAR))
+            + _split(os.environ.get(footing.constants.GITHUB_API_TOKENS_ENV_VAR))
+        )
+    )
+    app_id = os.environ.get(footing.constants.GITHUB_APP_ID_ENV_VAR)
+    private_key_path = os.environ.get(footing.constants.GITHUB_APP_PRIVATE_KEY_ENV_VAR)
+    installation_ids = _split(
+        os.environ.get(footing.constants.GITHUB_APP_INSTALLATION_IDS_ENV_VAR)
+    )
+    app = (
+        (app_id, private_key_path, installation_ids)
+        if app_id and private_key_path and installation_ids
+        else None
+    )
+
+    if not tokens and not app:
+        msg = (
+            "Must set {} or {} environment variable. View docs for setting up environment at {}"
+        ).format(
+            footing.constants.GITHUB_API_TOKEN_ENV_VAR,
+            footing.constants.GITHUB_API_TOKENS_ENV_VAR,
+            footing.constants.FOOTING_DOCS_URL,
+        )
+        raise footing.exceptions.InvalidEnvironmentError(msg)
+
+    return _create_pool(tokens, app)
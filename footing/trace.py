@@ -0,0 +1,157 @@
+"""Records timing spans of footing commands in Chrome trace-event format.
+
+Phases of `footing.update.update`, `footing.setup.setup`, the
+`footing.render.TemplateCache`, and the calls of `footing.forge.Forge`
+clients are recorded as spans with `span`. Every subprocess spawned with
+`footing.utils.shell` or `footing.utils.shell_async`, such as git calls, is also
+a span. Spans record:
+
+* Their duration and thread
+* ``subprocesses`` - The processes spawned while the span was open
+* Values that the phase adds, such as the ``files`` and ``bytes`` it copied
+
+Spans are only recorded inside of `tracing`, which is entered by
+``footing --trace out.json``. The file can be opened with a trace viewer,
+such as ``chrome://tracing`` or [Perfetto](https://ui.perfetto.dev).
+Outside of `tracing`, spans cost a single check.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import json
+import os
+import threading
+import time
+
+
+@dataclasses.dataclass
+class Span:
+    """A timed phase of a footing command
+
+    Attributes:
+        name: The name of the phase
+        category: The kind of phase, such as "update", "forge", or "subprocess"
+        start: When the span started, in seconds since the trace started
+        duration: The duration of the span in seconds
+        thread_id: The thread that ran the span
+        args: The values recorded by the span
+    """
+
+    name: str
+    category: str
+    start: float
+    duration: float
+    thread_id: int
+    args: dict
+
+
+class Tracer:
+    """Collects the spans of a trace"""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self.thread_names: dict[int, str] = {}
+        self.subprocesses = 0
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, **args):
+        """Records a span for the duration of the context
+
+        Yields:
+            dict: The values of the span. Phases may add to it.
+        """
+        thread = threading.current_thread()
+        with self._lock:
+            self.thread_names[thread.ident] = thread.name  # type: ignore
+            if category == "subprocess":
+                self.subprocesses += 1
+            subprocesses = self.subprocesses
+
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                if category != "subprocess":
+                    args["subprocesses"] = self.subprocesses - subprocesses
+                self.spans.append(
+                    Span(name, category, start - self._origin, duration, thread.ident, args)  # type: ignore
+                )
+
+    def to_chrome(self) -> dict:
+        """Returns the trace in Chrome trace-event format"""
+        pid = os.getpid()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+            thread_names = dict(self.thread_names)
+
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in thread_names.items()
+        ]
+        events += [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round(span.start * 1e6, 3),
+                "dur": round(span.duration * 1e6, 3),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.args,
+            }
+            for span in spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str) -> None:
+        """Writes the trace to a file in Chrome trace-event format"""
+        with open(path, "w") as f:
+            json.dump(self.to_chrome(), f, default=str)
+
+
+#: The tracer of the current `tracing` context
+_tracer: Tracer | None = None
+
+
+def is_enabled() -> bool:
+    """True inside of `tracing`. Phases use it to skip measurements that are not free"""
+    return _tracer is not None
+
+
+@contextlib.contextmanager
+def span(name: str, category: str = "footing", **args):
+    """Records a span of a phase when tracing
+
+    Can be used as a context manager or decorator. As a context manager, it
+    yields a dict of the values of the span, which the phase may add to.
+    """
+    tracer = _tracer
+    if not tracer:
+        yield args
+        return
+
+    with tracer.span(name, category, **args) as span_args:
+        yield span_args
+
+
+@contextlib.contextmanager
+def tracing(path: str):
+    """Records the spans of the context and writes them to ``path``
+
+    The trace is written even when the context raises. Spans of the worker
+    processes of `footing.fleet.update` are not recorded.
+    """
+    global _tracer
+
+    tracer = _tracer = Tracer()
+    try:
+        yield tracer
+    finally:
+        _tracer = None
+        tracer.write(path)
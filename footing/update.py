@@ -2,23 +2,25 @@
 
 from __future__ import annotations
 
-import json
+import collections
+import concurrent.futures
+import dataclasses
 import os
 import shutil
 import subprocess
-import tempfile
 import textwrap
 
-import cookiecutter.main as cc_main
-import cookiecutter.vcs as cc_vcs
-
 import footing.check
 import footing.constants
+import footing.exceptions
 import footing.forge
+import footing.git
+import footing.render
+import footing.trace
 import footing.utils
 
 
-def _cookiecutter_configs_have_changed(template, old_version, new_version):
+def _cookiecutter_configs_have_changed(template, old_version, new_version, cache):
     """Given an old version and new version, check if the cookiecutter.json files have changed
 
     When the cookiecutter.json files change, it means the user will need to be prompted for
@@ -28,34 +30,23 @@ def _cookiecutter_configs_have_changed(template, old_version, new_version):
         template (str): The git path to the template
         old_version (str): The git SHA of the old version
         new_version (str): The git SHA of the new version
+        cache (footing.render.TemplateCache): The cache used for checking out the template
 
     Returns:
         bool: True if the cookiecutter.json files have been changed in the old and new versions
     """
-    with tempfile.TemporaryDirectory() as clone_dir:
-        repo_dir = cc_vcs.clone(template, old_version, clone_dir)
-        old_config = json.load(open(os.path.join(repo_dir, "cookiecutter.json")))
-        subprocess.check_call(
-            "git checkout %s" % new_version,
-            cwd=repo_dir,
-            shell=True,
-            stderr=subprocess.PIPE,
-        )
-        new_config = json.load(open(os.path.join(repo_dir, "cookiecutter.json")))
+    return cache.config(template, old_version) != cache.config(template, new_version)
 
-    return old_config != new_config
 
+def _apply_template(template, target, *, checkout, extra_context, cache):
+    """Render a template with the cache and then copy results to target.
 
-def _apply_template(template, target, *, checkout, extra_context):
-    """Apply a template to a temporary directory and then copy results to target."""
-    with tempfile.TemporaryDirectory() as tempdir:
-        repo_dir = cc_main.cookiecutter(
-            template,
-            checkout=checkout,
-            no_input=True,
-            output_dir=tempdir,
-            extra_context=extra_context,
-        )
+    Returns:
+        str: The git tree hash of the rendered template
+    """
+    repo_dir = cache.render(template, checkout, extra_context)
+    os.makedirs(target, exist_ok=True)
+    with footing.trace.span("copy files", "update", target=target) as span_args:
         for item in os.listdir(repo_dir):
             src = os.path.join(repo_dir, item)
             dst = os.path.join(target, item)
@@ -68,6 +59,80 @@ def _apply_template(template, target, *, checkout, extra_context):
                     os.remove(dst)
                 shutil.copy2(src, dst)
 
+        if footing.trace.is_enabled():
+            sizes = [
+                os.path.getsize(os.path.join(root, name))
+                for root, _, names in os.walk(repo_dir)
+                for name in names
+            ]
+            span_args.update(files=len(sizes), bytes=sum(sizes))
+
+    return cache.tree(template, checkout, extra_context)
+
+
+def _rendered_tree_is_unchanged(footing_config, version, cache):
+    """Returns True if rendering ``version`` of the template produces the recorded tree
+
+    The tree hash of the rendered template is recorded as ``_tree`` in footing.yaml
+    during updates. Projects without a recorded tree are always considered changed,
+    as are projects whose cookiecutter.json has changed since they may need new
+    parameters.
+    """
+    tree = footing_config.get("_tree")
+    if not tree:
+        return False
+
+    template = footing_config["_template"]
+    if _cookiecutter_configs_have_changed(template, footing_config["_version"], version, cache):
+        return False
+
+    return cache.tree(template, version, footing_config) == tree
+
+
+def _is_template_file(path):
+    """Returns True if a path in a template repository can affect rendered projects
+
+    These are the cookiecutter template directory (e.g. ``{{cookiecutter.repo_name}}``),
+    ``cookiecutter.json``, and the ``hooks`` directory.
+    """
+    top_level = path.split("/")[0]
+    return (
+        path == "cookiecutter.json"
+        or top_level == "hooks"
+        or ("{{" in top_level and "cookiecutter" in top_level)
+    )
+
+
+def _template_files_have_changed(template, old_version, new_version):
+    """Uses the forge API to check if any template files changed between two versions
+
+    The check is conservative. True is returned when the changed files cannot be
+    determined, for example when the template is not hosted on a supported forge or
+    when no API token is configured.
+    """
+    try:
+        client = footing.forge.from_path(template)
+    except footing.exceptions.InvalidForgeError:
+        return True
+
+    changed_files = client.get_changed_files(template, old_version, new_version)
+    return changed_files is None or any(_is_template_file(path) for path in changed_files)
+
+
+def _get_unchanged_reason(footing_config, new_version, cache):
+    """Returns why a project is effectively up to date with ``new_version`` or None if it isn't
+
+    The forge is first asked if any template files have changed. If they have, the
+    new version is rendered and compared with the tree recorded in footing.yaml.
+    """
+    template = footing_config["_template"]
+    if not _template_files_have_changed(template, footing_config["_version"], new_version):
+        return "No template files have changed"
+    elif _rendered_tree_is_unchanged(footing_config, new_version, cache):
+        return "The rendered template has not changed"
+    else:
+        return None
+
 
 def _get_latest_template_version(template):
     """Obtains the latest template version from the appropriate git forge"""
@@ -76,7 +141,55 @@ def _get_latest_template_version(template):
 
 
 @footing.utils.set_cmd_env_var("update")
-def up_to_date(version: str | None = None) -> bool:
+def status(
+    version: str | None = None,
+    rendered: bool = False,
+    path: str = ".",
+    footing_config: dict | None = None,
+) -> str:
+    """Returns the status of a footing project relative to the template
+
+    Note that the `footing.constants.FOOTING_ENV_VAR` is set to 'update' for the duration of this
+    function.
+
+    Args:
+        version: Check against this git SHA or branch of the template
+        rendered: When the versions differ, ask the forge if any template files changed
+            between the versions. If they did, render ``version`` (or the latest version)
+            of the template and compare it against the rendered tree recorded in footing.yaml.
+        path: The directory of the footing project
+        footing_config: The contents of the footing.yaml of the project when already read
+
+    Returns:
+        `footing.constants.UP_TO_DATE` if up to date with ``version`` (or latest version),
+        `footing.constants.EFFECTIVELY_UP_TO_DATE` if ``rendered`` is True and the
+        rendered template has not changed, or `footing.constants.OUT_OF_DATE` otherwise.
+
+    Raises:
+        `NotInGitRepoError`: When running outside of a git repo
+        `InvalidFootingProjectError`: When not inside a valid footing repository
+    """
+    footing.check.in_git_repo(path)
+    footing.check.is_footing_project(path)
+
+    footing_config = footing_config or footing.utils.read_footing_config(path)
+    old_template_version = footing_config["_version"]
+    new_template_version = version or _get_latest_template_version(footing_config["_template"])
+
+    if new_template_version == old_template_version:
+        return footing.constants.UP_TO_DATE
+    elif rendered and _get_unchanged_reason(
+        footing_config, new_template_version, footing.render.TemplateCache()
+    ):
+        return footing.constants.EFFECTIVELY_UP_TO_DATE
+    else:
+        return footing.constants.OUT_OF_DATE
+
+
+@footing.utils.set_cmd_env_var("update")
+def up_to_date(
+    version: str | None = None, path: str = ".", footing_config: dict | None = None
+) -> bool:
     """Checks if a footing project is up to date with the repo
 
     Note that the `footing.constants.FOOTING_ENV_VAR` is set to 'update' for the duration of this
@@ -84,6 +197,8 @@ def up_to_date(version: str | None = None) -> bool:
 
     Args:
         version: Update against this git SHA or branch of the template
+        path: The directory of the footing project
+        footing_config: The contents of the footing.yaml of the project when already read
 
     Returns:
         True if up to date with ``version`` (or latest version), False otherwise
@@ -92,17 +207,81 @@ def up_to_date(version: str | None = None) -> bool:
         `NotInGitRepoError`: When running outside of a git repo
         `InvalidFootingProjectError`: When not inside a valid footing repository
     """
-    footing.check.in_git_repo()
-    footing.check.is_footing_project()
+    return (
+        status(version=version, path=path, footing_config=footing_config)
+        == footing.constants.UP_TO_DATE
+    )
 
-    footing_config = footing.utils.read_footing_config()
-    old_template_version = footing_config["_version"]
-    new_template_version = version or _get_latest_template_version(footing_config["_template"])
 
-    return new_template_version == old_template_version
+@footing.utils.set_cmd_env_var("check-all")
+def check_all(root: str = ".") -> list[dict]:
+    """Checks if every footing project under a directory is up to date
+
+    Projects are found with `footing.utils.find_footing_projects`, and the
+    footing.yaml of each project is read once. The latest version of each
+    template is obtained once, concurrently with other templates. Projects are
+    then checked with `up_to_date` in place.
 
+    Note that the `footing.constants.FOOTING_ENV_VAR` is set to 'check-all' for the
+    duration of this function.
+
+    Args:
+        root: The directory to search for footing projects
 
-def _needs_new_cc_config_for_update(old_template, old_version, new_template, new_version):
+    Returns:
+        A list with the path, template, version, latest version, and up to date status
+        of every project. ``up_to_date`` is None and ``error`` is set when a project
+        could not be checked, such as when its footing.yaml is invalid.
+    """
+    paths = footing.utils.find_footing_projects(root)
+    configs = {}
+    errors = {}
+    for path in paths:
+        try:
+            configs[path] = footing.utils.read_valid_footing_config(os.path.join(root, path))
+        except (OSError, footing.exceptions.Error) as exc:
+            errors[path] = str(exc)
+
+    templates = sorted({config["_template"] for config in configs.values()})
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=footing.constants.FORGE_API_MAX_WORKERS
+    ) as executor:
+        latest_versions = {
+            template: executor.submit(_get_latest_template_version, template)
+            for template in templates
+        }
+
+    results = []
+    for path in paths:
+        config = configs.get(path, {})
+        result = {
+            "path": path,
+            "template": config.get("_template"),
+            "version": config.get("_version"),
+            "latest_version": None,
+            "up_to_date": None,
+            "error": errors.get(path),
+        }
+        if path in errors:
+            results.append(result)
+            continue
+
+        try:
+            result["latest_version"] = latest_versions[config["_template"]].result()
+            result["up_to_date"] = up_to_date(
+                version=result["latest_version"],
+                path=os.path.join(root, path),
+                footing_config=config,
+            )
+        except footing.exceptions.Error as exc:
+            result["error"] = str(exc)
+
+        results.append(result)
+
+    return results
+
+
+def _needs_new_cc_config_for_update(old_template, old_version, new_template, new_version, cache):
     """
     Given two templates and their respective versions, return True if a new cookiecutter
     config needs to be obtained from the user
@@ -110,7 +289,148 @@ def _needs_new_cc_config_for_update(old_template, old_version, new_template, new
     if old_template != new_template:
         return True
     else:
-        return _cookiecutter_configs_have_changed(new_template, old_version, new_version)
+        return _cookiecutter_configs_have_changed(new_template, old_version, new_version, cache)
+
+
+@dataclasses.dataclass
+class _ProjectUpdate:
+    """An update of the footing project in the ``path`` directory"""
+
+    path: str
+    old_template: str
+    old_version: str
+    old_config: dict
+    new_template: str
+    new_version: str
+    new_config: dict
+
+
+def _update_branches(project_updates, cache, *, old_message, new_message):
+    """Merges the old and new templates of projects into the update branch
+
+    1. Create an update branch from HEAD
+    2. Create an empty template branch with new copies of the old templates
+    3. Merge the history of the template branch into the update branch
+    4. Replace the old templates with new copies of the new templates in the template branch
+    5. Merge the updated template branch into the update branch
+    6. Ensure the footing.yaml files reflect what is in the template branch
+    7. Remove the template branch
+    """
+    update_branch = footing.constants.UPDATE_BRANCH_NAME
+    temp_update_branch = footing.constants.TEMP_UPDATE_BRANCH_NAME
+
+    print("Creating branch {} for processing the update".format(update_branch))
+    footing.git.runner.run("checkout", "-b", update_branch, stderr=subprocess.DEVNULL)
+
+    print("Creating temporary working branch {}".format(temp_update_branch))
+    with footing.trace.span("apply old templates", "update"):
+        footing.git.runner.run(
+            "checkout", "--orphan", temp_update_branch, stderr=subprocess.DEVNULL
+        )
+        footing.git.runner.run("rm", "-rf", ".", stdout=subprocess.DEVNULL)
+        for project_update in project_updates:
+            _apply_template(
+                project_update.old_template,
+                project_update.path,
+                checkout=project_update.old_version,
+                extra_context=project_update.old_config,
+                cache=cache,
+            )
+        footing.git.runner.run("add", ".")
+        footing.git.runner.run(
+            "commit",
+            "--no-verify",
+            "-m",
+            old_message,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    print("Merge old template history into update branch.")
+    with footing.trace.span("merge old template history", "update"):
+        footing.git.runner.run("checkout", update_branch, stderr=subprocess.DEVNULL)
+        footing.git.runner.run(
+            "merge",
+            "-s",
+            "ours",
+            "--no-edit",
+            "--allow-unrelated-histories",
+            temp_update_branch,
+            stderr=subprocess.DEVNULL,
+        )
+
+    print("Update template in temporary branch.")
+    with footing.trace.span("apply new templates", "update"):
+        footing.git.runner.run("checkout", temp_update_branch, stderr=subprocess.DEVNULL)
+        footing.git.runner.run("rm", "-rf", ".", stdout=subprocess.DEVNULL)
+        for project_update in project_updates:
+            tree = _apply_template(
+                project_update.new_template,
+                project_update.path,
+                checkout=project_update.new_version,
+                extra_context=project_update.new_config,
+                cache=cache,
+            )
+            footing.utils.write_footing_config(
+                project_update.new_config,
+                project_update.new_template,
+                project_update.new_version,
+                tree=tree,
+                path=project_update.path,
+            )
+
+        footing.git.runner.run("add", ".")
+        footing.git.runner.run(
+            "commit",
+            "--no-verify",
+            "-m",
+            new_message,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    print("Merge updated template into update branch.")
+    with footing.trace.span("merge new templates", "update"):
+        footing.git.runner.run("checkout", update_branch, stderr=subprocess.DEVNULL)
+        footing.git.runner.run(
+            "merge",
+            "--no-commit",
+            temp_update_branch,
+            check=False,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        # The footing.yaml files should always reflect what is in the new template
+        footing.git.runner.run(
+            "checkout",
+            "--theirs",
+            *[
+                os.path.normpath(
+                    os.path.join(project_update.path, footing.constants.FOOTING_CONFIG_FILE)
+                )
+                for project_update in project_updates
+            ],
+            check=False,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    print("Remove temporary template branch {}".format(temp_update_branch))
+    footing.git.runner.run("branch", "-D", temp_update_branch, stdout=subprocess.DEVNULL)
+
+
+def _print_update_complete():
+    print(
+        textwrap.dedent(
+            """\
+        Updating complete!
+
+        Please review the changes with "git status" for any errors or
+        conflicts. Once you are satisfied with the changes, add, commit,
+        push, and open a PR with the branch {}
+    """
+        ).format(footing.constants.UPDATE_BRANCH_NAME)
+    )
 
 
 @footing.utils.set_cmd_env_var("update")
@@ -120,6 +440,7 @@ def update(
     new_template: str | None = None,
     new_version: str | None = None,
     enter_parameters: bool = False,
+    answers: dict | None = None,
 ) -> bool:
     """Updates the footing project to the latest template
 
@@ -128,12 +449,15 @@ def update(
     1. Ensure we are inside the project repository
     2. Obtain the latest version of the package template
     3. If the package is up to date with the latest template, return
-    4. If not, create an empty template branch with a new copy of the old template
-    5. Create an update branch from HEAD and merge in the new template copy
-    6. Create a new copy of the new template and merge into the empty template branch
-    7. Merge the updated empty template branch into the update branch
-    8. Ensure footing.yaml reflects what is in the template branch
-    9. Remove the empty template branch
+    4. If the forge reports no changes to template files or the rendered template is
+       unchanged from the tree recorded in footing.yaml, update the version in
+       footing.yaml and return
+    5. If not, create an empty template branch with a new copy of the old template
+    6. Create an update branch from HEAD and merge in the new template copy
+    7. Create a new copy of the new template and merge into the empty template branch
+    8. Merge the updated empty template branch into the update branch
+    9. Ensure footing.yaml reflects what is in the template branch
+    10. Remove the empty template branch
 
     Note that the `footing.constants.FOOTING_ENV_VAR` is set to 'update' for the
     duration of this function.
@@ -145,6 +469,8 @@ def update(
     review. The update will fail early if either of these branches exist
     before the process starts.
 
+    Templates are fetched and rendered with a `footing.render.TemplateCache`.
+
     Args:
         old_template: The old template from which to update. Defaults to the template in
             footing.yaml.
@@ -153,6 +479,9 @@ def update(
         new_version: The new version of the new template to update. Defaults to the latest version
             of the new template.
         enter_parameters: Force entering template parameters for the project
+        answers: Values of template parameters that are not configured in the project.
+            When provided, the user is never prompted and parameters without answers
+            use their default values.
 
     Raises:
         `NotInGitRepoError`: When not inside of a git repository
@@ -163,60 +492,53 @@ def update(
 
     Returns:
         True if update was performed or False if template was already up to date
+        or the rendered template was unchanged
     """
-    update_branch = footing.constants.UPDATE_BRANCH_NAME
-    temp_update_branch = footing.constants.TEMP_UPDATE_BRANCH_NAME
-
-    footing.check.in_git_repo()
-    footing.check.in_clean_repo()
-    footing.check.is_footing_project()
-    footing.check.not_has_branch(update_branch)
-    footing.check.not_has_branch(temp_update_branch)
+    with footing.trace.span("check project", "update"):
+        footing.check.in_git_repo()
+        footing.check.in_clean_repo()
+        footing.check.is_footing_project()
+        footing.check.not_has_branch(
+            footing.constants.UPDATE_BRANCH_NAME, footing.constants.TEMP_UPDATE_BRANCH_NAME
+        )
 
     footing_config = footing.utils.read_footing_config()
     old_template = old_template or footing_config["_template"]
     new_template = new_template or footing_config["_template"]
     old_version = old_version or footing_config["_version"]
-    new_version = new_version or _get_latest_template_version(new_template)
+    if not new_version:
+        with footing.trace.span("latest version", "update"):
+            new_version = _get_latest_template_version(new_template)
 
     if new_template == old_template and new_version == old_version and not enter_parameters:
         print("No updates have happened to the template, so no files were updated")
         return False
 
-    print("Creating branch {} for processing the update".format(update_branch))
-    footing.utils.shell("git checkout -b {}".format(update_branch), stderr=subprocess.DEVNULL)
-
-    print("Creating temporary working branch {}".format(temp_update_branch))
-    footing.utils.shell(
-        "git checkout --orphan {}".format(temp_update_branch),
-        stderr=subprocess.DEVNULL,
-    )
-    footing.utils.shell("git rm -rf .", stdout=subprocess.DEVNULL)
-    _apply_template(old_template, ".", checkout=old_version, extra_context=footing_config)
-    footing.utils.shell("git add .")
-    footing.utils.shell(
-        'git commit --no-verify -m "Initialize template from version {}"'.format(old_version),
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
-
-    print("Merge old template history into update branch.")
-    footing.utils.shell("git checkout {}".format(update_branch), stderr=subprocess.DEVNULL)
-    footing.utils.shell(
-        "git merge -s ours --no-edit --allow-unrelated-histories {}".format(temp_update_branch),
-        stderr=subprocess.DEVNULL,
-    )
-
-    print("Update template in temporary branch.")
-    footing.utils.shell("git checkout {}".format(temp_update_branch), stderr=subprocess.DEVNULL)
-    footing.utils.shell("git rm -rf .", stdout=subprocess.DEVNULL)
+    cache = footing.render.TemplateCache()
+    if (
+        new_template == footing_config["_template"]
+        and old_template == footing_config["_template"]
+        and old_version == footing_config["_version"]
+        and not enter_parameters
+    ):
+        with footing.trace.span("check unchanged", "update"):
+            unchanged_reason = _get_unchanged_reason(footing_config, new_version, cache)
+        if unchanged_reason:
+            footing.utils.write_footing_config(footing_config, new_template, new_version)
+            print(
+                "{}, so only the template version in {} was updated".format(
+                    unchanged_reason, footing.constants.FOOTING_CONFIG_FILE
+                )
+            )
+            return False
 
     # If the cookiecutter.json files have changed or the templates have changed,
     # the user will need to re-enter the cookiecutter config
-    needs_new_cc_config = _needs_new_cc_config_for_update(
-        old_template, old_version, new_template, new_version
-    )
-    if needs_new_cc_config:
+    with footing.trace.span("compare cookiecutter configs", "update"):
+        needs_new_cc_config = _needs_new_cc_config_for_update(
+            old_template, old_version, new_template, new_version, cache
+        )
+    if needs_new_cc_config and answers is None:
         if old_template != new_template:
             cc_config_input_msg = (
                 "You will be prompted for the parameters of the new template."
@@ -235,52 +557,147 @@ def update(
 
     # Even if there is no detected need to re-enter the cookiecutter config, the user
     # can still re-enter config parameters with the "enter_parameters" flag
+    new_config = footing_config
     if needs_new_cc_config or enter_parameters:
-        _, footing_config = footing.utils.get_cookiecutter_config(
-            new_template, default_config=footing_config, version=new_version
+        _, new_config = footing.utils.get_cookiecutter_config(
+            cache.checkout(new_template, new_version),
+            default_config={**(answers or {}), **footing_config},
+            no_input=answers is not None,
         )
 
-    _apply_template(new_template, ".", checkout=new_version, extra_context=footing_config)
-    footing.utils.write_footing_config(footing_config, new_template, new_version)
-
-    footing.utils.shell("git add .")
-    footing.utils.shell(
-        'git commit --no-verify -m "Update template to version {}"'.format(new_version),
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
+    _update_branches(
+        [
+            _ProjectUpdate(
+                path=".",
+                old_template=old_template,
+                old_version=old_version,
+                old_config=footing_config,
+                new_template=new_template,
+                new_version=new_version,
+                new_config=new_config,
+            )
+        ],
+        cache,
+        old_message="Initialize template from version {}".format(old_version),
+        new_message="Update template to version {}".format(new_version),
     )
 
-    print("Merge updated template into update branch.")
-    footing.utils.shell("git checkout {}".format(update_branch), stderr=subprocess.DEVNULL)
-    footing.utils.shell(
-        "git merge --no-commit {}".format(temp_update_branch),
-        check=False,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
-    # The footing.yaml file should always reflect what is in the new template
-    footing.utils.shell(
-        "git checkout --theirs {}".format(footing.constants.FOOTING_CONFIG_FILE),
-        check=False,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-    )
+    _print_update_complete()
+    return True
 
-    print("Remove temporary template branch {}".format(temp_update_branch))
-    footing.utils.shell(
-        "git branch -D {}".format(temp_update_branch),
-        stdout=subprocess.DEVNULL,
-    )
 
-    print(
-        textwrap.dedent(
-            """\
-        Updating complete!
+@footing.utils.set_cmd_env_var("update")
+def update_all() -> bool:
+    """Updates every footing project in the repository to the latest template
 
-        Please review the changes with "git status" for any errors or
-        conflicts. Once you are satisfied with the changes, add, commit,
-        push, and open a PR with the branch {}
+    Every footing.yaml file in the repository is found, making it possible to update
+    a monorepo of footing projects in a single pass. Projects are grouped by template
+    and by old and new template version. Each template is fetched once, the latest
+    version of each template is obtained once, and each distinct context is rendered
+    once. All updates are merged into a single ``_footing_update`` branch using the
+    same process as `update`.
+
+    Projects are never prompted for parameters. When a new variable has been defined
+    in a template, the default value of the variable is used. Projects whose template
+    files or rendered templates have not changed only have their template version
+    updated in footing.yaml.
+
+    Note that the `footing.constants.FOOTING_ENV_VAR` is set to 'update' for the
+    duration of this function.
+
+    Raises:
+        `NotInGitRepoError`: When not inside of a git repository
+        `InvalidFootingProjectError`: When no footing projects are in the repository
+        `InDirtyRepoError`: When an update is triggered while the repo is in a dirty state
+        `ExistingBranchError`: When an update is triggered and there is an existing
+            update branch
+
+    Returns:
+        True if an update branch was created or False if all projects were already
+        up to date or only had their template versions updated
     """
-        ).format(update_branch)
+    footing.check.in_git_repo()
+    footing.check.in_clean_repo()
+    footing.check.not_has_branch(
+        footing.constants.UPDATE_BRANCH_NAME, footing.constants.TEMP_UPDATE_BRANCH_NAME
     )
-    return True
+
+    with footing.utils.cd(footing.git.runner.output("rev-parse", "--show-toplevel")):
+        paths = footing.utils.find_footing_projects()
+        if not paths:
+            raise footing.exceptions.InvalidFootingProjectError(
+                "No {} files found in repository.".format(footing.constants.FOOTING_CONFIG_FILE)
+            )
+
+        configs = {path: footing.utils.read_footing_config(path) for path in paths}
+        templates = sorted({config["_template"] for config in configs.values()})
+        with (
+            footing.trace.span("latest versions", "update"),
+            concurrent.futures.ThreadPoolExecutor() as executor,
+        ):
+            latest_versions = dict(
+                zip(templates, executor.map(_get_latest_template_version, templates))
+            )
+
+        groups = collections.defaultdict(list)
+        for path, config in configs.items():
+            template = config["_template"]
+            groups[(template, config["_version"], latest_versions[template])].append(path)
+
+        cache = footing.render.TemplateCache()
+        project_updates = []
+        version_bumps = []
+        for (template, old_version, new_version), group_paths in sorted(groups.items()):
+            if old_version == new_version:
+                continue
+
+            files_changed = _template_files_have_changed(template, old_version, new_version)
+            configs_changed = files_changed and _cookiecutter_configs_have_changed(
+                template, old_version, new_version, cache
+            )
+            for path in group_paths:
+                config = configs[path]
+                if not files_changed or _rendered_tree_is_unchanged(config, new_version, cache):
+                    version_bumps.append((path, config, template, new_version))
+                    continue
+
+                new_config = config
+                if configs_changed:
+                    _, new_config = footing.utils.get_cookiecutter_config(
+                        cache.checkout(template, new_version), default_config=config, no_input=True
+                    )
+
+                project_updates.append(
+                    _ProjectUpdate(
+                        path=path,
+                        old_template=template,
+                        old_version=old_version,
+                        old_config=config,
+                        new_template=template,
+                        new_version=new_version,
+                        new_config=new_config,
+                    )
+                )
+
+        if project_updates:
+            _update_branches(
+                project_updates,
+                cache,
+                old_message="Initialize templates of {} projects".format(len(project_updates)),
+                new_message="Update templates of {} projects".format(len(project_updates)),
+            )
+
+        for path, config, template, new_version in version_bumps:
+            footing.utils.write_footing_config(config, template, new_version, path=path)
+
+    for project_update in project_updates:
+        print("Updated {} to version {}".format(project_update.path, project_update.new_version))
+    for path, _, _, new_version in version_bumps:
+        print("Updated the template version of {} to {}".format(path, new_version))
+    if not project_updates and not version_bumps:
+        print("No updates have happened to the templates, so no files were updated")
+
+    if project_updates:
+        _print_update_complete()
+
+    return bool(project_updates)
@@ -5,14 +5,9 @@ import functools
 import os
 import subprocess
 
-import cookiecutter.config as cc_config
-import cookiecutter.generate as cc_generate
-import cookiecutter.prompt as cc_prompt
-import cookiecutter.repository as cc_repository
-import yaml
-
 import footing.constants
 import footing.exceptions
+import footing.trace
 
 
 def get_repo_path(template):
@@ -23,9 +18,54 @@ def get_repo_path(template):
     return template[:-4].split(":")[1]
 
 
-def shell(cmd, check=True, stdin=None, stdout=None, stderr=None):
-    """Runs a subprocess shell with check=True by default"""
-    return subprocess.run(cmd, shell=True, check=check, stdin=stdin, stdout=stdout, stderr=stderr)
+def shell(cmd, check=True, stdin=None, stdout=None, stderr=None, cwd=None, timeout=None):
+    """Runs a subprocess with check=True by default
+
+    String commands are executed with a shell. Lists of arguments are executed
+    directly without spawning a shell. Every process is a span of `footing.trace`.
+    """
+    name = " ".join(cmd.split()[:2] if isinstance(cmd, str) else cmd[:2])
+    with footing.trace.span(name, "subprocess"):
+        return subprocess.run(
+            cmd,
+            shell=isinstance(cmd, str),
+            check=check,
+            stdin=stdin,
+            stdout=stdout,
+            stderr=stderr,
+            cwd=cwd,
+            timeout=timeout,
+        )
+
+
+async def shell_async(argv, check=True, stdout=None, stderr=None, cwd=None, timeout=None):
+    """Runs a list of arguments in a subprocess without blocking the event loop
+
+    The process is killed when it runs longer than ``timeout`` seconds or when
+    the call is cancelled, so abandoned calls never outlive their caller.
+    Every process is a span of `footing.trace`.
+
+    Raises:
+        `subprocess.CalledProcessError`: When ``check`` is True and the process fails
+        `subprocess.TimeoutExpired`: When the process runs longer than ``timeout`` seconds
+    """
+    import asyncio
+
+    with footing.trace.span(" ".join(argv[:2]), "subprocess"):
+        proc = await asyncio.create_subprocess_exec(*argv, stdout=stdout, stderr=stderr, cwd=cwd)
+        try:
+            out, err = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            raise subprocess.TimeoutExpired(argv, timeout) from None
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+
+    if check and proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, argv, output=out, stderr=err)
+
+    return subprocess.CompletedProcess(argv, proc.returncode, stdout=out, stderr=err)
 
 
 @contextlib.contextmanager
@@ -39,23 +79,118 @@ def cd(path):
         os.chdir(old_dir)
 
 
-def read_footing_config():
-    """Reads the footing YAML configuration file in the repository"""
-    with open(footing.constants.FOOTING_CONFIG_FILE) as footing_config_file:
+def get_cache_dir():
+    """Returns the directory of footing's persistent caches, creating it if needed
+
+    Defaults to ``footing`` under ``$XDG_CACHE_HOME`` (or ``~/.cache``) and can be
+    overridden with the ``FOOTING_CACHE_DIR`` environment variable.
+    """
+    cache_dir = os.environ.get(footing.constants.FOOTING_CACHE_DIR_ENV_VAR) or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+        "footing",
+    )
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def find_footing_projects(root="."):
+    """Finds the directories of all footing projects under ``root``
+
+    The search is pruned. Hidden directories such as ``.git``, directories
+    in `footing.constants.FIND_SKIPPED_DIRS` such as ``node_modules``,
+    and virtualenvs are not searched.
+
+    Returns:
+        list: Sorted paths of the project directories, relative to ``root``
+    """
+    projects = []
+    dirs = [root]
+    while dirs:
+        path = dirs.pop()
+        try:
+            with os.scandir(path) as entries:
+                entries = list(entries)
+        except OSError:
+            continue
+
+        names = {entry.name for entry in entries}
+        if footing.constants.FOOTING_CONFIG_FILE in names:
+            projects.append(os.path.relpath(path, root))
+        if "pyvenv.cfg" in names:
+            continue
+
+        dirs.extend(
+            entry.path
+            for entry in entries
+            if entry.is_dir(follow_symlinks=False)
+            and not entry.name.startswith(".")
+            and entry.name not in footing.constants.FIND_SKIPPED_DIRS
+        )
+
+    return sorted(projects)
+
+
+def read_footing_config(path="."):
+    """Reads the footing YAML configuration file in the repository
+
+    Args:
+        path (str, default="."): The directory of the footing project
+    """
+    # PyYAML is imported when used so that commands without configs start quickly
+    import yaml
+
+    config_path = os.path.join(path, footing.constants.FOOTING_CONFIG_FILE)
+    with open(config_path) as footing_config_file:
         return yaml.load(footing_config_file, Loader=yaml.SafeLoader)
 
 
-def write_footing_config(footing_config, template, version):
-    """Writes the footing YAML configuration"""
-    with open(footing.constants.FOOTING_CONFIG_FILE, "w") as footing_config_file:
+def read_valid_footing_config(path="."):
+    """Reads the footing YAML configuration file and checks that it has a template and version
+
+    Args:
+        path (str, default="."): The directory of the footing project
+
+    Raises:
+        `InvalidFootingProjectError`: When the file cannot be parsed or has no
+            ``_template`` or ``_version``
+    """
+    import yaml
+
+    config_file = os.path.normpath(os.path.join(path, footing.constants.FOOTING_CONFIG_FILE))
+    try:
+        config = read_footing_config(path)
+    except yaml.YAMLError as exc:
+        raise footing.exceptions.InvalidFootingProjectError(
+            "Invalid {}: {}".format(config_file, exc)
+        ) from exc
+
+    if not isinstance(config, dict) or not {"_template", "_version"} <= config.keys():
+        raise footing.exceptions.InvalidFootingProjectError(
+            '{} has no "_template" or "_version"'.format(config_file)
+        )
+
+    return config
+
+
+def write_footing_config(footing_config, template, version, tree=None, path="."):
+    """Writes the footing YAML configuration
+
+    When provided, ``tree`` is recorded as the git tree hash of the rendered template.
+    The file is written to the project in the ``path`` directory.
+    """
+    import yaml
+
+    config_path = os.path.join(path, footing.constants.FOOTING_CONFIG_FILE)
+    with open(config_path, "w") as footing_config_file:
         versioned_config = {
             **footing_config,
             **{"_version": version, "_template": template},
+            **({"_tree": tree} if tree else {}),
         }
         yaml.dump(versioned_config, footing_config_file, Dumper=yaml.SafeDumper)
 
 
-def get_cookiecutter_config(template, default_config=None, version=None):
+def get_cookiecutter_config(template, default_config=None, version=None, no_input=False):
     """Obtains the configuration used for cookiecutter templating
 
     Args:
@@ -63,10 +198,18 @@ def get_cookiecutter_config(template, default_config=None, version=None):
         default_config (dict, optional): The default configuration
         version (str, optional): The git SHA or branch to use when
             checking out template. Defaults to latest version
+        no_input (bool, default=False): Use the defaults instead of prompting
+            for parameters
 
     Returns:
         tuple: The cookiecutter repo directory and the config dict
     """
+    # Cookiecutter is slow to import and only needed when rendering templates
+    import cookiecutter.config as cc_config
+    import cookiecutter.generate as cc_generate
+    import cookiecutter.prompt as cc_prompt
+    import cookiecutter.repository as cc_repository
+
     default_config = default_config or {}
     config_dict = cc_config.get_user_config()
     repo_dir, _ = cc_repository.determine_repo_dir(
@@ -81,7 +224,7 @@ def get_cookiecutter_config(template, default_config=None, version=None):
         context_file=context_file,
         default_context={**config_dict["default_context"], **default_config},
     )
-    return repo_dir, cc_prompt.prompt_for_config(context)
+    return repo_dir, cc_prompt.prompt_for_config(context, no_input=no_input)
 
 
 def set_cmd_env_var(value):
@@ -0,0 +1,184 @@
+"""Precomputes the updates of projects when their template is pushed.
+
+When a template gets a new commit, every project created from it later
+resolves the new version, clones the template, and renders the old and new
+versions on its own. `handle_push` does that work once, ahead of time, from
+the push webhook of the template's forge:
+
+1. The pushed SHA of the default branch is fetched into the template mirror
+2. The projects of the template are listed with `footing.ls.ls`, or from the
+   local `footing.index.Index`, and their footing.yaml files are read
+3. The current and new versions of the template are rendered once for every
+   distinct context of the projects into the `footing.render.TemplateCache`
+
+Later ``footing update`` runs with the same cache directory, such as runs of
+`footing serve` or CI agents on the same host, find every render precomputed.
+
+Github and Gitlab push payloads are supported. Payloads are either passed to
+``footing webhook`` or posted by the forge to ``/webhook`` of `footing serve`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import hashlib
+import hmac
+import json
+import os
+
+import footing.exceptions
+import footing.forge
+import footing.index
+import footing.ls
+import footing.render
+import footing.utils
+
+
+@dataclasses.dataclass
+class Push:
+    """A push to a template
+
+    Attributes:
+        template: The git SSH path of the template
+        sha: The pushed git SHA
+        ref: The pushed git ref, such as ``refs/heads/main``
+        default_branch: The default branch of the template
+    """
+
+    template: str
+    sha: str
+    ref: str
+    default_branch: str
+
+    @property
+    def is_default_branch(self) -> bool:
+        """True when the default branch of the template was pushed"""
+        return self.ref == "refs/heads/{}".format(self.default_branch)
+
+
+@dataclasses.dataclass
+class WebhookResult:
+    """The work precomputed for a push to a template
+
+    Attributes:
+        template: The git SSH path of the template
+        sha: The new git SHA of the template
+        projects: The projects created from the template
+        renders: The number of renders created or found in the cache
+        errors: The errors of renders that failed
+    """
+
+    template: str
+    sha: str
+    projects: list[str]
+    renders: int = 0
+    errors: list[str] = dataclasses.field(default_factory=list)
+
+
+def parse_push(payload: dict) -> Push:
+    """Parses the payload of a Github or Gitlab push webhook
+
+    Raises:
+        `InvalidWebhookError`: When the payload is not a push to a repository
+    """
+    try:
+        if "repository" in payload and "ssh_url" in payload["repository"]:
+            repository = payload["repository"]
+            template, sha = repository["ssh_url"], payload["after"]
+        else:
+            repository = payload["project"]
+            template, sha = repository["git_ssh_url"], payload["checkout_sha"]
+
+        return Push(template, sha or "", payload["ref"], repository["default_branch"])
+    except (KeyError, TypeError) as exc:
+        raise footing.exceptions.InvalidWebhookError(
+            "Webhook payload is not a Github or Gitlab push ({!r} is missing)".format(
+                exc.args[0] if exc.args else None
+            )
+        ) from exc
+
+
+def verify_signature(body: bytes, headers, secret: str) -> bool:
+    """Verifies a webhook was sent by a forge configured with ``secret``
+
+    Github signs the body in the ``X-Hub-Signature-256`` header. Gitlab sends
+    the secret in the ``X-Gitlab-Token`` header.
+    """
+    signature = headers.get("X-Hub-Signature-256")
+    if signature:
+        expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(signature, expected)
+
+    return hmac.compare_digest(headers.get("X-Gitlab-Token", ""), secret)
+
+
+def get_forge(template: str) -> str:
+    """Returns the forge path that holds a template, such as github.com/org"""
+    host = template.split(":")[0].split("@")[-1]
+    return "{}/{}".format(host, os.path.dirname(footing.utils.get_repo_path(template)))
+
+
+def _get_projects(forge, template, offline):
+    if offline:
+        return list(footing.index.Index().ls(forge, template))
+
+    return list(footing.ls.ls(forge, template))
+
+
+def handle_push(
+    payload: dict, forge: str | None = None, offline: bool = False
+) -> WebhookResult | None:
+    """Precomputes the updates of the projects of a template from a push webhook
+
+    Only projects whose footing.yaml uses the same template path as the payload
+    are precomputed. A render that fails is reported in the result and does not
+    stop other renders.
+
+    Args:
+        payload: The parsed payload of the webhook
+        forge: The forge path of the template's projects. Defaults to the
+            organization or group of the template.
+        offline: List projects from the local `footing.index.Index` instead of the forge.
+            The footing.yaml files of projects are still read with the forge API.
+
+    Returns:
+        The precomputed work, or None when the push is not to the default branch
+
+    Raises:
+        `InvalidWebhookError`: When the payload is not a push to a repository
+    """
+    push = parse_push(payload)
+    if not push.is_default_branch or not push.sha.strip("0"):
+        return None
+
+    cache = footing.render.TemplateCache()
+    sha = cache.resolve(push.template, push.sha)
+    footing.forge.set_latest_version(push.template, sha)
+
+    forge = forge or get_forge(push.template)
+    projects = _get_projects(forge, push.template, offline)
+    client = footing.forge.from_path(forge)
+    configs = asyncio.run(client.get_footing_configs_async(projects))
+    index = footing.index.Index()
+    index.record_configs(configs)
+    index.record_latest_version(push.template, sha)
+
+    # Projects with the same context and version share one render
+    renders = {}
+    for config in configs.values():
+        if config and config.get("_template") == push.template:
+            context = footing.render.get_context(config)
+            for version in (config["_version"], sha):
+                renders[json.dumps([version, context], sort_keys=True)] = (version, context)
+
+    result = WebhookResult(push.template, sha, projects)
+    for version, context in renders.values():
+        try:
+            cache.render(push.template, version, context)
+            result.renders += 1
+        except Exception as exc:
+            # One broken project should never stop the renders of other projects
+            result.errors.append("{}: {}".format(version, str(exc) or type(exc).__name__))
+
+    return result